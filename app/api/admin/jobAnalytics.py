@@ -0,0 +1,13 @@
+from fastapi import Query
+from app.api.router_base import router_admin as router
+from app.service.jobAnalytics import get_job_analytics
+
+
+@router.get(
+    "/analytics/jobs",
+    summary="Job analytics",
+    description="Return p50/p95 dispatch wait, RunPod queue wait, execution time and end-to-end latency "
+                "of completed jobs per method/vertical/subtitle combination"
+)
+async def job_analytics(hours: int = Query(default=24, ge=1, le=24 * 90)):
+    return await get_job_analytics(hours)
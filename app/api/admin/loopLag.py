@@ -0,0 +1,11 @@
+from app.api.router_base import router_admin as router
+from app.service.loopMonitor import get_loop_lag_stats
+
+
+@router.get(
+    "/loop-lag",
+    summary="Event loop lag",
+    description="Return event loop lag percentiles and the stacks of recently detected blocking calls"
+)
+async def loop_lag():
+    return get_loop_lag_stats()
@@ -0,0 +1,11 @@
+from app.api.router_base import router_admin as router
+from app.service.runpodDispatcher import get_endpoint_states
+
+
+@router.get(
+    "/runpod-endpoints",
+    summary="RunPod endpoints",
+    description="Return the last sampled queue depth and health of every RunPod endpoint used by the dispatcher"
+)
+async def runpod_endpoints():
+    return {"endpoints": get_endpoint_states()}
@@ -7,6 +7,7 @@ from app.model.session import SessionModel
 from app.db.dependency import get_db
 from app.api.router_base import router_auth as router
 from app.utility.time import utc_now
+from app.utility.credit import get_credit_balance
 
 
 @router.get("/me")
@@ -44,6 +45,6 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
         "user": {
             "email": user.email,
             "username": user.username,
-            "credit": user.credit,
+            "credit": await get_credit_balance(db, user.id),
         }
     }
\ No newline at end of file
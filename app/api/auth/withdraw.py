@@ -1,10 +1,14 @@
-from fastapi import Request, Response, HTTPException, status, Depends
+from fastapi import Request, Response, HTTPException, status, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime, UTC
 from app.db.dependency import get_db
 from app.model.session import SessionModel
 from app.model.user import UserModel
+from app.model.video import VideoModel
+from app.model.purge import AccountPurgeModel, AccountPurgeStage
+from app.service.accountPurger import purge_account
 from app.config.environments import ENVIRONMENT
 from app.api.router_base import router_auth as router
 from app.utility.time import utc_now
@@ -17,7 +21,12 @@ if ENVIRONMENT == "production":
 
 
 @router.delete("/withdraw")
-async def withdraw(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+async def withdraw(
+        request: Request,
+        response: Response,
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_db)
+):
     session_token = request.cookies.get("session_token")
     if not session_token:
         raise HTTPException(
@@ -36,10 +45,32 @@ async def withdraw(request: Request, response: Response, db: AsyncSession = Depe
             detail="Session expired or invalid"
         )
 
-    await db.execute(delete(SessionModel).where(SessionModel.session_token == session_token))
-    await db.execute(delete(UserModel).where(UserModel.id == session.user_id))
+    # Log out everywhere, free the email and hide the videos right away (no one can start a job
+    # on them anymore); the videos, jobs, files and the user row itself are deleted by the
+    # account purger, which resumes after a crash.
+    await db.execute(delete(SessionModel).where(SessionModel.user_id == session.user_id))
+    await db.execute(
+        update(UserModel)
+        .where(UserModel.id == session.user_id)
+        .values(email=f"withdrawn-{session.user_id}@invalid")
+    )
+    await db.execute(
+        update(VideoModel)
+        .where(VideoModel.user_id == session.user_id, VideoModel.deleted_at.is_(None))
+        .values(deleted_at=utc_now())
+    )
+    result = await db.execute(
+        insert(AccountPurgeModel)
+        .values(user_id=session.user_id, stage=AccountPurgeStage.CANCEL_JOBS)
+        .on_conflict_do_nothing(index_elements=["user_id"])
+        .returning(AccountPurgeModel.id)
+    )
+    purge_id = result.scalar_one_or_none()
     await db.commit()
 
+    if purge_id is not None:
+        background_tasks.add_task(purge_account, purge_id)
+
     response.delete_cookie(
         "session_token",
         httponly=True,
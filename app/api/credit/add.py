@@ -8,6 +8,7 @@ from app.model.user import UserModel
 from pydantic import BaseModel
 from app.api.router_base import router_credit as router
 from app.utility.time import utc_now
+from app.utility.credit import grant_credit, get_credit_balance
 
 
 class CreditAddRequest(BaseModel):
@@ -45,8 +46,7 @@ async def add(request: Request, data: CreditAddRequest, db: AsyncSession = Depen
             detail="User not found"
         )
 
-    user.credit += data.amount
+    await grant_credit(db, user.id, data.amount)
     await db.commit()
-    await db.refresh(user)
 
-    return {"message": f"{data.amount} credit has been added.", "total_credit": user.credit}
\ No newline at end of file
+    return {"message": f"{data.amount} credit has been added.", "total_credit": await get_credit_balance(db, user.id)}
\ No newline at end of file
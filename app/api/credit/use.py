@@ -8,6 +8,7 @@ from app.model.user import UserModel
 from pydantic import BaseModel
 from app.api.router_base import router_credit as router
 from app.utility.time import utc_now
+from app.utility.credit import spend_credit, get_credit_balance
 
 
 class CreditUseRequest(BaseModel):
@@ -45,8 +46,11 @@ async def use(request: Request, data: CreditUseRequest, db: AsyncSession = Depen
             detail="User not found"
         )
 
-    user.credit -= data.amount
+    if not await spend_credit(db, user.id, data.amount):
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="Insufficient credit"
+        )
     await db.commit()
-    await db.refresh(user)
 
-    return {"message": f"{data.amount} credit has been used.", "total_credit": user.credit}
\ No newline at end of file
+    return {"message": f"{data.amount} credit has been used.", "total_credit": await get_credit_balance(db, user.id)}
\ No newline at end of file
@@ -1,4 +1,6 @@
+from fastapi import Response, status
 from app.api.router_base import router_health as router
+from app.service.readinessChecker import get_readiness
 
 
 @router.get(
@@ -18,3 +20,34 @@ from app.api.router_base import router_health as router
 )
 async def healthcheck():
     return {"message": "yes"}
+
+
+
+@router.get(
+    "/ready",
+    summary="Readiness Check",
+    description="Return whether the server can serve traffic (database, storage, ffmpeg and RunPod reachable). "
+                "Results are cached and refreshed in the background, so probing never opens a connection.",
+    responses={
+        200: {
+            "description": "When every dependency is reachable",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "ready": True,
+                        "checks": {
+                            "database": {"ok": True, "latency_ms": 3.1, "error": None, "checked_at": 1700000000.0}
+                        }
+                    }
+                }
+            }
+        },
+        503: {"description": "When a dependency is unreachable or not checked yet"}
+    }
+)
+async def readiness(response: Response):
+    ready, checks = get_readiness()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {"ready": ready, "checks": checks}
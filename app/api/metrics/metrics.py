@@ -0,0 +1,47 @@
+import asyncio
+import os
+from fastapi import Response
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY, multiprocess
+from sqlalchemy import select, func
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel, JobStatus
+from app.utility.metrics import JOBS_BY_STATUS, JOBS_BY_STATUS_UPDATED
+from app.api.router_base import router_metrics as router
+
+METRICS_DB_TIMEOUT = 2  # seconds a scrape waits for the job counts before serving the previous ones
+
+
+def get_registry():
+    # With several workers every process writes to PROMETHEUS_MULTIPROC_DIR, merge them on scrape
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+async def update_job_counts():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(JobModel.status, func.count()).group_by(JobModel.status)
+        )
+        counts = {row[0]: row[1] for row in result.all()}
+
+    for job_status in JobStatus:
+        JOBS_BY_STATUS.labels(status=job_status.value).set(counts.get(job_status, 0))
+    JOBS_BY_STATUS_UPDATED.set_to_current_time()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    # No get_db: the request metrics must still be scraped when the database is down or the
+    # pool is exhausted, the job counts then keep their last values
+    try:
+        await asyncio.wait_for(update_job_counts(), timeout=METRICS_DB_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"[Metrics] Job counts not updated, the database didn't answer within {METRICS_DB_TIMEOUT}s")
+    except Exception as e:
+        print(f"[Metrics] Job counts not updated: {e}")
+
+    return Response(content=generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,105 @@
+import asyncio
+from fastapi import Request, HTTPException, status, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from app.db.dependency import get_db
+from app.model.session import SessionModel
+from app.model.user import UserModel
+from app.model.job import JobModel, JobStatus
+from app.api.router_base import router_runpod as router
+from app.utility.runpod import cancel_runpod_job
+from app.utility.credit import release_credit
+from app.utility.time import utc_now
+
+
+@router.post("/job/{job_id}/cancel")
+async def cancel_job(job_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Login required"
+        )
+
+    result = await db.execute(
+        select(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session or (session.expires_at and session.expires_at < utc_now()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or invalid"
+        )
+
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == session.user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    # Conditional update: only one of a cancel and a (late) webhook can win the transition,
+    # so the credit is refunded exactly once.
+    result = await db.execute(
+        update(JobModel)
+        .where(
+            JobModel.id == job_id,
+            JobModel.user_id == user.id,
+            JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+        )
+        .values(
+            status=JobStatus.CANCELLED,
+            error_message="Cancelled by user",
+            completed_at=utc_now()
+        )
+        .returning(JobModel.runpod_job_id, JobModel.runpod_endpoint)
+    )
+    cancelled = result.first()
+
+    if cancelled is None:
+        result = await db.execute(
+            select(JobModel).where(JobModel.id == job_id)
+        )
+        job = result.scalar_one_or_none()
+
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+
+        if job.user_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to access this job"
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is already {job.status.value}, only pending or processing jobs can be cancelled"
+        )
+
+    await release_credit(db, user.id, job_id)
+    await db.commit()
+
+    runpod_job_id = cancelled.runpod_job_id
+    runpod_cancelled = False
+    if runpod_job_id:
+        try:
+            await asyncio.to_thread(cancel_runpod_job, runpod_job_id, cancelled.runpod_endpoint)
+            runpod_cancelled = True
+        except Exception as e:
+            # The job stays cancelled on our side and its webhook will be ignored
+            print(f"Error cancelling RunPod job {runpod_job_id}: {str(e)}")
+
+    return {
+        "message": "Job cancelled successfully",
+        "job_id": job_id,
+        "status": JobStatus.CANCELLED,
+        "runpod_cancelled": runpod_cancelled
+    }
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import Request, HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -7,7 +8,7 @@ from app.model.user import UserModel
 from app.model.job import JobModel
 from datetime import datetime, UTC
 from app.api.router_base import router_runpod as router
-from app.utility.storage import delete_from_supabase_storage
+from app.utility.storage import remove_from_storage
 from app.utility.time import utc_now
 
 
@@ -65,11 +66,13 @@ async def delete_job(job_id: str, request: Request, db: AsyncSession = Depends(g
             detail="Job is still running, can only delete when completed or failed"
         )
 
-    if job.result_url is not None:
+    # The result and its HLS playlists and segments
+    output_files = ([job.result_url] if job.result_url else []) + (job.hls_files or [])
+    if output_files:
         try:
-            await delete_from_supabase_storage(job.result_url, bucket="outputs")
+            await asyncio.to_thread(remove_from_storage, output_files, "outputs")
         except Exception as e:
-            print(f"Error deleting result video file from Supabase Storage: {str(e)}")
+            print(f"Error deleting result video file from Storage: {str(e)}")
 
     await db.delete(job)
     await db.commit()
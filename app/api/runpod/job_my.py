@@ -54,6 +54,7 @@ async def get_job_my(request: Request, db: AsyncSession = Depends(get_db)):
             "subtitle": job.subtitle,
             "vertical": job.vertical,
             "status": job.status.value if hasattr(job.status, "value") else job.status,
+            "hls_url": job.hls_url,
             "name": job.name,
             "public": job.public,
             "subtitle_style": job.subtitle_style,
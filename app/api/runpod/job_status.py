@@ -65,10 +65,14 @@ async def get_job_status(job_id: str, request: Request, db: AsyncSession = Depen
         "subtitle": job.subtitle,
         "vertical": job.vertical,
         "result_url": job.result_url,
+        "hls_status": job.hls_status,
+        "hls_url": job.hls_url,
         "error_message": job.error_message,
         "created_at": job.created_at.isoformat() if job.created_at else None,
         "started_at": job.started_at.isoformat() if job.started_at else None,
         "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "queue_ms": job.queue_ms,
+        "execution_ms": job.execution_ms,
         "public": job.public,
         "subtitle_style": job.subtitle_style,
         "crop_method": job.crop_method,
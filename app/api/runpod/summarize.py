@@ -8,9 +8,10 @@ from app.model.session import SessionModel
 from app.model.user import UserModel
 from app.model.video import VideoModel
 from app.model.job import JobModel, JobStatus
-from app.config.environments import RUNPOD_URL, RUNPOD_API_KEY, BACKEND_URL
 from app.api.router_base import router_runpod as router
-import requests
+from app.service.jobScheduler import notify_scheduler
+from app.utility.credit import reserve_credit
+from app.utility.idempotency import begin_idempotent_request, save_idempotent_response, release_idempotency_key
 from app.utility.time import utc_now
 
 
@@ -54,92 +55,69 @@ async def summarize(request: Request, body: SummarizeRequest, db: AsyncSession =
             detail="User not found"
         )
 
-    if user.credit < 1:
-        raise HTTPException(
-            status_code=status.HTTP_402_PAYMENT_REQUIRED,
-            detail="Insufficient credit"
-        )
-
-    result = await db.execute(
-        select(VideoModel).where(VideoModel.id == body.video_id)
-    )
-    video = result.scalar_one_or_none()
-
-    if not video:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Video not found"
-        )
-
-    if body.subtitle_style is None:
-        body.subtitle_style = "dynamic"
-    if body.crop_method is None:
-        body.crop_method = "center"
-
-    job = JobModel(
-        user_id=user.id,
-        video_id=video.id,
-        method=body.method,
-        status=JobStatus.PENDING,
-        subtitle=body.subtitle,
-        subtitle_style=body.subtitle_style,
-        vertical=body.vertical,
-        crop_method=body.crop_method,
-        name="Pending Job"
-    )
-    db.add(job)
-    await db.commit()
-    await db.refresh(job)
+    # Retried requests with the same Idempotency-Key get the original response instead of a second job
+    idempotency_key = request.headers.get("Idempotency-Key")
+    replay = await begin_idempotent_request(db, idempotency_key, user.id, "summarize", body.model_dump())
+    if replay:
+        return replay
 
     try:
-        r = requests.post(
-            url=f"{RUNPOD_URL}/run",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {RUNPOD_API_KEY}"
-            },
-            json={
-                "input": {
-                    "webhook_url": f"{BACKEND_URL}/runpod/webhook/{job.id}",
-                    "task": "process_video",
-                    "video_url": video.file_path,
-                    "options": {
-                        "method": body.method,
-                        "subtitles": body.subtitle,
-                        "subtitle_style": body.subtitle_style,
-                        "vertical": body.vertical,
-                        "crop_method": body.crop_method,
-                    }
-                }
-            },
-            timeout=30
+        # Shared lock until the job is committed, so a concurrent delete either counts the job
+        # as running or has already marked the video deleted
+        result = await db.execute(
+            select(VideoModel)
+            .where(VideoModel.id == body.video_id, VideoModel.deleted_at.is_(None))
+            .with_for_update(read=True)
         )
+        video = result.scalar_one_or_none()
+
+        if not video:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Video not found"
+            )
+
+        if body.subtitle_style is None:
+            body.subtitle_style = "dynamic"
+        if body.crop_method is None:
+            body.crop_method = "center"
+
+        job = JobModel(
+            user_id=user.id,
+            video_id=video.id,
+            method=body.method,
+            status=JobStatus.PENDING,
+            subtitle=body.subtitle,
+            subtitle_style=body.subtitle_style,
+            vertical=body.vertical,
+            crop_method=body.crop_method,
+            name="Pending Job"
+        )
+        db.add(job)
+        await db.flush()
 
-        runpod_response = r.json()
-
-        if "id" in runpod_response:
-            job.runpod_job_id = runpod_response["id"]
-            job.status = JobStatus.PROCESSING
-            job.started_at = utc_now()
-            job.name = f"Job {runpod_response['id'][:4]}"
-            await db.commit()
-
-        user.credit -= 1
-        await db.commit()
+        # Held at enqueue; settled when the job completes, released when it fails or is cancelled
+        if not await reserve_credit(db, user.id, job.id):
+            raise HTTPException(
+                status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                detail="Insufficient credit"
+            )
 
-        return {
+        response = {
             "job_id": job.id,
-            "runpod_job_id": runpod_response.get("id"),
+            "runpod_job_id": None,
             "status": job.status,
-            "message": "Job submitted successfully"
+            "message": "Job queued successfully"
         }
-
-    except requests.exceptions.RequestException as e:
-        job.status = JobStatus.FAILED
-        job.error_message = f"Failed to submit job to RunPod: {str(e)}"
+        # Committed together with the job, so a stored response always has its job and vice versa
+        await save_idempotent_response(db, idempotency_key, user.id, "summarize", response)
         await db.commit()
 
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to submit job to RunPod: {str(e)}"
-        )
\ No newline at end of file
+    except Exception:
+        await release_idempotency_key(db, idempotency_key, user.id, "summarize")
+        raise
+
+    # The job scheduler dispatches it to RunPod once the user has a free in-flight slot
+    notify_scheduler()
+
+    return response
@@ -1,11 +1,206 @@
+import hmac
 from fastapi import Request, HTTPException, status, Depends
+from pydantic import BaseModel
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, values as values_table, column, cast, case, func, Integer, String
+from app.config.environments import HLS_ENABLED, WEBHOOK_BATCH_SECRET
 from app.db.dependency import get_db
-from app.model.job import JobModel, JobStatus
-from app.model.user import UserModel
+from app.model.credit import CreditEntryType
+from app.model.job import JobModel, JobStatus, HlsStatus
 from datetime import datetime, UTC
 from app.api.router_base import router_runpod as router
+from app.service.hlsPackager import notify_packager
+from app.utility.credit import settle_credit, release_credit, add_ledger_entries
+
+WEBHOOK_BATCH_MAX_SIZE = 500
+
+
+class WebhookUpdate(BaseModel):
+    job_id: int
+    status: Optional[str] = None
+    result_url: Optional[str] = None
+    error: Optional[str] = None
+    delayTime: Optional[float] = None
+    executionTime: Optional[float] = None
+
+
+def webhook_values(payload: dict) -> dict:
+    """Map a RunPod webhook payload to the job columns it updates (without completed_at)"""
+    webhook_status = payload.get("status")
+
+    if webhook_status == "completed":
+        values = {
+            "status": JobStatus.COMPLETED,
+            "result_url": payload.get("result_url")
+        }
+        # Picked up by app/service/hlsPackager.py
+        if HLS_ENABLED and values["result_url"]:
+            values["hls_status"] = HlsStatus.PENDING
+    elif webhook_status == "failed":
+        values = {
+            "status": JobStatus.FAILED,
+            "error_message": payload.get("error")
+        }
+    else:
+        values = {"error_message": f"Unknown status from webhook: {webhook_status}"}
+
+    # RunPod reports its own queue delay and execution time in milliseconds
+    for field, column_name in (("delayTime", "queue_ms"), ("executionTime", "execution_ms")):
+        value = payload.get(field)
+        if isinstance(value, (int, float)) and value >= 0:
+            values[column_name] = int(value)
+
+    return values
+
+
+def settlement_entry(user_id: int, job_id: int, job_status: JobStatus) -> dict | None:
+    if job_status == JobStatus.COMPLETED:
+        return {"user_id": user_id, "job_id": job_id, "entry_type": CreditEntryType.SETTLE, "amount": 0}
+    if job_status == JobStatus.FAILED:
+        return {"user_id": user_id, "job_id": job_id, "entry_type": CreditEntryType.RELEASE, "amount": 1}
+    return None
+
+
+def verify_batch_secret(secret: str | None):
+    """
+    Check the X-Webhook-Secret of a batch against WEBHOOK_BATCH_SECRET
+
+    Raises:
+        HTTPException: 503 if no secret is configured, 401 if it doesn't match
+    """
+    if not WEBHOOK_BATCH_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Batch webhook is not configured"
+        )
+
+    if not secret or not hmac.compare_digest(secret.encode(), WEBHOOK_BATCH_SECRET.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook secret"
+        )
+
+
+def batch_update_statement(rows: list[tuple]):
+    """
+    Build the UPDATE ... FROM (VALUES ...) applying a batch
+
+    Args:
+        rows: (job_id, status name, result_url, error_message, queue_ms, execution_ms, hls_status name)
+
+    Returns:
+        The statement, returning the id, user_id and new status of every updated job
+    """
+    data = values_table(
+        column("job_id", Integer),
+        column("status", String),
+        column("result_url", String),
+        column("error_message", String),
+        column("queue_ms", Integer),
+        column("execution_ms", Integer),
+        column("hls_status", String),
+        name="updates"
+    ).data(rows)
+    new_status = cast(data.c.status, JobModel.status.type)
+    # A VALUES column that is NULL in every row is typed text by Postgres (e.g. a batch of
+    # failures without timings), which COALESCE can't match with the integer columns
+    queue_ms = cast(data.c.queue_ms, Integer)
+    execution_ms = cast(data.c.execution_ms, Integer)
+
+    return (
+        update(JobModel)
+        .where(
+            JobModel.id == data.c.job_id,
+            JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+        )
+        .values(
+            status=func.coalesce(new_status, JobModel.status),
+            result_url=func.coalesce(data.c.result_url, JobModel.result_url),
+            error_message=func.coalesce(data.c.error_message, JobModel.error_message),
+            queue_ms=func.coalesce(queue_ms, JobModel.queue_ms),
+            execution_ms=func.coalesce(execution_ms, JobModel.execution_ms),
+            hls_status=func.coalesce(cast(data.c.hls_status, JobModel.hls_status.type), JobModel.hls_status),
+            completed_at=case((data.c.status.is_not(None), func.now()), else_=JobModel.completed_at)
+        )
+        .returning(JobModel.id, JobModel.user_id, JobModel.status)
+    )
+
+
+# Declared before /webhook/{job_id}, which would otherwise match "batch" as a job ID
+@router.post("/webhook/batch")
+async def runpod_webhook_batch(
+        request: Request,
+        updates: list[WebhookUpdate],
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply many webhook payloads at once (used by the webhook relay and the reconciler)
+
+    Requires the shared WEBHOOK_BATCH_SECRET in the X-Webhook-Secret header. All updates are
+    applied with a single UPDATE ... FROM (VALUES ...) and their credits are settled or released
+    with a single INSERT, in one transaction. Like the single webhook, only pending or processing
+    jobs are updated. Returns one result per update, in request order.
+    """
+    verify_batch_secret(request.headers.get("X-Webhook-Secret"))
+
+    if len(updates) > WEBHOOK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {WEBHOOK_BATCH_MAX_SIZE} updates per batch"
+        )
+
+    rows = {}
+    for item in updates:
+        if item.job_id in rows:
+            continue
+        values = webhook_values(item.model_dump())
+        rows[item.job_id] = (
+            item.job_id,
+            values["status"].name if "status" in values else None,
+            values.get("result_url"),
+            values.get("error_message"),
+            values.get("queue_ms"),
+            values.get("execution_ms"),
+            values["hls_status"].name if "hls_status" in values else None,
+        )
+
+    applied = {}
+    if rows:
+        result = await db.execute(batch_update_statement(list(rows.values())))
+        applied = {row.id: row for row in result.all()}
+
+        entries = [settlement_entry(row.user_id, row.id, row.status) for row in applied.values()]
+        await add_ledger_entries(db, [entry for entry in entries if entry])
+
+    current = {}
+    missed = [job_id for job_id in rows if job_id not in applied]
+    if missed:
+        result = await db.execute(
+            select(JobModel.id, JobModel.status).where(JobModel.id.in_(missed))
+        )
+        current = {row.id: row.status for row in result.all()}
+
+    await db.commit()
+    if any(row.status == JobStatus.COMPLETED for row in applied.values()):
+        notify_packager()
+
+    results = []
+    seen = set()
+    for item in updates:
+        if item.job_id in seen:
+            results.append({"job_id": item.job_id, "result": "duplicate"})
+            continue
+        seen.add(item.job_id)
+
+        if item.job_id in applied:
+            results.append({"job_id": item.job_id, "result": "applied", "status": applied[item.job_id].status})
+        elif item.job_id in current:
+            results.append({"job_id": item.job_id, "result": "ignored", "status": current[item.job_id]})
+        else:
+            results.append({"job_id": item.job_id, "result": "not_found"})
+
+    return {"applied": len(applied), "results": results}
 
 
 @router.post("/webhook/{job_id}")
@@ -13,55 +208,66 @@ async def runpod_webhook(job_id: str, request: Request, db: AsyncSession = Depen
     try:
         payload = await request.json()
 
-        webhook_status = payload.get("status")
-        result_url = payload.get("result_url")
-        error = payload.get("error")
-
         if not job_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Missing job_id in webhook payload"
             )
 
+        values = webhook_values(payload)
+        if "status" in values:
+            values["completed_at"] = datetime.now(UTC)
+
+        # Only running jobs accept updates: late or repeated webhooks for cancelled or
+        # finished jobs are ignored, and the failure refund happens exactly once.
         result = await db.execute(
-            select(JobModel).where(JobModel.id == int(job_id))
+            update(JobModel)
+            .where(
+                JobModel.id == int(job_id),
+                JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+            )
+            .values(**values)
+            .returning(JobModel.user_id, JobModel.status)
         )
-        job = result.scalar_one_or_none()
+        updated = result.first()
 
-        if not job:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Job {job_id} not found"
+        if updated is None:
+            result = await db.execute(
+                select(JobModel.status).where(JobModel.id == int(job_id))
             )
+            job_status = result.scalar_one_or_none()
 
-        if webhook_status == "completed":
-            job.status = JobStatus.COMPLETED
-            job.result_url = result_url
-            job.completed_at = datetime.now(UTC)
-        elif webhook_status == "failed":
-            job.status = JobStatus.FAILED
-            job.error_message = error
-            job.completed_at = datetime.now(UTC)
+            if job_status is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Job {job_id} not found"
+                )
 
-            result = await db.execute(
-                select(UserModel).where(UserModel.id == job.user_id)
-            )
-            user = result.scalar_one_or_none()
-            if user:
-                user.credit += 1
-        else:
-            job.error_message = f"Unknown status from webhook: {webhook_status}"
+            return {
+                "message": f"Webhook ignored, job is already {job_status.value}",
+                "job_id": job_id,
+                "status": job_status
+            }
+
+        if updated.status == JobStatus.COMPLETED:
+            await settle_credit(db, updated.user_id, int(job_id))
+        elif updated.status == JobStatus.FAILED:
+            await release_credit(db, updated.user_id, int(job_id))
 
         await db.commit()
+        if "hls_status" in values:
+            notify_packager()
 
         return {
             "message": "Webhook received successfully",
             "job_id": job_id,
-            "status": job.status
+            "status": updated.status
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process webhook: {str(e)}"
-        )
\ No newline at end of file
+        )
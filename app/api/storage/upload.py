@@ -0,0 +1,41 @@
+from fastapi import Request, HTTPException, status
+from app.api.router_base import router_storage as router
+from app.utility.storage import get_storage_backend, LocalStorageBackend
+
+
+@router.put("/upload/{bucket}/{filename}")
+async def upload_object(
+        request: Request,
+        bucket: str,
+        filename: str,
+        expires: int,
+        token: str
+):
+    """Target of the presigned upload URLs of the local storage backend"""
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found"
+        )
+
+    if not backend.verify_upload_token(f"{bucket}/{filename}", expires, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Upload URL is invalid or expired"
+        )
+
+    try:
+        size = await backend.upload_stream(bucket, filename, request.stream())
+    except FileExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Object already exists"
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid object name"
+        )
+
+    return {"Key": f"{bucket}/{filename}", "size": size}
@@ -0,0 +1,46 @@
+from fastapi import Request, Response, HTTPException, status
+from app.api.router_base import router_storage as router
+from app.utility.storage import get_storage_backend, LocalStorageBackend
+
+
+@router.put("/upload/{bucket}/{filename}/parts/{part_number}")
+async def upload_object_part(
+        request: Request,
+        response: Response,
+        bucket: str,
+        filename: str,
+        part_number: int,
+        upload_id: str,
+        expires: int,
+        token: str
+):
+    """Target of the presigned part upload URLs of the local storage backend"""
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found"
+        )
+
+    if not backend.verify_upload_token(f"{upload_id}/{part_number}", expires, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Upload URL is invalid or expired"
+        )
+
+    try:
+        etag = await backend.upload_part_stream(upload_id, part_number, request.stream())
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload was completed or aborted"
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid upload ID"
+        )
+
+    # Same header S3 answers a part upload with
+    response.headers["ETag"] = etag
+    return {"part_number": part_number, "etag": etag}
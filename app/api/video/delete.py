@@ -1,18 +1,23 @@
-from fastapi import Request, HTTPException, status, Depends
+from fastapi import Request, HTTPException, status, Depends, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func
 from app.db.dependency import get_db
-from app.model.job import JobModel
+from app.model.job import JobModel, JobStatus
 from app.model.session import SessionModel
 from app.model.video import VideoModel
 from app.model.user import UserModel
-from app.utility.storage import delete_from_supabase_storage
+from app.service.videoPurger import purge_video
 from app.api.router_base import router_video as router
 from app.utility.time import utc_now
 
 
-@router.delete("/{id}/delete")
-async def delete_video(id: int, request: Request, db: AsyncSession = Depends(get_db)):
+@router.delete("/{id}/delete", status_code=status.HTTP_202_ACCEPTED)
+async def delete_video(
+        id: int,
+        request: Request,
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_db)
+):
     session_token = request.cookies.get("session_token")
     if not session_token:
         raise HTTPException(
@@ -42,8 +47,12 @@ async def delete_video(id: int, request: Request, db: AsyncSession = Depends(get
             detail="User not found"
         )
 
+    # Locked until the soft delete commits: /runpod/summarize locks the video too, so a job is
+    # either created before the running-job check below (and counted) or sees the video deleted
     result = await db.execute(
-        select(VideoModel).where(VideoModel.id == id)
+        select(VideoModel)
+        .where(VideoModel.id == id, VideoModel.deleted_at.is_(None))
+        .with_for_update()
     )
     video = result.scalar_one_or_none()
 
@@ -60,40 +69,30 @@ async def delete_video(id: int, request: Request, db: AsyncSession = Depends(get
         )
 
     result = await db.execute(
-        select(JobModel).where(JobModel.video_id == id)
+        select(func.count()).where(
+            JobModel.video_id == id,
+            JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+        )
     )
-    related_jobs = result.scalars().all()
+    running_jobs = result.scalar()
 
-    running_jobs = [job for job in related_jobs if job.status in ["pending", "processing"]]
     if running_jobs:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"Cannot delete video. {len(running_jobs)} job(s) still running."
+            detail=f"Cannot delete video. {running_jobs} job(s) still running."
         )
 
-    for job in related_jobs:
-        if job.result_url:
-            try:
-                await delete_from_supabase_storage(job.result_url, bucket="outputs")
-            except Exception as e:
-                print(f"Error deleting job result file: {str(e)}")
-        await db.delete(job)
-
-    try:
-        await delete_from_supabase_storage(video.file_path, bucket="videos")
-    except Exception as e:
-        print(f"Error deleting video file: {str(e)}")
-
-    if video.thumbnail_path:
-        try:
-            await delete_from_supabase_storage(video.thumbnail_path, bucket="thumbnails")
-        except Exception as e:
-            print(f"Error deleting thumbnail: {str(e)}")
-
-    await db.delete(video)
+    # The video disappears right away; its files, jobs and row are purged after the response
+    await db.execute(
+        update(VideoModel)
+        .where(VideoModel.id == id, VideoModel.deleted_at.is_(None))
+        .values(deleted_at=utc_now())
+    )
     await db.commit()
 
+    background_tasks.add_task(purge_video, id)
+
     return {
-        "message": "Video and thumbnail deleted successfully",
+        "message": "Video deletion accepted",
         "video_id": id
-    }
\ No newline at end of file
+    }
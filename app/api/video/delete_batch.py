@@ -0,0 +1,120 @@
+from fastapi import Request, HTTPException, status, Depends, BackgroundTasks
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from app.db.dependency import get_db
+from app.model.job import JobModel, JobStatus
+from app.model.session import SessionModel
+from app.model.video import VideoModel
+from app.model.user import UserModel
+from app.service.videoPurger import purge_videos
+from app.api.router_base import router_video as router
+from app.utility.time import utc_now
+
+DELETE_BATCH_MAX_SIZE = 100
+
+
+class DeleteBatchRequest(BaseModel):
+    video_ids: list[int] = Field(..., min_length=1, max_length=DELETE_BATCH_MAX_SIZE)
+
+
+@router.post("/delete-batch", status_code=status.HTTP_202_ACCEPTED)
+async def delete_videos(
+        request: Request,
+        body: DeleteBatchRequest,
+        background_tasks: BackgroundTasks,
+        db: AsyncSession = Depends(get_db)
+):
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Login required"
+        )
+
+    result = await db.execute(
+        select(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session or (session.expires_at and session.expires_at < utc_now()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session expired or invalid"
+        )
+
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == session.user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    video_ids = list(dict.fromkeys(body.video_ids))
+
+    # Locked until the soft delete commits, see /video/{id}/delete
+    result = await db.execute(
+        select(VideoModel.id, VideoModel.user_id)
+        .where(VideoModel.id.in_(video_ids), VideoModel.deleted_at.is_(None))
+        .order_by(VideoModel.id)
+        .with_for_update()
+    )
+    videos = {row.id: row for row in result.all()}
+
+    # Counted after the lock, so jobs a concurrent summarize committed meanwhile are included
+    running_jobs = {}
+    if videos:
+        result = await db.execute(
+            select(JobModel.video_id, func.count())
+            .where(
+                JobModel.video_id.in_(list(videos)),
+                JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+            )
+            .group_by(JobModel.video_id)
+        )
+        running_jobs = dict(result.all())
+
+    results = {}
+    deletable = []
+    for video_id in video_ids:
+        video = videos.get(video_id)
+        if video is None:
+            results[video_id] = "not_found"
+        elif video.user_id != user.id:
+            results[video_id] = "forbidden"
+        elif running_jobs.get(video_id):
+            results[video_id] = "running"
+        else:
+            deletable.append(video_id)
+
+    deleted = []
+    if deletable:
+        result = await db.execute(
+            update(VideoModel)
+            .where(
+                VideoModel.id.in_(deletable),
+                VideoModel.user_id == user.id,
+                VideoModel.deleted_at.is_(None)
+            )
+            .values(deleted_at=utc_now())
+            .returning(VideoModel.id)
+        )
+        deleted = result.scalars().all()
+        await db.commit()
+
+    for video_id in deletable:
+        # A concurrent delete may have marked it first
+        results[video_id] = "deleted" if video_id in deleted else "not_found"
+
+    if deleted:
+        # One grouped storage removal per bucket for all the videos
+        background_tasks.add_task(purge_videos, list(deleted))
+
+    return {
+        "message": f"{len(deleted)} video(s) deletion accepted",
+        "results": [{"video_id": video_id, "result": results[video_id]} for video_id in video_ids]
+    }
@@ -41,7 +41,7 @@ async def get_video_detail(id: int, request: Request, db: AsyncSession = Depends
         )
 
     result = await db.execute(
-        select(VideoModel).where(VideoModel.id == id)
+        select(VideoModel).where(VideoModel.id == id, VideoModel.deleted_at.is_(None))
     )
     video = result.scalar_one_or_none()
 
@@ -63,4 +63,11 @@ async def get_video_detail(id: int, request: Request, db: AsyncSession = Depends
         "youtube_id": video.youtube_id,
         "file_path": video.file_path,
         "thumbnail_path": video.thumbnail_path,
+        "size_bytes": video.size_bytes,
+        "duration": video.duration,
+        "video_codec": video.video_codec,
+        "audio_codec": video.audio_codec,
+        "faststart": video.faststart,
+        "width": video.width,
+        "height": video.height,
     }
\ No newline at end of file
@@ -7,7 +7,7 @@ from app.model.session import SessionModel
 from app.model.video import VideoModel
 from app.model.user import UserModel
 from datetime import datetime, UTC
-from app.utility.storage import create_signed_url
+from app.utility.storage import create_signed_url, SIGNED_URL_EXPIRES_IN
 from app.api.router_base import router_video as router
 from app.utility.time import utc_now
 
@@ -48,7 +48,7 @@ async def download_video(
         )
 
     result = await db.execute(
-        select(VideoModel).where(VideoModel.id == video_id)
+        select(VideoModel).where(VideoModel.id == video_id, VideoModel.deleted_at.is_(None))
     )
     video = result.scalar_one_or_none()
 
@@ -66,7 +66,7 @@ async def download_video(
 
     try:
         filename = video.file_path.split("/")[-1]
-        signed_url = await create_signed_url(filename, expires_in=3600)
+        signed_url = await create_signed_url(filename, expires_in=SIGNED_URL_EXPIRES_IN)
         return RedirectResponse(url=signed_url)
 
     except Exception as e:
@@ -7,6 +7,7 @@ from app.model.video import VideoModel
 from app.model.user import UserModel
 from app.api.router_base import router_video as router
 from app.utility.time import utc_now
+from app.utility.storage import create_signed_urls, SIGNED_URL_EXPIRES_IN
 
 
 @router.get("/my")
@@ -41,10 +42,20 @@ async def get_my_videos(request: Request, db: AsyncSession = Depends(get_db)):
         )
 
     result = await db.execute(
-        select(VideoModel).where(VideoModel.user_id == user.id)
+        select(VideoModel).where(VideoModel.user_id == user.id, VideoModel.deleted_at.is_(None))
     )
     videos = result.scalars().all()
 
+    # Ready-to-use download links, signed in one request (or served from the signed URL cache)
+    try:
+        download_urls = await create_signed_urls(
+            [video.file_path.split("/")[-1] for video in videos],
+            expires_in=SIGNED_URL_EXPIRES_IN
+        )
+    except Exception as e:
+        print(f"Error signing download links: {str(e)}")
+        download_urls = {}
+
     return {
         "videos": [
             {
@@ -53,7 +64,8 @@ async def get_my_videos(request: Request, db: AsyncSession = Depends(get_db)):
                 "youtube_id": video.youtube_id,
                 "file_path": video.file_path,
                 "thumbnail_path": video.thumbnail_path,
-                "name": video.name
+                "name": video.name,
+                "download_url": download_urls.get(video.file_path.split("/")[-1])
             }
             for video in videos
         ],
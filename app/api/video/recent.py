@@ -19,6 +19,7 @@ async def get_recent_videos(
         .join(VideoModel, JobModel.video_id == VideoModel.id)
         .where(JobModel.status == "completed")
         .where(JobModel.public.is_(True))
+        .where(VideoModel.deleted_at.is_(None))
         .order_by(JobModel.created_at.desc())
         .limit(limit)
     )
@@ -35,6 +36,7 @@ async def get_recent_videos(
             "subtitle": job.subtitle,
             "vertical": job.vertical,
             "result_url": job.result_url,
+            "hls_url": job.hls_url,  # Adaptive stream, null until packaged
             "thumbnail_path": video.thumbnail_path,
             "subtitle_style": job.subtitle_style,
             "crop_method": job.crop_method,
@@ -4,18 +4,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.dependency import get_db
 from app.model.session import SessionModel
+from app.model.upload import UploadSessionStatus
 from app.model.video import VideoModel
 from app.model.user import UserModel
 from app.utility.time import utc_now
-from app.config.environments import SUPABASE_PROJECT_URL, RUNPOD_URL, RUNPOD_API_KEY
 from app.api.router_base import router_video as router
-import requests
+from app.service.runpodDispatcher import choose_endpoint
+from app.utility.runpod import submit_runpod_job
+from app.utility.credit import get_credit_balance, spend_credit
+from app.utility.multipart import get_upload_session, complete_upload_session
+from app.utility.storage import get_file_url
+from app.utility.upload import verify_uploaded_video
+from app.utility.idempotency import begin_idempotent_request, save_idempotent_response, release_idempotency_key
+import asyncio
 
 
 class UploadDoneRequest(BaseModel):
     video_uuid: str
     original_filename: str
     filename: str
+    upload_id: str | None = None  # Set to finalize a multipart upload
 
 
 @router.post("/upload/done")
@@ -41,47 +49,84 @@ async def upload_done(
     )
     user = result.scalar_one_or_none()
 
-    if not user or user.credit < 1:
+    if not user:
         raise HTTPException(status_code=402, detail="Insufficient credit")
 
-    file_url = f"{SUPABASE_PROJECT_URL}/storage/v1/object/public/videos/{body.filename}"
-
-    requests.post(
-        url=f"{RUNPOD_URL}/run",
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {RUNPOD_API_KEY}"
-        },
-        json={
-            "input": {
-                "job_id": body.video_uuid,
-                "task": "generate_thumbnail",
-                "video_url": file_url
-            }
+    # Retried requests with the same Idempotency-Key get the original response instead of a second video
+    idempotency_key = request.headers.get("Idempotency-Key")
+    replay = await begin_idempotent_request(db, idempotency_key, user.id, "upload_done", body.model_dump())
+    if replay:
+        return replay
+
+    try:
+        if await get_credit_balance(db, user.id) < 1:
+            raise HTTPException(status_code=402, detail="Insufficient credit")
+
+        expected_size = None
+        if body.upload_id:
+            upload = await get_upload_session(db, body.upload_id, user.id)
+            if upload.filename != body.filename or upload.video_uuid != body.video_uuid:
+                raise HTTPException(status_code=422, detail="filename and video_uuid don't match the upload")
+
+            # A retry after the parts were assembled goes straight on
+            if upload.status != UploadSessionStatus.COMPLETED:
+                try:
+                    await complete_upload_session(db, upload)
+                except HTTPException:
+                    raise
+                except Exception as e:
+                    print(f"Error completing multipart upload {upload.id}: {str(e)}")
+                    raise HTTPException(status_code=500, detail="Failed to assemble the uploaded parts")
+                # Assembling can't be repeated in storage, so it's recorded even if the rest fails
+                await db.commit()
+            expected_size = upload.size
+
+        # Missing, truncated or non-video uploads are rejected before charging or queueing GPU work
+        metadata = await verify_uploaded_video(body.filename, "videos", expected_size)
+
+        file_url = get_file_url(body.filename, "videos")
+
+        thumbnail_url = file_url.replace("/videos/", "/thumbnails/")
+        if thumbnail_url.endswith(".mp4"):
+            thumbnail_url = thumbnail_url[:-4] + ".jpg"
+
+        video = VideoModel(
+            user_id=user.id,
+            file_path=file_url,
+            name=body.original_filename,
+            thumbnail_path=thumbnail_url,
+            youtube_id=None,
+            **metadata
+        )
+        if not await spend_credit(db, user.id, 1):
+            raise HTTPException(status_code=402, detail="Insufficient credit")
+
+        db.add(video)
+        await db.flush()
+
+        response = {
+            "message": "Upload completed",
+            "video_id": video.id,
+            "video_url": file_url,
+            "thumbnail_url": thumbnail_url
         }
-    )
+        await save_idempotent_response(db, idempotency_key, user.id, "upload_done", response)
+        await db.commit()
 
-    thumbnail_url = file_url.replace("/videos/", "/thumbnails/")
-    if thumbnail_url.endswith(".mp4"):
-        thumbnail_url = thumbnail_url[:-4] + ".jpg"
+    except Exception:
+        await release_idempotency_key(db, idempotency_key, user.id, "upload_done")
+        raise
 
-    video = VideoModel(
-        user_id=user.id,
-        file_path=file_url,
-        name=body.original_filename,
-        thumbnail_path=thumbnail_url,
-        youtube_id=None
-    )
-    db.add(video)
-    await db.commit()
-    await db.refresh(video)
-
-    user.credit -= 1
-    await db.commit()
-
-    return {
-        "message": "Upload completed",
-        "video_id": video.id,
-        "video_url": file_url,
-        "thumbnail_url": thumbnail_url
-    }
\ No newline at end of file
+    # GPU work only starts once the debit is committed, so neither a rejected debit nor a
+    # replayed retry queues it
+    try:
+        await asyncio.to_thread(submit_runpod_job, choose_endpoint().url, {
+            "job_id": body.video_uuid,
+            "task": "generate_thumbnail",
+            "video_url": file_url
+        })
+    except Exception as e:
+        # The video is stored and paid for; it is only left without a thumbnail
+        print(f"Error submitting thumbnail job for {body.filename}: {str(e)}")
+
+    return response
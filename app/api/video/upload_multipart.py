@@ -0,0 +1,94 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from fastapi import Request, HTTPException, Depends
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.config.environments import MULTIPART_UPLOAD_TTL
+from app.db.dependency import get_db
+from app.model.session import SessionModel
+from app.model.upload import UploadSessionModel, UploadSessionStatus
+from app.model.user import UserModel
+from app.utility.time import utc_now
+from app.utility.credit import get_credit_balance
+from app.utility.multipart import plan_parts
+from app.api.router_base import router_video as router
+from app.utility.storage import create_multipart_upload
+
+
+class MultipartUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+    size: int = Field(..., gt=0)
+
+
+@router.post("/upload/multipart")
+async def start_multipart_upload(
+        request: Request,
+        body: MultipartUploadRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Login required")
+
+    result = await db.execute(
+        select(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session or (session.expires_at and session.expires_at < utc_now()):
+        raise HTTPException(status_code=401, detail="Session expired or invalid")
+
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == session.user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if await get_credit_balance(db, user.id) < 1:
+        raise HTTPException(status_code=402, detail="Insufficient credit")
+
+    file_extension = Path(body.filename).suffix
+    video_uuid = str(uuid.uuid4())
+    unique_filename = f"{video_uuid}{file_extension}"
+    part_size, part_count = plan_parts(body.size)
+
+    try:
+        storage_upload_id = await asyncio.to_thread(
+            create_multipart_upload, unique_filename, body.content_type, "videos"
+        )
+    except Exception as e:
+        print(f"Error starting multipart upload: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to start multipart upload")
+
+    upload = UploadSessionModel(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        video_uuid=video_uuid,
+        bucket="videos",
+        filename=unique_filename,
+        content_type=body.content_type,
+        storage_upload_id=storage_upload_id,
+        size=body.size,
+        part_size=part_size,
+        part_count=part_count,
+        status=UploadSessionStatus.UPLOADING,
+        expires_at=utc_now() + timedelta(seconds=MULTIPART_UPLOAD_TTL)
+    )
+    db.add(upload)
+    await db.commit()
+
+    return {
+        "upload_id": upload.id,
+        "video_uuid": video_uuid,
+        "filename": unique_filename,
+        "part_size": part_size,
+        "part_count": part_count,
+        "expires_at": upload.expires_at,
+        "user_id": user.id
+    }
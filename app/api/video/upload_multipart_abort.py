@@ -0,0 +1,55 @@
+import asyncio
+from fastapi import Request, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.db.dependency import get_db
+from app.model.session import SessionModel
+from app.model.upload import UploadSessionStatus
+from app.model.user import UserModel
+from app.utility.time import utc_now
+from app.utility.multipart import get_upload_session
+from app.api.router_base import router_video as router
+from app.utility.storage import abort_multipart_upload
+
+
+@router.delete("/upload/multipart/{upload_id}")
+async def abort_upload(
+        upload_id: str,
+        request: Request,
+        db: AsyncSession = Depends(get_db)
+):
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Login required")
+
+    result = await db.execute(
+        select(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session or (session.expires_at and session.expires_at < utc_now()):
+        raise HTTPException(status_code=401, detail="Session expired or invalid")
+
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == session.user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    upload = await get_upload_session(db, upload_id, user.id)
+    if upload.status != UploadSessionStatus.UPLOADING:
+        raise HTTPException(status_code=409, detail=f"Upload is already {upload.status.value}")
+
+    try:
+        await asyncio.to_thread(abort_multipart_upload, upload.filename, upload.storage_upload_id, upload.bucket)
+    except Exception as e:
+        print(f"Error aborting multipart upload {upload.id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to abort upload")
+
+    upload.status = UploadSessionStatus.ABORTED
+    upload.completed_at = utc_now()
+    await db.commit()
+
+    return {"message": "Upload aborted", "upload_id": upload.id}
@@ -0,0 +1,69 @@
+import asyncio
+from fastapi import Request, HTTPException, Depends
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.db.dependency import get_db
+from app.model.session import SessionModel
+from app.model.upload import UploadSessionStatus
+from app.model.user import UserModel
+from app.utility.time import utc_now
+from app.utility.multipart import get_upload_session, MULTIPART_PART_URL_EXPIRES_IN, MULTIPART_URLS_PER_REQUEST
+from app.api.router_base import router_video as router
+from app.utility.storage import create_part_upload_urls
+
+
+class PartUrlsRequest(BaseModel):
+    part_numbers: list[int] = Field(..., min_length=1, max_length=MULTIPART_URLS_PER_REQUEST)
+
+
+@router.post("/upload/multipart/{upload_id}/parts")
+async def sign_multipart_parts(
+        upload_id: str,
+        request: Request,
+        body: PartUrlsRequest,
+        db: AsyncSession = Depends(get_db)
+):
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Login required")
+
+    result = await db.execute(
+        select(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session or (session.expires_at and session.expires_at < utc_now()):
+        raise HTTPException(status_code=401, detail="Session expired or invalid")
+
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == session.user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    upload = await get_upload_session(db, upload_id, user.id)
+    if upload.status != UploadSessionStatus.UPLOADING or upload.expires_at < utc_now():
+        raise HTTPException(status_code=409, detail="Upload was completed, aborted or has expired")
+
+    part_numbers = list(dict.fromkeys(body.part_numbers))
+    if any(number < 1 or number > upload.part_count for number in part_numbers):
+        raise HTTPException(status_code=422, detail=f"Part numbers must be between 1 and {upload.part_count}")
+
+    # Presigning makes no request but is an HMAC per part (and builds the S3 client on first use)
+    urls = await asyncio.to_thread(
+        create_part_upload_urls,
+        upload.filename,
+        upload.storage_upload_id,
+        part_numbers,
+        MULTIPART_PART_URL_EXPIRES_IN,
+        upload.bucket
+    )
+
+    return {
+        "upload_id": upload.id,
+        "expires_in": MULTIPART_PART_URL_EXPIRES_IN,
+        "parts": [{"part_number": number, "url": urls[number]} for number in part_numbers]
+    }
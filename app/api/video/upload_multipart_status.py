@@ -0,0 +1,66 @@
+from fastapi import Request, HTTPException, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.db.dependency import get_db
+from app.model.session import SessionModel
+from app.model.upload import UploadSessionStatus
+from app.model.user import UserModel
+from app.utility.time import utc_now
+from app.utility.multipart import get_upload_session, sync_upload_parts, missing_parts
+from app.api.router_base import router_video as router
+
+
+@router.get("/upload/multipart/{upload_id}")
+async def get_multipart_upload(
+        upload_id: str,
+        request: Request,
+        db: AsyncSession = Depends(get_db)
+):
+    """Parts uploaded so far, so a client can resume with the missing ones"""
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Login required")
+
+    result = await db.execute(
+        select(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    session = result.scalar_one_or_none()
+
+    if not session or (session.expires_at and session.expires_at < utc_now()):
+        raise HTTPException(status_code=401, detail="Session expired or invalid")
+
+    result = await db.execute(
+        select(UserModel).where(UserModel.id == session.user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    upload = await get_upload_session(db, upload_id, user.id)
+
+    response = {
+        "upload_id": upload.id,
+        "video_uuid": upload.video_uuid,
+        "filename": upload.filename,
+        "status": upload.status.value,
+        "size": upload.size,
+        "part_size": upload.part_size,
+        "part_count": upload.part_count,
+        "expires_at": upload.expires_at,
+    }
+    if upload.status != UploadSessionStatus.UPLOADING:
+        return response
+
+    try:
+        parts = await sync_upload_parts(db, upload)
+    except Exception as e:
+        print(f"Error listing parts of upload {upload.id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list uploaded parts")
+    await db.commit()
+
+    missing = missing_parts(upload, parts)
+    response["uploaded_parts"] = [number for number in sorted(parts) if number not in missing]
+    response["missing_parts"] = missing
+    response["uploaded_bytes"] = sum(parts[number]["size"] for number in response["uploaded_parts"])
+    return response
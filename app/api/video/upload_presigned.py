@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from pathlib import Path
 from fastapi import Request, HTTPException, Depends
@@ -7,9 +8,9 @@ from app.db.dependency import get_db
 from app.model.session import SessionModel
 from app.model.user import UserModel
 from app.utility.time import utc_now
-from app.config.environments import SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY
+from app.utility.credit import get_credit_balance
 from app.api.router_base import router_video as router
-import requests
+from app.utility.storage import create_upload_url
 
 
 @router.get("/upload/presign")
@@ -39,29 +40,20 @@ async def upload_presigned(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if user.credit < 1:
+    if await get_credit_balance(db, user.id) < 1:
         raise HTTPException(status_code=402, detail="Insufficient credit")
 
     file_extension = Path(filename).suffix
     video_uuid = str(uuid.uuid4())
     unique_filename = f"{video_uuid}{file_extension}"
 
-    response = requests.post(
-        f"{SUPABASE_PROJECT_URL}/storage/v1/object/upload/sign/videos/{unique_filename}",
-        headers={
-            "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={"expiresIn": 1800}
-    )
-
-    if response.status_code != 200:
+    try:
+        presigned_url = await asyncio.to_thread(create_upload_url, unique_filename, "videos", 1800)
+    except Exception:
         raise HTTPException(status_code=500, detail="Failed to generate presigned URL")
 
-    data = response.json()
-
     return {
-        "presigned_url": f"{SUPABASE_PROJECT_URL}/storage/v1{data['url']}",
+        "presigned_url": presigned_url,
         "video_uuid": video_uuid,
         "filename": unique_filename,
         "user_id": user.id
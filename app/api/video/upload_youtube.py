@@ -9,9 +9,9 @@ from app.model.video import VideoModel
 from app.model.user import UserModel
 from app.utility.time import utc_now
 from app.utility.youtube import download_youtube_video
-from app.utility.storage import upload_file_to_supabase_storage
-from app.utility.video import generate_thumbnail
-import tempfile, os, uuid, shutil
+from app.utility.storage import upload_file_to_storage
+from app.utility.video import generate_thumbnail, probe_video, ensure_faststart
+import asyncio, tempfile, os, uuid, shutil
 from app.api.router_base import router_video as router
 
 
@@ -58,11 +58,30 @@ async def upload_youtube_video(request: Request, data: YouTubeUploadRequest, db:
         original_suffix = Path(file_path).suffix
         unique_filename = f"{video_uuid}{original_suffix}"
 
+        # yt-dlp may write the moov atom last, players then have to fetch the end of the file first
+        try:
+            faststart = await asyncio.to_thread(ensure_faststart, str(file_path))
+        except (ValueError, RuntimeError) as e:
+            print(f"Error remuxing YouTube video {data.youtube_id}: {str(e)}")
+            faststart = False
+
+        try:
+            metadata = {
+                "faststart": faststart,
+                "size_bytes": os.path.getsize(file_path),
+                "content_type": "video/mp4",
+                **await asyncio.to_thread(probe_video, str(file_path))
+            }
+        except (ValueError, RuntimeError) as e:
+            print(f"Error probing YouTube video {data.youtube_id}: {str(e)}")
+            metadata = {"faststart": faststart}
+
         with open(file_path, 'rb') as f:
             file_content = f.read()
 
-        file_url = await upload_file_to_supabase_storage(
-            file_content=file_content,
+        file_url = await asyncio.to_thread(
+            upload_file_to_storage,
+            file=file_content,
             filename=unique_filename,
             content_type="video/mp4",
             bucket="videos"
@@ -82,8 +101,9 @@ async def upload_youtube_video(request: Request, data: YouTubeUploadRequest, db:
             with open(thumbnail_path, 'rb') as thumb_file:
                 thumbnail_content = thumb_file.read()
 
-            thumbnail_url = await upload_file_to_supabase_storage(
-                file_content=thumbnail_content,
+            thumbnail_url = await asyncio.to_thread(
+                upload_file_to_storage,
+                file=thumbnail_content,
                 filename=thumbnail_filename,
                 content_type="image/jpeg",
                 bucket="thumbnails"
@@ -112,7 +132,8 @@ async def upload_youtube_video(request: Request, data: YouTubeUploadRequest, db:
         file_path=file_url,
         thumbnail_path=thumbnail_url,
         youtube_id=data.youtube_id,
-        name=video_title
+        name=video_title,
+        **metadata
     )
     db.add(video)
     await db.commit()
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from app.middleware.cors import add_cors
+from app.middleware.metrics import add_metrics
 from app.middleware.session import add_session
 from app.middleware.static import add_static_file_serving
 from app.api.router import add_router
@@ -13,6 +14,7 @@ application = FastAPI(
 )
 
 add_cors(application)
+add_metrics(application)
 add_session(application)
 add_static_file_serving(application)
 add_router(application)
\ No newline at end of file
@@ -3,9 +3,51 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def parse_runpod_endpoint(entry: str) -> tuple[str | None, str]:
+    # "https://..." serves every method, "llm_only=https://..." only the given method
+    method, separator, url = entry.partition("=")
+    if not separator or "://" in method:
+        return None, entry
+    return method.strip(), url.strip()
+
+
 DEFAULT_SESSION_EXPIRE_TIME = 60 * 60 * 6  # 6 Hour
 DEFAULT_PORT = 8080
 DEFAULT_ENVIRONMENT = "development"
+DEFAULT_WEB_CONCURRENCY = 4
+DEFAULT_GRACEFUL_SHUTDOWN_TIMEOUT = 30  # seconds
+DEFAULT_DB_POOL_SIZE = 0  # 0 disables pooling (serverless)
+DEFAULT_DB_MAX_OVERFLOW = 10
+DEFAULT_WARMUP_ENABLED = "true"
+DEFAULT_WARMUP_TIMEOUT = 30  # seconds
+DEFAULT_READINESS_TTL = 10  # seconds between background dependency checks
+DEFAULT_RUNPOD_SAMPLE_INTERVAL = 5  # seconds between RunPod queue depth samples
+DEFAULT_SCHEDULER_INTERVAL = 1.0  # seconds between scheduling rounds when nothing wakes the scheduler
+DEFAULT_SCHEDULER_USER_INFLIGHT_LIMIT = 3  # RunPod jobs a single user can have processing at once
+DEFAULT_SCHEDULER_MAX_INFLIGHT = 0  # 0 means no global limit
+DEFAULT_IDEMPOTENCY_TTL = 60 * 60 * 24  # 24 Hour
+DEFAULT_CREDIT_COMPACTION_INTERVAL = 60  # seconds between credit ledger compactions
+DEFAULT_ANALYTICS_CACHE_TTL = 60  # seconds job analytics are cached
+DEFAULT_VIDEO_PURGE_INTERVAL = 5 * 60  # seconds between sweeps for deleted videos left unpurged
+DEFAULT_ACCOUNT_PURGE_INTERVAL = 60  # seconds between sweeps for unfinished account purges
+DEFAULT_ACCOUNT_PURGE_CONCURRENCY = 4  # concurrent Storage/RunPod calls per account purge
+DEFAULT_STORAGE_GC_INTERVAL = 60 * 60 * 6  # 6 Hour
+DEFAULT_STORAGE_GC_GRACE = 60 * 60 * 24  # unreferenced objects younger than this are kept
+DEFAULT_STORAGE_GC_DRY_RUN = "false"
+DEFAULT_VIDEO_REMUX_INTERVAL = 30  # seconds between sweeps for uploaded MP4s that aren't fast-start
+DEFAULT_HLS_ENABLED = "true"
+DEFAULT_HLS_RENDITIONS = "720p,480p,360p"  # from app/utility/hls.py HLS_LADDER
+DEFAULT_HLS_SEGMENT_DURATION = 6  # seconds
+DEFAULT_HLS_CONCURRENCY = 2  # results packaged at once, each FFmpeg run uses several cores
+DEFAULT_HLS_INTERVAL = 10  # seconds between checks for completed jobs when nothing wakes the packager
+DEFAULT_STORAGE_BACKEND = "supabase"
+DEFAULT_LOCAL_STORAGE_DIR = "uploads"  # relative to the project root
+DEFAULT_MULTIPART_PART_SIZE = 16 * 1024 * 1024  # bytes, raised for files that would need more than 10000 parts
+DEFAULT_MULTIPART_UPLOAD_TTL = 60 * 60 * 24  # 24 Hour
+DEFAULT_SUPABASE_S3_REGION = "us-east-1"
+DEFAULT_LOOP_LAG_INTERVAL = 0.5  # seconds between loop lag samples
+DEFAULT_LOOP_LAG_THRESHOLD = 0.2  # lag (seconds) after which the blocking stack is captured
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
@@ -15,17 +57,72 @@ SESSION_EXPIRE_TIME = int(os.getenv("SESSION_EXPIRE_TIME", DEFAULT_SESSION_EXPIR
 PORT = int(os.getenv("PORT", DEFAULT_PORT))
 ENVIRONMENT = os.getenv("ENVIRONMENT", DEFAULT_ENVIRONMENT)
 ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",")]
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", DEFAULT_WEB_CONCURRENCY))
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", DEFAULT_GRACEFUL_SHUTDOWN_TIMEOUT))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", DEFAULT_DB_POOL_SIZE))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", DEFAULT_DB_MAX_OVERFLOW))
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", DEFAULT_WARMUP_ENABLED).lower() == "true"
+WARMUP_TIMEOUT = int(os.getenv("WARMUP_TIMEOUT", DEFAULT_WARMUP_TIMEOUT))
+READINESS_TTL = int(os.getenv("READINESS_TTL", DEFAULT_READINESS_TTL))
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", DEFAULT_IDEMPOTENCY_TTL))
+CREDIT_COMPACTION_INTERVAL = int(os.getenv("CREDIT_COMPACTION_INTERVAL", DEFAULT_CREDIT_COMPACTION_INTERVAL))
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", DEFAULT_ANALYTICS_CACHE_TTL))
+VIDEO_PURGE_INTERVAL = int(os.getenv("VIDEO_PURGE_INTERVAL", DEFAULT_VIDEO_PURGE_INTERVAL))
+ACCOUNT_PURGE_INTERVAL = int(os.getenv("ACCOUNT_PURGE_INTERVAL", DEFAULT_ACCOUNT_PURGE_INTERVAL))
+ACCOUNT_PURGE_CONCURRENCY = int(os.getenv("ACCOUNT_PURGE_CONCURRENCY", DEFAULT_ACCOUNT_PURGE_CONCURRENCY))
+STORAGE_GC_INTERVAL = int(os.getenv("STORAGE_GC_INTERVAL", DEFAULT_STORAGE_GC_INTERVAL))
+STORAGE_GC_GRACE = int(os.getenv("STORAGE_GC_GRACE", DEFAULT_STORAGE_GC_GRACE))
+STORAGE_GC_DRY_RUN = os.getenv("STORAGE_GC_DRY_RUN", DEFAULT_STORAGE_GC_DRY_RUN).lower() == "true"
+VIDEO_REMUX_INTERVAL = int(os.getenv("VIDEO_REMUX_INTERVAL", DEFAULT_VIDEO_REMUX_INTERVAL))
+HLS_ENABLED = os.getenv("HLS_ENABLED", DEFAULT_HLS_ENABLED).lower() == "true"
+HLS_RENDITIONS = [name.strip() for name in os.getenv("HLS_RENDITIONS", DEFAULT_HLS_RENDITIONS).split(",") if name.strip()]
+HLS_SEGMENT_DURATION = int(os.getenv("HLS_SEGMENT_DURATION", DEFAULT_HLS_SEGMENT_DURATION))
+HLS_CONCURRENCY = max(1, int(os.getenv("HLS_CONCURRENCY", DEFAULT_HLS_CONCURRENCY)))
+HLS_INTERVAL = int(os.getenv("HLS_INTERVAL", DEFAULT_HLS_INTERVAL))
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", DEFAULT_STORAGE_BACKEND).lower()
+if STORAGE_BACKEND not in ("supabase", "local"):
+    raise RuntimeError("STORAGE_BACKEND must be either supabase or local")
+LOCAL_STORAGE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    os.getenv("LOCAL_STORAGE_DIR", DEFAULT_LOCAL_STORAGE_DIR)
+)
+# Internal nginx location aliasing LOCAL_STORAGE_DIR, lets nginx send the files (e.g. "/_uploads")
+LOCAL_STORAGE_ACCEL_REDIRECT = os.getenv("LOCAL_STORAGE_ACCEL_REDIRECT", "").rstrip("/")
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", DEFAULT_MULTIPART_PART_SIZE))
+MULTIPART_UPLOAD_TTL = int(os.getenv("MULTIPART_UPLOAD_TTL", DEFAULT_MULTIPART_UPLOAD_TTL))
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", DEFAULT_LOOP_LAG_INTERVAL))
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", DEFAULT_LOOP_LAG_THRESHOLD))
 
 SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
 SUPABASE_PROJECT_URL = os.getenv("SUPABASE_PROJECT_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
-if not all([SUPABASE_DB_URL, SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY]):
+# The project URL and service key are only needed when Supabase hosts the storage
+if not SUPABASE_DB_URL or (STORAGE_BACKEND == "supabase" and not all([SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY])):
     raise RuntimeError("SUPABASE related environment variable is missing! Set it in your .env file.")
+# S3 access keys of Supabase Storage, only needed for multipart uploads
+SUPABASE_S3_ACCESS_KEY_ID = os.getenv("SUPABASE_S3_ACCESS_KEY_ID")
+SUPABASE_S3_SECRET_ACCESS_KEY = os.getenv("SUPABASE_S3_SECRET_ACCESS_KEY")
+SUPABASE_S3_REGION = os.getenv("SUPABASE_S3_REGION", DEFAULT_SUPABASE_S3_REGION)
 
 RUNPOD_URL = os.getenv("RUNPOD_URL")
 RUNPOD_API_KEY = os.getenv("RUNPOD_API_KEY")
-if not all([RUNPOD_URL, RUNPOD_API_KEY]):
+RUNPOD_ENDPOINTS = [
+    parse_runpod_endpoint(entry.strip())
+    for entry in os.getenv("RUNPOD_ENDPOINTS", "").split(",")
+    if entry.strip()
+]
+if not RUNPOD_ENDPOINTS and RUNPOD_URL:
+    RUNPOD_ENDPOINTS = [(None, RUNPOD_URL)]
+if not all([RUNPOD_ENDPOINTS, RUNPOD_API_KEY]):
     raise RuntimeError("RUNPOD related environment variable is missing! Set it in your .env file.")
+if not RUNPOD_URL:
+    RUNPOD_URL = RUNPOD_ENDPOINTS[0][1]
+RUNPOD_SAMPLE_INTERVAL = int(os.getenv("RUNPOD_SAMPLE_INTERVAL", DEFAULT_RUNPOD_SAMPLE_INTERVAL))
+SCHEDULER_INTERVAL = float(os.getenv("SCHEDULER_INTERVAL", DEFAULT_SCHEDULER_INTERVAL))
+SCHEDULER_USER_INFLIGHT_LIMIT = int(os.getenv("SCHEDULER_USER_INFLIGHT_LIMIT", DEFAULT_SCHEDULER_USER_INFLIGHT_LIMIT))
+SCHEDULER_MAX_INFLIGHT = int(os.getenv("SCHEDULER_MAX_INFLIGHT", DEFAULT_SCHEDULER_MAX_INFLIGHT))
+# Shared with the webhook relay and the reconciler, /runpod/webhook/batch is disabled without it
+WEBHOOK_BATCH_SECRET = os.getenv("WEBHOOK_BATCH_SECRET")
 
 BACKEND_URL = os.getenv("BACKEND_URL")
 if not BACKEND_URL:
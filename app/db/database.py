@@ -1,15 +1,27 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool  # 1. NullPool Ʈ ߰
-from app.config.environments import SUPABASE_DB_URL
+from app.config.environments import SUPABASE_DB_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
 
 # psycopg2 ּҸ asyncpg ȯ
 ASYNC_DB_URL = SUPABASE_DB_URL.replace("postgresql+psycopg2", "postgresql+asyncpg")
 
 # Vercel() ȭ 
+# DB_POOL_SIZE > 0: keep a pool of warm connections (long-running servers)
+if DB_POOL_SIZE > 0:
+    pool_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+    }
+else:
+    pool_options = {
+        "poolclass": NullPool,  # 2. Ǯ   /  ( ߿)
+    }
+
 engine = create_async_engine(
     ASYNC_DB_URL,
-    poolclass=NullPool,  # 2. Ǯ   /  ( ߿)
+    **pool_options,
     connect_args={
         "statement_cache_size": 0,
         "prepared_statement_cache_size": 0,
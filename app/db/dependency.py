@@ -1,5 +1,10 @@
+import time
 from app.db.database import AsyncSessionLocal
+from app.utility.metrics import DB_CHECKOUT_DURATION
 
 async def get_db():
     async with AsyncSessionLocal() as session:
+        start = time.perf_counter()
+        await session.connection()
+        DB_CHECKOUT_DURATION.observe(time.perf_counter() - start)
         yield session
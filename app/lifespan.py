@@ -1,7 +1,20 @@
 from fastapi import FastAPI
 from app.db.database import Base, engine
 from contextlib import asynccontextmanager
+from app.config.environments import GRACEFUL_SHUTDOWN_TIMEOUT, WARMUP_ENABLED
+from app.service.background import stop_background_tasks
 from app.service.sessionCleaner import start_cleanup_task
+from app.service.loopMonitor import start_loop_monitor, stop_loop_monitor
+from app.service.warmup import warm_up
+from app.service.readinessChecker import start_readiness_task
+from app.service.runpodDispatcher import start_dispatcher_task
+from app.service.jobScheduler import start_scheduler_task
+from app.service.creditCompactor import start_compaction_task
+from app.service.videoPurger import start_purge_task
+from app.service.accountPurger import start_account_purge_task
+from app.service.storageGc import start_storage_gc_task
+from app.service.videoRemuxer import start_remux_task
+from app.service.hlsPackager import start_hls_packager_task
 
 
 @asynccontextmanager
@@ -12,7 +25,25 @@ async def lifespan(application: FastAPI):
 # async with engine.begin() as conn:
  #       await conn.run_sync(Base.metadata.create_all)
 
+    start_loop_monitor()
+    if WARMUP_ENABLED:
+        # Runs before the server starts accepting requests, so the first ones are not slow
+        await warm_up(application)
+    start_readiness_task()
+    start_dispatcher_task()
+    start_scheduler_task()
     start_cleanup_task()
+    start_compaction_task()
+    start_purge_task()
+    start_account_purge_task()
+    start_storage_gc_task()
+    start_remux_task()
+    start_hls_packager_task()
     yield
     # Shutdown logic
-    print("App shutting down...")
\ No newline at end of file
+    print("App shutting down...")
+    stop_loop_monitor()
+    # Cancelling the leader-elected services rolls back their lock transactions,
+    # so another worker or instance can take over right away.
+    await stop_background_tasks(timeout=GRACEFUL_SHUTDOWN_TIMEOUT)
+    await engine.dispose()
@@ -0,0 +1,45 @@
+import time
+from app.utility.metrics import HTTP_REQUEST_DURATION
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording the latency of every HTTP request.
+
+    The route label is the matched route template (FastAPI stores the route in the scope
+    while routing), never the raw path, so the label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=template,
+                status=str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def add_metrics(application):
+    application.add_middleware(MetricsMiddleware)
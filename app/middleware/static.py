@@ -1,31 +1,227 @@
-from fastapi.staticfiles import StaticFiles
+import asyncio
+import mimetypes
 import os
+from email.utils import formatdate, parsedate_to_datetime
+from stat import S_ISREG
+from urllib.parse import quote, parse_qs
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.websockets import WebSocketClose
+from app.config.environments import LOCAL_STORAGE_DIR, LOCAL_STORAGE_ACCEL_REDIRECT
+from app.utility.storage import BUCKET_NAME_PATTERN, OBJECT_NAME_PATTERN
 
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"  # object names are unique, content never changes
+# Uploaded videos may be remuxed in place for fast start (app/service/videoRemuxer.py),
+# so caches revalidate them with the ETag instead, like files at the root of the directory
+REVALIDATED_BUCKETS = {"videos"}
+REVALIDATED_CACHE_CONTROL = "public, no-cache"
 
-def add_static_file_serving(application):
+# HLS playlists and segments of app/service/hlsPackager.py, missing from some systems' MIME tables
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+MEDIA_CHUNK_SIZE = 1024 * 1024  # bytes read per thread hop when the server can't send the file itself
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
     """
-    Mount static file serving for uploads directory.
-    Skips mounting if directory doesn't exist (e.g., in serverless environments like Vercel).
+    Parse a Range header into an inclusive byte range
+
+    Returns:
+        tuple | None: (start, end), or None to send the whole file (no Range, a malformed one,
+        or several ranges, which a player never needs)
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the file
     """
-    BASE_DIR = (
-        os.path.dirname(
-            os.path.dirname(
-                os.path.dirname(
-                    os.path.abspath(__file__)
-                )
-            )
-        )
-    )
-    UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    first, separator, last = header[len("bytes="):].strip().partition("-")
+    if not separator:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def is_not_modified(headers: Headers, etag: str, mtime: float) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class MediaFiles:
+    """
+    Serve the local storage buckets at /uploads/{bucket}/{object}, and files at the root of
+    the directory at /uploads/{name}
+
+    Supports Range requests (so players can seek without downloading the whole video),
+    ETag / Last-Modified revalidation and immutable caching. The body is sent zero-copy when
+    the ASGI server offers the pathsend or zerocopysend extension, or by nginx through
+    X-Accel-Redirect when LOCAL_STORAGE_ACCEL_REDIRECT is set. Otherwise it is read in
+    MEDIA_CHUNK_SIZE chunks in a thread, never blocking the event loop.
+    """
+
+    def __init__(self, directory: str, accel_redirect: str = ""):
+        self.directory = directory
+        self.accel_redirect = accel_redirect
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await WebSocketClose()(scope, receive, send)
+            return
+
+        if scope["method"] not in ("GET", "HEAD"):
+            await Response(status_code=405, headers={"Allow": "GET, HEAD"})(scope, receive, send)
+            return
 
-    # Only mount if directory exists (skip in serverless environments)
-    if os.path.exists(UPLOAD_DIR) and os.path.isdir(UPLOAD_DIR):
-        application.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
-    else:
-        # Create directory in local development if it doesn't exist
+        # Newer Starlette keeps the mount prefix in "path" and adds it to "root_path"
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+
+        bucket, _, filename = path.strip("/").partition("/")
+        if not filename:
+            # A file at the root of the directory (e.g. uploads/test.txt), as StaticFiles served them
+            bucket, filename = None, bucket
+        elif not BUCKET_NAME_PATTERN.match(bucket):
+            await Response(status_code=404)(scope, receive, send)
+            return
+        if not OBJECT_NAME_PATTERN.match(filename):
+            await Response(status_code=404)(scope, receive, send)
+            return
+
+        relative_path = f"{bucket}/{filename}" if bucket else filename
+        file_path = os.path.join(self.directory, relative_path)
+        try:
+            stat = await asyncio.to_thread(os.stat, file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            await Response(status_code=404)(scope, receive, send)
+            return
+        if not S_ISREG(stat.st_mode):
+            # A bucket directory requested as a root file
+            await Response(status_code=404)(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": MEDIA_CACHE_CONTROL if bucket and bucket not in REVALIDATED_BUCKETS else REVALIDATED_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+        }
+
+        if is_not_modified(request_headers, etag, stat.st_mtime):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        headers["Content-Type"] = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        download = parse_qs(scope.get("query_string", b"").decode()).get("download")
+        if download:
+            headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(download[0])}"
+
+        if self.accel_redirect:
+            # nginx handles Range itself and sends the file with sendfile
+            headers["X-Accel-Redirect"] = f"{self.accel_redirect}/{relative_path}"
+            await Response(status_code=200, headers=headers)(scope, receive, send)
+            return
+
+        # If-Range with a stale validator means the client's partial copy is outdated: send it all
+        if_range = request_headers.get("if-range")
+        try:
+            byte_range = None if if_range and if_range != etag else parse_range(request_headers.get("range"), size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            await Response(status_code=416, headers=headers)(scope, receive, send)
+            return
+
+        status_code = 200
+        start, length = 0, size
+        if byte_range:
+            status_code = 206
+            start, length = byte_range[0], byte_range[1] - byte_range[0] + 1
+            headers["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+        headers["Content-Length"] = str(length)
+
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+        })
+        if scope["method"] == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        await self.send_file(scope, send, file_path, start, length, whole=status_code == 200)
+
+    async def send_file(self, scope, send, file_path: str, start: int, length: int, whole: bool):
+        extensions = scope.get("extensions") or {}
+        if whole and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": file_path})
+            return
+
+        file = await asyncio.to_thread(open, file_path, "rb")
         try:
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-            application.mount("/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
-        except (OSError, PermissionError):
-            # Skip mounting in read-only environments (e.g., Vercel)
-            pass
+            if "http.response.zerocopysend" in extensions:
+                await send({"type": "http.response.zerocopysend", "file": file, "offset": start, "count": length})
+                return
+
+            await asyncio.to_thread(file.seek, start)
+            remaining = length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(file.read, min(MEDIA_CHUNK_SIZE, remaining))
+                if not chunk:
+                    # Truncated since stat, end the response rather than hang
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await asyncio.to_thread(file.close)
+
+
+def add_static_file_serving(application):
+    """
+    Mount the local storage directory at /uploads.
+    Skips mounting if the directory can't be created (e.g., in serverless environments like Vercel).
+    """
+    try:
+        os.makedirs(LOCAL_STORAGE_DIR, exist_ok=True)
+    except (OSError, PermissionError):
+        # Skip mounting in read-only environments (e.g., Vercel)
+        return
+
+    application.mount(
+        "/uploads",
+        MediaFiles(LOCAL_STORAGE_DIR, accel_redirect=LOCAL_STORAGE_ACCEL_REDIRECT),
+        name="uploads"
+    )
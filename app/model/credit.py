@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, DateTime, Enum, Boolean, Index, text, func
+from app.db.database import Base
+import enum
+
+
+class CreditEntryType(str, enum.Enum):
+    """Credit ledger entry types"""
+    GRANT = "grant"  # Credit added to the balance
+    SPEND = "spend"  # Credit used outright (not tied to a job)
+    RESERVE = "reserve"  # Credit held for a queued job
+    SETTLE = "settle"  # A job's reservation was consumed (completed job)
+    RELEASE = "release"  # A job's reservation was returned (failed or cancelled job)
+
+
+class CreditLedgerModel(Base):
+    """
+    Append-only credit ledger
+
+    A user's balance is users.credit plus the amounts of their uncompacted entries.
+    The credit compactor periodically folds entries into users.credit and marks them compacted,
+    so that the hot paths only insert rows instead of updating the user's row.
+    """
+    __tablename__ = "credit_ledger"
+    __table_args__ = (
+        # A job is reserved at most once and settled or released at most once
+        Index("ux_credit_ledger_job_reserve", "job_id", unique=True,
+              postgresql_where=text("entry_type = 'RESERVE'")),
+        Index("ux_credit_ledger_job_settlement", "job_id", unique=True,
+              postgresql_where=text("entry_type IN ('SETTLE', 'RELEASE')")),
+        Index("ix_credit_ledger_user_uncompacted", "user_id", postgresql_where=text("NOT compacted")),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    job_id = Column(Integer, nullable=True)  # Job the entry belongs to, no FK so deleting a job keeps its history
+    entry_type = Column(Enum(CreditEntryType), nullable=False)
+    amount = Column(Integer, nullable=False)  # Change of the available balance
+    compacted = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
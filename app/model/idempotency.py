@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, UniqueConstraint, func
+from app.db.database import Base
+
+
+class IdempotencyKeyModel(Base):
+    """Idempotency-Key of a side-effecting request and the response it produced"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "endpoint", "key", name="uq_idempotency_keys_user_endpoint_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    endpoint = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    request_hash = Column(String, nullable=False)  # sha256 of the request body
+    status_code = Column(Integer, nullable=True)  # NULL while the original request is in progress
+    response = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Boolean, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Boolean, Index, func, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.db.database import Base
 import enum
 
@@ -9,11 +10,29 @@ class JobStatus(str, enum.Enum):
     PROCESSING = "processing"  # Job is being processed
     COMPLETED = "completed"  # Job completed successfully
     FAILED = "failed"  # Job failed with error
+    CANCELLED = "cancelled"  # Job cancelled by its owner
+
+
+class HlsStatus(str, enum.Enum):
+    """Packaging status of a completed job's HLS ladder"""
+    PENDING = "pending"  # Result stored, waiting for the packager
+    PROCESSING = "processing"  # Being packaged
+    READY = "ready"  # Playlists and segments stored, hls_url set
+    FAILED = "failed"  # Gave up, result_url still plays
 
 
 class JobModel(Base):
     """Model for tracking video processing jobs"""
     __tablename__ = "jobs"
+    __table_args__ = (
+        # The scheduler ranks each user's pending jobs and counts their in-flight ones
+        Index("ix_jobs_status_user_created", "status", "user_id", "created_at"),
+        # The packager looks for jobs waiting for HLS, a small fraction of the table
+        Index(
+            "ix_jobs_hls_status_pending", "hls_status", "completed_at",
+            postgresql_where=text("hls_status IN ('PENDING', 'PROCESSING')")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -23,11 +42,19 @@ class JobModel(Base):
     subtitle = Column(Boolean, nullable=False, default=False)
     vertical = Column(Boolean, nullable=False, default=False)
     result_url = Column(String, nullable=True)
+    hls_status = Column(Enum(HlsStatus), nullable=True)  # NULL for jobs without a result to package
+    hls_url = Column(String, nullable=True)  # Master playlist in the outputs bucket
+    hls_files = Column(ARRAY(String), nullable=True)  # Object names of the playlists and segments
+    hls_attempts = Column(Integer, nullable=False, default=0)
+    hls_started_at = Column(DateTime(timezone=True), nullable=True)  # When the packager claimed the job
     error_message = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     runpod_job_id = Column(String, nullable=True)  # RunPod's internal job ID
+    runpod_endpoint = Column(String, nullable=True)  # RunPod endpoint URL the job was dispatched to
+    queue_ms = Column(Integer, nullable=True)  # Time spent in RunPod's queue (delayTime)
+    execution_ms = Column(Integer, nullable=True)  # GPU worker execution time (executionTime)
     name = Column(String, nullable=False)
     public = Column(Boolean, nullable=False, default=False)
     subtitle_style = Column(String, nullable=True)
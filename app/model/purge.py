@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, func
+from app.db.database import Base
+import enum
+
+
+class AccountPurgeStage(str, enum.Enum):
+    """Account purge stages, run in this order"""
+    CANCEL_JOBS = "cancel_jobs"  # Cancel the user's pending and processing jobs
+    VIDEOS = "videos"  # Delete the user's videos, the jobs on them and their files
+    JOBS = "jobs"  # Delete the user's remaining jobs and their result files
+    ACCOUNT = "account"  # Delete the user row (credit ledger and idempotency keys cascade)
+    DONE = "done"
+
+
+class AccountPurgeModel(Base):
+    """Progress of the background deletion of a withdrawn account"""
+    __tablename__ = "account_purges"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False, unique=True)  # No FK, the user row is deleted last
+    stage = Column(Enum(AccountPurgeStage), nullable=False, default=AccountPurgeStage.CANCEL_JOBS)
+    videos_purged = Column(Integer, nullable=False, default=0)
+    jobs_purged = Column(Integer, nullable=False, default=0)
+    files_removed = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease of the worker running the purge
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
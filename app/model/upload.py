@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Enum, func
+from app.db.database import Base
+import enum
+
+
+class UploadSessionStatus(str, enum.Enum):
+    UPLOADING = "uploading"
+    COMPLETED = "completed"  # Parts assembled into the object by /video/upload/done
+    ABORTED = "aborted"  # Cancelled by the client or expired, parts discarded
+
+
+class UploadSessionModel(Base):
+    """Resumable multipart upload of a source video"""
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True)  # uuid handed to the client as upload_id
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    video_uuid = Column(String, nullable=False)
+    bucket = Column(String, nullable=False, default="videos")
+    filename = Column(String, nullable=False)  # Object name once assembled
+    content_type = Column(String, nullable=False)
+    storage_upload_id = Column(String, nullable=False)  # Multipart upload ID of the storage backend
+    size = Column(BigInteger, nullable=False)
+    part_size = Column(Integer, nullable=False)
+    part_count = Column(Integer, nullable=False)
+    status = Column(Enum(UploadSessionStatus), nullable=False, default=UploadSessionStatus.UPLOADING)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class UploadPartModel(Base):
+    """Part of a multipart upload found in storage"""
+    __tablename__ = "upload_parts"
+
+    session_id = Column(String, ForeignKey("upload_sessions.id", ondelete="CASCADE"), primary_key=True)
+    part_number = Column(Integer, primary_key=True)  # 1-based
+    etag = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -8,4 +8,6 @@ class UserModel(Base):
     email = Column(String, unique=True, nullable=False, index=True)
     username = Column(String, nullable=False)
     password = Column(String, nullable=False)
-    credit = Column(Integer, nullable=False, server_default=text("0"))
\ No newline at end of file
+    credit = Column(Integer, nullable=False, server_default=text("0"))
+    # Scheduling weight for paid tiers: a user with priority n gets n + 1 dispatch turns per round
+    priority = Column(Integer, nullable=False, server_default=text("0"))
\ No newline at end of file
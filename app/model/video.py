@@ -1,8 +1,14 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Boolean, Float, String, ForeignKey, DateTime, Index, text
 from app.db.database import Base
 
 class VideoModel(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        # The purge sweep looks for deleted videos, a small fraction of the table
+        Index("ix_videos_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        # The remux sweep looks for MP4s whose moov atom is stored last
+        Index("ix_videos_faststart_pending", "id", postgresql_where=text("faststart = false")),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -10,4 +16,15 @@ class VideoModel(Base):
     file_path = Column(String, nullable=False)
     thumbnail_path = Column(String, nullable=True)
     file_path = Column(String, nullable=False)
-    name = Column(String, nullable=False)
\ No newline at end of file
+    name = Column(String, nullable=False)
+    # Probed when the upload is finalized, NULL for videos uploaded before that
+    size_bytes = Column(BigInteger, nullable=True)
+    content_type = Column(String, nullable=True)
+    duration = Column(Float, nullable=True)  # seconds
+    video_codec = Column(String, nullable=True)
+    audio_codec = Column(String, nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    # True once the moov atom is stored first, False until the remux sweep got to it, NULL if not an MP4
+    faststart = Column(Boolean, nullable=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Set on delete, the row and files are purged in the background
@@ -0,0 +1,259 @@
+import asyncio
+from datetime import timedelta
+from functools import partial
+from sqlalchemy import select, update, delete, or_, case
+from app.config.environments import ACCOUNT_PURGE_INTERVAL, ACCOUNT_PURGE_CONCURRENCY
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel, JobStatus
+from app.model.purge import AccountPurgeModel, AccountPurgeStage
+from app.model.session import SessionModel
+from app.model.user import UserModel
+from app.model.video import VideoModel
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+from app.utility.credit import release_credit
+from app.utility.runpod import cancel_runpod_job
+from app.utility.storage import remove_from_storage
+from app.utility.time import utc_now
+
+ACCOUNT_PURGE_BATCH_SIZE = 100  # videos or jobs deleted per transaction
+ACCOUNT_PURGE_STORAGE_CHUNK = 100  # files per Storage request
+ACCOUNT_PURGE_LEASE = 5 * 60  # seconds a worker owns a purge before another one may take it over
+
+
+async def gather_bounded(calls: list, limit: int = ACCOUNT_PURGE_CONCURRENCY) -> list:
+    """Run sync callables in threads, at most `limit` at a time"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call):
+        async with semaphore:
+            return await asyncio.to_thread(call)
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+async def remove_files(files: dict[str, list[str]]) -> int:
+    calls = [
+        partial(remove_from_storage, paths[start:start + ACCOUNT_PURGE_STORAGE_CHUNK], bucket)
+        for bucket, paths in files.items()
+        for start in range(0, len(paths), ACCOUNT_PURGE_STORAGE_CHUNK)
+    ]
+    if not all(await gather_bounded(calls)):
+        raise RuntimeError("Storage cleanup failed")
+    return sum(len(paths) for paths in files.values())
+
+
+async def claim_purge(purge_id: int) -> bool:
+    now = utc_now()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(AccountPurgeModel)
+            .where(
+                AccountPurgeModel.id == purge_id,
+                AccountPurgeModel.completed_at.is_(None),
+                or_(AccountPurgeModel.locked_until.is_(None), AccountPurgeModel.locked_until < now)
+            )
+            .values(
+                locked_until=now + timedelta(seconds=ACCOUNT_PURGE_LEASE),
+                attempts=AccountPurgeModel.attempts + 1
+            )
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+
+async def record_progress(db, purge_id: int, **values):
+    # Written in the same transaction as the deletes it accounts for, and extends the lease
+    now = utc_now()
+    await db.execute(
+        update(AccountPurgeModel)
+        .where(AccountPurgeModel.id == purge_id)
+        .values(**{"updated_at": now, "locked_until": now + timedelta(seconds=ACCOUNT_PURGE_LEASE), **values})
+    )
+
+
+def cancel_runpod_job_quietly(runpod_job_id: str, endpoint_url: str | None):
+    # Best effort: the job is already cancelled on our side and its webhook will be ignored
+    try:
+        cancel_runpod_job(runpod_job_id, endpoint_url)
+    except Exception as e:
+        print(f"[AccountPurger] Error cancelling RunPod job {runpod_job_id}: {e}")
+
+
+async def cancel_active_jobs(purge_id: int, user_id: int):
+    # The user's own jobs, and other users' jobs on the user's videos: those can't outlive the
+    # videos, so they are cancelled and their owners get their reservation back
+    user_videos = select(VideoModel.id).where(VideoModel.user_id == user_id)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(JobModel)
+            .where(
+                or_(JobModel.user_id == user_id, JobModel.video_id.in_(user_videos)),
+                JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+            )
+            .values(
+                status=JobStatus.CANCELLED,
+                error_message=case((JobModel.user_id == user_id, "Account withdrawn"), else_="Video deleted"),
+                completed_at=utc_now()
+            )
+            .returning(JobModel.id, JobModel.user_id, JobModel.runpod_job_id, JobModel.runpod_endpoint)
+        )
+        jobs = result.all()
+        for job in jobs:
+            await release_credit(db, job.user_id, job.id)
+        await record_progress(db, purge_id, stage=AccountPurgeStage.VIDEOS)
+        await db.commit()
+
+    cancelled = [job for job in jobs if job.runpod_job_id]
+    await gather_bounded([partial(cancel_runpod_job_quietly, job.runpod_job_id, job.runpod_endpoint) for job in cancelled])
+
+
+async def purge_videos_batch(purge_id: int, user_id: int) -> bool:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(VideoModel.id, VideoModel.file_path, VideoModel.thumbnail_path)
+            .where(VideoModel.user_id == user_id)
+            .order_by(VideoModel.id)
+            .limit(ACCOUNT_PURGE_BATCH_SIZE)
+        )
+        videos = result.all()
+        if not videos:
+            await record_progress(db, purge_id, stage=AccountPurgeStage.JOBS)
+            await db.commit()
+            return False
+
+        video_ids = [video.id for video in videos]
+        # Includes other users' jobs on these videos, cancelled by cancel_active_jobs
+        result = await db.execute(
+            select(JobModel.result_url, JobModel.hls_files)
+            .where(JobModel.video_id.in_(video_ids), JobModel.result_url.is_not(None))
+        )
+        output_files = [name for job in result.all() for name in [job.result_url, *(job.hls_files or [])]]
+
+    files_removed = await remove_files({
+        "outputs": output_files,
+        "videos": [video.file_path for video in videos],
+        "thumbnails": [video.thumbnail_path for video in videos if video.thumbnail_path],
+    })
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(JobModel).where(JobModel.video_id.in_(video_ids)))
+        jobs_purged = result.rowcount
+        await db.execute(delete(VideoModel).where(VideoModel.id.in_(video_ids)))
+        await record_progress(
+            db, purge_id,
+            videos_purged=AccountPurgeModel.videos_purged + len(video_ids),
+            jobs_purged=AccountPurgeModel.jobs_purged + jobs_purged,
+            files_removed=AccountPurgeModel.files_removed + files_removed
+        )
+        await db.commit()
+    return True
+
+
+async def purge_jobs_batch(purge_id: int, user_id: int) -> bool:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(JobModel.id, JobModel.result_url, JobModel.hls_files)
+            .where(JobModel.user_id == user_id)
+            .order_by(JobModel.id)
+            .limit(ACCOUNT_PURGE_BATCH_SIZE)
+        )
+        jobs = result.all()
+        if not jobs:
+            await record_progress(db, purge_id, stage=AccountPurgeStage.ACCOUNT)
+            await db.commit()
+            return False
+
+    files_removed = await remove_files({"outputs": [
+        name for job in jobs for name in ([job.result_url] if job.result_url else []) + (job.hls_files or [])
+    ]})
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(JobModel).where(JobModel.id.in_([job.id for job in jobs])))
+        await record_progress(
+            db, purge_id,
+            jobs_purged=AccountPurgeModel.jobs_purged + len(jobs),
+            files_removed=AccountPurgeModel.files_removed + files_removed
+        )
+        await db.commit()
+    return True
+
+
+async def delete_account(purge_id: int, user_id: int):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(SessionModel).where(SessionModel.user_id == user_id))
+        await db.execute(delete(UserModel).where(UserModel.id == user_id))
+        await record_progress(db, purge_id, stage=AccountPurgeStage.DONE, completed_at=utc_now(), locked_until=None)
+        await db.commit()
+
+
+async def purge_account(purge_id: int):
+    """
+    Run (or resume) an account purge
+
+    Every stage works in batches whose deletes are committed together with the purge's progress,
+    so after a crash the purge resumes where it stopped. Storage removals run before the rows
+    that reference the files are deleted, so no file is ever left without a row pointing to it.
+    """
+    if not await claim_purge(purge_id):
+        return
+
+    async with AsyncSessionLocal() as db:
+        purge = await db.get(AccountPurgeModel, purge_id)
+        user_id, stage = purge.user_id, purge.stage
+
+    try:
+        if stage == AccountPurgeStage.CANCEL_JOBS:
+            await cancel_active_jobs(purge_id, user_id)
+            stage = AccountPurgeStage.VIDEOS
+
+        if stage == AccountPurgeStage.VIDEOS:
+            while await purge_videos_batch(purge_id, user_id):
+                pass
+            stage = AccountPurgeStage.JOBS
+
+        if stage == AccountPurgeStage.JOBS:
+            while await purge_jobs_batch(purge_id, user_id):
+                pass
+            stage = AccountPurgeStage.ACCOUNT
+
+        if stage == AccountPurgeStage.ACCOUNT:
+            await delete_account(purge_id, user_id)
+            print(f"[AccountPurger] Purged account of user {user_id}")
+
+    except Exception as e:
+        print(f"[AccountPurger] Purge {purge_id} of user {user_id} failed: {e}")
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(AccountPurgeModel)
+                .where(AccountPurgeModel.id == purge_id)
+                .values(last_error=str(e)[:1000], locked_until=None, updated_at=utc_now())
+            )
+            await db.commit()
+
+
+async def account_purge_worker():
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(AccountPurgeModel.id)
+                    .where(
+                        AccountPurgeModel.completed_at.is_(None),
+                        or_(AccountPurgeModel.locked_until.is_(None), AccountPurgeModel.locked_until < utc_now())
+                    )
+                    .order_by(AccountPurgeModel.id)
+                )
+                purge_ids = result.scalars().all()
+
+            for purge_id in purge_ids:
+                await purge_account(purge_id)
+        except Exception as e:
+            print(f"[AccountPurger] Error: {e}")
+
+        await asyncio.sleep(ACCOUNT_PURGE_INTERVAL)
+
+
+def start_account_purge_task():
+    start_background_task(run_as_leader("account-purger", account_purge_worker), "account-purger")
+    print("[AccountPurger] Background purge task started.")
@@ -0,0 +1,24 @@
+import asyncio
+
+# Strong references to running background tasks (the event loop only keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
+
+def start_background_task(coroutine, name: str) -> asyncio.Task:
+    task = asyncio.create_task(coroutine, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def stop_background_tasks(timeout: float):
+    tasks = list(_background_tasks)
+    if not tasks:
+        return
+
+    for task in tasks:
+        task.cancel()
+
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        print(f"[Background] Task {task.get_name()} did not stop within {timeout}s")
@@ -0,0 +1,63 @@
+import asyncio
+from sqlalchemy import select, update, func
+from app.config.environments import CREDIT_COMPACTION_INTERVAL
+from app.db.database import AsyncSessionLocal
+from app.model.credit import CreditLedgerModel
+from app.model.user import UserModel
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+
+CREDIT_COMPACTION_BATCH_SIZE = 10000  # ledger entries folded per round
+
+
+async def compact_credit_ledger() -> int:
+    """
+    Fold uncompacted ledger entries into users.credit
+
+    Marking the entries and adding their sums to the users happens in a single statement,
+    so a concurrent balance read sees the entries either before or after compaction, never both.
+    """
+    batch = (
+        select(CreditLedgerModel.id)
+        .where(CreditLedgerModel.compacted.is_(False))
+        .order_by(CreditLedgerModel.id)
+        .limit(CREDIT_COMPACTION_BATCH_SIZE)
+    )
+    compacted = (
+        update(CreditLedgerModel)
+        .where(CreditLedgerModel.id.in_(batch))
+        .values(compacted=True)
+        .returning(CreditLedgerModel.user_id, CreditLedgerModel.amount)
+        .cte("compacted")
+    )
+    totals = (
+        select(compacted.c.user_id, func.sum(compacted.c.amount).label("amount"))
+        .group_by(compacted.c.user_id)
+        .subquery()
+    )
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(UserModel)
+            .where(UserModel.id == totals.c.user_id)
+            .values(credit=UserModel.credit + totals.c.amount)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def credit_compaction_worker():
+    while True:
+        try:
+            users = await compact_credit_ledger()
+            if users > 0:
+                print(f"[CreditCompactor] Compacted ledger entries of {users} users")
+        except Exception as e:
+            print(f"[CreditCompactor] Error: {e}")
+
+        await asyncio.sleep(CREDIT_COMPACTION_INTERVAL)
+
+
+def start_compaction_task():
+    start_background_task(run_as_leader("credit-compactor", credit_compaction_worker), "credit-compactor")
+    print("[CreditCompactor] Background compaction task started.")
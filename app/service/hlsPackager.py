@@ -0,0 +1,192 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlalchemy import select, update
+from app.config.environments import (
+    HLS_ENABLED, HLS_RENDITIONS, HLS_SEGMENT_DURATION, HLS_CONCURRENCY, HLS_INTERVAL
+)
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel, JobStatus, HlsStatus
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+from app.utility.hls import plan_renditions, package_hls, content_type_of
+from app.utility.storage import object_name, download_from_storage, upload_file_to_storage, get_file_url
+from app.utility.time import utc_now
+from app.utility.video import probe_video
+
+HLS_MAX_ATTEMPTS = 3
+
+# FFmpeg runs are driven from their own threads, so packaging never holds the default
+# executor's threads that asyncio.to_thread calls from request handlers need.
+_executor = ThreadPoolExecutor(max_workers=HLS_CONCURRENCY, thread_name_prefix="hls-packager")
+
+# Set by the webhook in this process so a completed job doesn't wait for the next polling round.
+# Jobs completed through another worker are picked up within HLS_INTERVAL.
+_wake_event = asyncio.Event()
+
+
+def notify_packager():
+    _wake_event.set()
+
+
+def package_result(job_id: int, result_url: str) -> tuple[str, list[str]]:
+    """
+    Download a job's result, encode its HLS ladder and store it in the outputs bucket
+
+    Every attempt uses new object names, so a retry never collides with the files of an
+    attempt that failed halfway; those are left to the storage garbage collector.
+
+    Returns:
+        tuple: URL of the master playlist, and the object names of every file
+
+    Raises:
+        ValueError: If the result isn't a video FFmpeg can package
+        Exception: If the download, FFmpeg or an upload failed
+    """
+    filename = object_name(result_url)
+    stem = f"hls-{job_id}-{uuid.uuid4().hex[:12]}"
+    temp_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(temp_dir, f"result{Path(filename).suffix}")
+        download_from_storage(filename, source, "outputs")
+
+        probe = probe_video(source)
+        renditions = plan_renditions(HLS_RENDITIONS, probe["width"], probe["height"])
+        output_dir = os.path.join(temp_dir, "hls")
+        os.makedirs(output_dir)
+        files = package_hls(
+            source, output_dir, stem, renditions, HLS_SEGMENT_DURATION,
+            has_audio=probe["audio_codec"] is not None
+        )
+
+        # Segments first and the master playlist last, so nothing is referenced before it exists
+        for name in files:
+            with open(os.path.join(output_dir, name), "rb") as file:
+                upload_file_to_storage(file.read(), name, content_type_of(name), "outputs")
+
+        return get_file_url(files[-1], "outputs"), files
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def requeue_interrupted_jobs() -> int:
+    """
+    Put back jobs a previous leader was packaging when it stopped
+
+    Only the leader packages, so a job still marked processing when a worker takes over
+    isn't being worked on anymore (or its result will be discarded by finish_job).
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(JobModel)
+            .where(JobModel.hls_status == HlsStatus.PROCESSING)
+            .values(hls_status=HlsStatus.PENDING)
+        )
+        await db.commit()
+    return result.rowcount
+
+
+async def claim_jobs(limit: int) -> list:
+    """Mark up to `limit` jobs waiting for HLS as processing, oldest results first"""
+    claimable = (
+        select(JobModel.id)
+        .where(JobModel.status == JobStatus.COMPLETED, JobModel.hls_status == HlsStatus.PENDING)
+        .order_by(JobModel.completed_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(JobModel)
+            .where(JobModel.id.in_(claimable))
+            .values(
+                hls_status=HlsStatus.PROCESSING,
+                hls_started_at=utc_now(),
+                hls_attempts=JobModel.hls_attempts + 1
+            )
+            .returning(JobModel.id, JobModel.result_url, JobModel.hls_attempts)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = result.all()
+        await db.commit()
+    return jobs
+
+
+async def finish_job(job_id: int, **values) -> bool:
+    # Conditional: the job may have been deleted, or requeued by a new leader
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id, JobModel.hls_status == HlsStatus.PROCESSING)
+            .values(**values)
+        )
+        await db.commit()
+    return result.rowcount > 0
+
+
+async def package_job(job):
+    loop = asyncio.get_running_loop()
+    try:
+        hls_url, files = await loop.run_in_executor(_executor, package_result, job.id, job.result_url)
+    except ValueError as e:
+        print(f"[HlsPackager] Job {job.id} can't be packaged: {e}")
+        await finish_job(job.id, hls_status=HlsStatus.FAILED)
+        return
+    except Exception as e:
+        retry = job.hls_attempts < HLS_MAX_ATTEMPTS
+        print(f"[HlsPackager] Error packaging job {job.id} (attempt {job.hls_attempts}): {e}")
+        await finish_job(job.id, hls_status=HlsStatus.PENDING if retry else HlsStatus.FAILED)
+        return
+
+    if await finish_job(job.id, hls_status=HlsStatus.READY, hls_url=hls_url, hls_files=files):
+        print(f"[HlsPackager] Job {job.id} packaged into {len(files)} files")
+    else:
+        print(f"[HlsPackager] Job {job.id} was deleted or requeued while packaging, its files are left to the storage GC")
+
+
+async def hls_packager_worker():
+    try:
+        requeued = await requeue_interrupted_jobs()
+        if requeued > 0:
+            print(f"[HlsPackager] Requeued {requeued} interrupted jobs")
+    except Exception as e:
+        print(f"[HlsPackager] Error: {e}")
+
+    running: set[asyncio.Task] = set()
+    try:
+        while True:
+            _wake_event.clear()
+            free = HLS_CONCURRENCY - len(running)
+            if free > 0:
+                try:
+                    for job in await claim_jobs(free):
+                        running.add(asyncio.create_task(package_job(job), name=f"hls-packager-{job.id}"))
+                except Exception as e:
+                    print(f"[HlsPackager] Error: {e}")
+
+            # Claims again when a webhook arrives, a packaging finishes or HLS_INTERVAL passed
+            wake = asyncio.create_task(_wake_event.wait())
+            try:
+                done, _ = await asyncio.wait(running | {wake}, timeout=HLS_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                wake.cancel()
+
+            for task in done & running:
+                running.discard(task)
+                if task.exception():
+                    print(f"[HlsPackager] Error: {task.exception()}")
+    finally:
+        # Jobs left processing are requeued by the next leader
+        for task in running:
+            task.cancel()
+
+
+def start_hls_packager_task():
+    if not HLS_ENABLED:
+        return
+    start_background_task(run_as_leader("hls-packager", hls_packager_worker), "hls-packager")
+    print("[HlsPackager] Background HLS packaging task started.")
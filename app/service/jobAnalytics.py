@@ -0,0 +1,93 @@
+import asyncio
+import time
+from datetime import timedelta
+from sqlalchemy import select, func
+from app.config.environments import ANALYTICS_CACHE_TTL
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel, JobStatus
+from app.utility.time import utc_now
+
+PERCENTILES = {"p50": 0.5, "p95": 0.95}
+
+_cache: dict[int, tuple[float, dict]] = {}
+_cache_lock = asyncio.Lock()
+
+
+def milliseconds_between(start, end):
+    return func.extract("epoch", end - start) * 1000
+
+
+def percentile_columns(name: str, value) -> list:
+    return [
+        func.percentile_cont(fraction).within_group(value).label(f"{name}_{percentile}")
+        for percentile, fraction in PERCENTILES.items()
+    ]
+
+
+async def compute_job_analytics(hours: int) -> dict:
+    stages = {
+        # Our own scheduler: job created -> dispatched to RunPod
+        "dispatch_wait_ms": milliseconds_between(JobModel.created_at, JobModel.started_at),
+        "queue_ms": JobModel.queue_ms,
+        "execution_ms": JobModel.execution_ms,
+        "end_to_end_ms": milliseconds_between(JobModel.created_at, JobModel.completed_at),
+    }
+
+    columns = [
+        JobModel.method,
+        JobModel.vertical,
+        JobModel.subtitle,
+        func.count().label("jobs"),
+        func.coalesce(func.sum(JobModel.execution_ms), 0).label("gpu_ms"),
+    ]
+    for name, value in stages.items():
+        columns.extend(percentile_columns(name, value))
+
+    since = utc_now() - timedelta(hours=hours)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(*columns)
+            .where(JobModel.status == JobStatus.COMPLETED, JobModel.completed_at >= since)
+            .group_by(JobModel.method, JobModel.vertical, JobModel.subtitle)
+            .order_by(JobModel.method, JobModel.vertical, JobModel.subtitle)
+        )
+        rows = result.mappings().all()
+
+    groups = []
+    for row in rows:
+        group = {
+            "method": row["method"],
+            "vertical": row["vertical"],
+            "subtitle": row["subtitle"],
+            "jobs": row["jobs"],
+            "gpu_seconds": round(row["gpu_ms"] / 1000, 1),
+        }
+        for name in stages:
+            group[name] = {
+                percentile: None if row[f"{name}_{percentile}"] is None else round(row[f"{name}_{percentile}"])
+                for percentile in PERCENTILES
+            }
+        groups.append(group)
+
+    return {"hours": hours, "since": since.isoformat(), "groups": groups}
+
+
+async def get_job_analytics(hours: int) -> dict:
+    """
+    Return completed-job latency percentiles per method/vertical/subtitle combination
+
+    Percentiles are computed by Postgres over the whole window, so results are cached for
+    ANALYTICS_CACHE_TTL seconds and concurrent requests share one computation.
+    """
+    cached = _cache.get(hours)
+    if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL:
+        return cached[1]
+
+    async with _cache_lock:
+        cached = _cache.get(hours)
+        if cached and time.monotonic() - cached[0] < ANALYTICS_CACHE_TTL:
+            return cached[1]
+
+        analytics = await compute_job_analytics(hours)
+        _cache[hours] = (time.monotonic(), analytics)
+        return analytics
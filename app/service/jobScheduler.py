@@ -0,0 +1,183 @@
+import asyncio
+from sqlalchemy import select, update, func, literal, Float
+from app.config.environments import (
+    BACKEND_URL, SCHEDULER_INTERVAL, SCHEDULER_USER_INFLIGHT_LIMIT, SCHEDULER_MAX_INFLIGHT
+)
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel, JobStatus
+from app.model.user import UserModel
+from app.model.video import VideoModel
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+from app.service.runpodDispatcher import choose_endpoint
+from app.utility.runpod import submit_runpod_job, cancel_runpod_job
+from app.utility.credit import release_credit
+from app.utility.time import utc_now
+
+SCHEDULER_BATCH_SIZE = 20  # jobs dispatched per round
+
+# Set by summarize in this process so a new job doesn't wait for the next polling round.
+# Jobs queued through another worker are picked up within SCHEDULER_INTERVAL.
+_wake_event = asyncio.Event()
+
+
+def notify_scheduler():
+    _wake_event.set()
+
+
+def build_job_input(job: JobModel, video: VideoModel) -> dict:
+    return {
+        "webhook_url": f"{BACKEND_URL}/runpod/webhook/{job.id}",
+        "task": "process_video",
+        "video_url": video.file_path,
+        "options": {
+            "method": job.method,
+            "subtitles": job.subtitle,
+            "subtitle_style": job.subtitle_style,
+            "vertical": job.vertical,
+            "crop_method": job.crop_method,
+        }
+    }
+
+
+async def select_fair_batch(db) -> list[tuple[JobModel, VideoModel]]:
+    """
+    Pick the next pending jobs in weighted round-robin order across users.
+
+    Each user's pending jobs are numbered in FIFO order (1, 2, 3, ...) and only as many as
+    the user has free in-flight slots are eligible. Ordering by that rank divided by the
+    user's weight (1 + priority) interleaves users: everyone's first job goes before anyone's
+    second, and a user with priority 1 gets two turns per round.
+    """
+    inflight_jobs = (
+        select(JobModel.user_id, func.count().label("inflight"))
+        .where(JobModel.status == JobStatus.PROCESSING)
+        .group_by(JobModel.user_id)
+        .subquery()
+    )
+
+    ranked_jobs = (
+        select(
+            JobModel.id,
+            JobModel.created_at,
+            func.row_number().over(
+                partition_by=JobModel.user_id,
+                order_by=(JobModel.created_at, JobModel.id)
+            ).label("user_rank"),
+            (func.coalesce(UserModel.priority, 0) + 1).label("weight"),
+            func.coalesce(inflight_jobs.c.inflight, 0).label("inflight")
+        )
+        .join(UserModel, UserModel.id == JobModel.user_id)
+        .outerjoin(inflight_jobs, inflight_jobs.c.user_id == JobModel.user_id)
+        .where(JobModel.status == JobStatus.PENDING, JobModel.runpod_job_id.is_(None))
+        .subquery()
+    )
+
+    limit = SCHEDULER_BATCH_SIZE
+    if SCHEDULER_MAX_INFLIGHT > 0:
+        result = await db.execute(
+            select(func.count()).where(JobModel.status == JobStatus.PROCESSING)
+        )
+        limit = min(limit, SCHEDULER_MAX_INFLIGHT - result.scalar())
+        if limit <= 0:
+            return []
+
+    ranked_ids = (
+        select(ranked_jobs.c.id)
+        .where(ranked_jobs.c.user_rank <= literal(SCHEDULER_USER_INFLIGHT_LIMIT) - ranked_jobs.c.inflight)
+        .order_by(
+            func.cast(ranked_jobs.c.user_rank, Float) / ranked_jobs.c.weight,
+            ranked_jobs.c.created_at
+        )
+        .limit(limit)
+    )
+    ids = [row[0] for row in (await db.execute(ranked_ids)).all()]
+    if not ids:
+        return []
+
+    result = await db.execute(
+        select(JobModel, VideoModel)
+        .join(VideoModel, VideoModel.id == JobModel.video_id)
+        .where(JobModel.id.in_(ids))
+    )
+    rows = {job.id: (job, video) for job, video in result.all()}
+    return [rows[job_id] for job_id in ids if job_id in rows]
+
+
+async def dispatch_job(job: JobModel, video: VideoModel):
+    endpoint = choose_endpoint(job.method)
+
+    try:
+        runpod_response = await asyncio.to_thread(submit_runpod_job, endpoint.url, build_job_input(job, video))
+        runpod_job_id = runpod_response.get("id")
+        error = None if runpod_job_id else f"RunPod rejected the job: {runpod_response}"
+    except Exception as e:
+        runpod_job_id = None
+        error = f"Failed to submit job to RunPod: {str(e)}"
+
+    async with AsyncSessionLocal() as db:
+        if runpod_job_id:
+            # Conditional: the job may have been cancelled while it was being submitted
+            result = await db.execute(
+                update(JobModel)
+                .where(JobModel.id == job.id, JobModel.status == JobStatus.PENDING)
+                .values(
+                    status=JobStatus.PROCESSING,
+                    runpod_job_id=runpod_job_id,
+                    runpod_endpoint=endpoint.url,
+                    started_at=utc_now(),
+                    name=f"Job {runpod_job_id[:4]}"
+                )
+            )
+            await db.commit()
+
+            if result.rowcount == 0:
+                await asyncio.to_thread(cancel_runpod_job, runpod_job_id, endpoint.url)
+            return
+
+        result = await db.execute(
+            update(JobModel)
+            .where(JobModel.id == job.id, JobModel.status == JobStatus.PENDING)
+            .values(status=JobStatus.FAILED, error_message=error, completed_at=utc_now())
+        )
+        if result.rowcount:
+            await release_credit(db, job.user_id, job.id)
+        await db.commit()
+        print(f"[JobScheduler] Job {job.id} failed: {error}")
+
+
+async def dispatch_pending_jobs() -> int:
+    async with AsyncSessionLocal() as db:
+        batch = await select_fair_batch(db)
+
+    results = await asyncio.gather(
+        *(dispatch_job(job, video) for job, video in batch),
+        return_exceptions=True
+    )
+    for (job, _), result in zip(batch, results):
+        if isinstance(result, Exception):
+            print(f"[JobScheduler] Error dispatching job {job.id}: {result}")
+
+    return len(batch)
+
+
+async def job_scheduler_worker():
+    while True:
+        try:
+            dispatched = await dispatch_pending_jobs()
+        except Exception as e:
+            dispatched = 0
+            print(f"[JobScheduler] Error: {e}")
+
+        # A full batch means more jobs may be eligible right away
+        if dispatched < SCHEDULER_BATCH_SIZE:
+            _wake_event.clear()
+            try:
+                await asyncio.wait_for(_wake_event.wait(), timeout=SCHEDULER_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+def start_scheduler_task():
+    start_background_task(run_as_leader("job-scheduler", job_scheduler_worker), "job-scheduler")
+    print("[JobScheduler] Background scheduler task started.")
@@ -0,0 +1,61 @@
+import asyncio
+import contextlib
+import hashlib
+from sqlalchemy import text
+from app.db.database import engine
+
+LEADER_RETRY_INTERVAL = 15  # seconds between attempts to become leader
+LEADER_HEARTBEAT_INTERVAL = 30  # seconds between liveness checks of the lock connection
+
+
+def advisory_lock_key(name: str) -> int:
+    # hash() is randomized per process, so derive a stable signed 64-bit key instead
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big", signed=True)
+
+
+async def hold_leadership(conn, worker_task: asyncio.Task):
+    while not worker_task.done():
+        await asyncio.wait({worker_task}, timeout=LEADER_HEARTBEAT_INTERVAL)
+        if not worker_task.done():
+            # Fails if the connection (and with it the lock) was lost
+            await conn.execute(text("SELECT 1"))
+
+
+async def run_as_leader(name: str, worker):
+    """
+    Run `worker()` in exactly one process across all workers and instances.
+
+    Leadership is a transaction-level Postgres advisory lock held on a dedicated connection
+    for as long as the worker runs. A transaction-level lock is used because it stays valid
+    behind a transaction-mode connection pooler (pgbouncer / Supabase pooler), where
+    session-level locks would be released or leaked between statements.
+    If the leader dies, its transaction ends, the lock is freed and another worker takes over.
+    """
+    key = advisory_lock_key(name)
+
+    while True:
+        try:
+            async with engine.connect() as conn:
+                async with conn.begin():
+                    result = await conn.execute(
+                        text("SELECT pg_try_advisory_xact_lock(:key)"),
+                        {"key": key}
+                    )
+
+                    if result.scalar():
+                        print(f"[Leader] Acquired leadership of {name}")
+                        worker_task = asyncio.create_task(worker(), name=f"{name}-worker")
+                        try:
+                            await hold_leadership(conn, worker_task)
+                        finally:
+                            worker_task.cancel()
+                            with contextlib.suppress(asyncio.CancelledError):
+                                await worker_task
+                            print(f"[Leader] Released leadership of {name}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Leader] {name} error: {e}")
+
+        await asyncio.sleep(LEADER_RETRY_INTERVAL)
@@ -0,0 +1,100 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from app.config.environments import LOOP_LAG_INTERVAL, LOOP_LAG_THRESHOLD
+from app.utility.metrics import EVENT_LOOP_LAG
+from app.service.background import start_background_task
+
+LOOP_LAG_SAMPLE_SIZE = 1200  # ~10 minutes of samples with the default interval
+BLOCKING_STACK_SIZE = 20
+
+_lag_samples = deque(maxlen=LOOP_LAG_SAMPLE_SIZE)
+_blocking_stacks = deque(maxlen=BLOCKING_STACK_SIZE)
+_last_tick = time.monotonic()
+_stop_event = threading.Event()
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def loop_lag_worker():
+    global _last_tick
+    loop = asyncio.get_running_loop()
+
+    while True:
+        scheduled = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag = max(0.0, loop.time() - scheduled - LOOP_LAG_INTERVAL)
+
+        _last_tick = time.monotonic()
+        _lag_samples.append(lag)
+        EVENT_LOOP_LAG.observe(lag)
+
+
+def blocking_call_watchdog(loop_thread_id: int):
+    """
+    Runs in a separate thread. When the loop has not ticked for longer than the threshold,
+    the loop thread is stuck in a blocking call, so its current stack is the culprit.
+    """
+    reported_tick = None
+
+    while not _stop_event.wait(LOOP_LAG_THRESHOLD / 2):
+        tick = _last_tick
+        blocked_for = time.monotonic() - tick - LOOP_LAG_INTERVAL
+
+        if blocked_for < LOOP_LAG_THRESHOLD or reported_tick == tick:
+            continue
+
+        frame = sys._current_frames().get(loop_thread_id)
+        if frame is None:
+            continue
+
+        stack = "".join(traceback.format_stack(frame))
+        reported_tick = tick
+        _blocking_stacks.append({
+            "detected_at": time.time(),
+            "blocked_ms": round(blocked_for * 1000, 1),
+            "stack": stack
+        })
+        print(f"[LoopMonitor] Event loop blocked for {blocked_for * 1000:.0f}ms:\n{stack}")
+
+
+def get_loop_lag_stats() -> dict:
+    samples = list(_lag_samples)
+
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(max(samples, default=0.0) * 1000, 2),
+        "threshold_ms": LOOP_LAG_THRESHOLD * 1000,
+        "blocking_calls": list(_blocking_stacks)
+    }
+
+
+def start_loop_monitor():
+    global _last_tick
+    _last_tick = time.monotonic()
+    _stop_event.clear()
+
+    start_background_task(loop_lag_worker(), "loop-monitor")
+    threading.Thread(
+        target=blocking_call_watchdog,
+        args=(threading.get_ident(),),
+        name="loop-monitor-watchdog",
+        daemon=True
+    ).start()
+    print("[LoopMonitor] Event loop lag monitor started.")
+
+
+def stop_loop_monitor():
+    _stop_event.set()
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from sqlalchemy import text
+from app.db.database import engine
+from app.config.environments import READINESS_TTL
+from app.service.background import start_background_task
+from app.service.runpodDispatcher import endpoints
+from app.utility.runpod import get_runpod_health
+from app.utility.storage import get_storage_backend
+from app.utility.video import check_ffmpeg_installed
+
+READINESS_CHECK_TIMEOUT = 5  # seconds per dependency check
+
+# name -> {"ok", "latency_ms", "error", "checked_at"}, refreshed in the background
+_check_results: dict[str, dict] = {}
+
+
+async def check_database():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+def check_storage():
+    get_storage_backend().check(timeout=READINESS_CHECK_TIMEOUT)
+
+
+def check_ffmpeg():
+    if not check_ffmpeg_installed():
+        raise RuntimeError("FFmpeg is not installed")
+
+
+def check_runpod():
+    # Jobs can be dispatched as long as one endpoint is reachable
+    errors = []
+    for endpoint in endpoints:
+        try:
+            get_runpod_health(endpoint.url, timeout=READINESS_CHECK_TIMEOUT)
+            return
+        except Exception as e:
+            errors.append(f"{endpoint.url}: {e}")
+    raise RuntimeError("; ".join(errors))
+
+
+READINESS_CHECKS = {
+    "database": check_database,
+    "storage": lambda: asyncio.to_thread(check_storage),
+    "ffmpeg": lambda: asyncio.to_thread(check_ffmpeg),
+    "runpod": lambda: asyncio.to_thread(check_runpod),
+}
+
+
+async def run_check(name: str, check):
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(check(), timeout=READINESS_CHECK_TIMEOUT)
+        error = None
+    except asyncio.TimeoutError:
+        error = f"Timed out after {READINESS_CHECK_TIMEOUT}s"
+    except Exception as e:
+        error = str(e)
+
+    _check_results[name] = {
+        "ok": error is None,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        "error": error,
+        "checked_at": time.time()
+    }
+
+
+async def refresh_readiness():
+    await asyncio.gather(*(run_check(name, check) for name, check in READINESS_CHECKS.items()))
+
+
+async def readiness_worker():
+    while True:
+        await refresh_readiness()
+        await asyncio.sleep(READINESS_TTL)
+
+
+def get_readiness() -> tuple[bool, dict]:
+    """
+    Return the cached readiness state without touching any dependency.
+    Results older than a few refresh intervals count as failed (the refresher is stuck).
+    """
+    now = time.time()
+    checks = {}
+    for name in READINESS_CHECKS:
+        result = _check_results.get(name)
+        if result is None:
+            checks[name] = {"ok": False, "error": "Not checked yet"}
+        elif now - result["checked_at"] > READINESS_TTL * 3:
+            checks[name] = {**result, "ok": False, "error": "Stale result"}
+        else:
+            checks[name] = result
+
+    return all(check["ok"] for check in checks.values()), checks
+
+
+def start_readiness_task():
+    # Not leader-elected: every worker reports its own view of the dependencies
+    start_background_task(readiness_worker(), "readiness-checker")
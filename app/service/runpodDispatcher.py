@@ -0,0 +1,98 @@
+import asyncio
+import itertools
+import time
+from app.config.environments import RUNPOD_ENDPOINTS, RUNPOD_SAMPLE_INTERVAL
+from app.service.background import start_background_task
+from app.utility.runpod import get_runpod_health
+
+
+class RunpodEndpoint:
+    def __init__(self, method: str | None, url: str):
+        self.method = method  # None: serves every method
+        self.url = url
+        self.healthy = True
+        self.in_queue = 0
+        self.in_progress = 0
+        self.workers = 0
+        self.dispatched_since_sample = 0
+        self.sampled_at = None
+        self.error = None
+
+    def load(self) -> float:
+        # Jobs waiting per worker. Jobs dispatched by this process since the last sample are
+        # counted too, so a burst doesn't all go to the endpoint that looked emptiest.
+        return (self.in_queue + self.dispatched_since_sample) / max(1, self.workers)
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_queue": self.in_queue,
+            "in_progress": self.in_progress,
+            "workers": self.workers,
+            "sampled_at": self.sampled_at,
+            "error": self.error
+        }
+
+
+endpoints = [RunpodEndpoint(method, url) for method, url in RUNPOD_ENDPOINTS]
+_tie_breaker = itertools.count()
+
+
+def sample_endpoint(endpoint: RunpodEndpoint):
+    try:
+        health = get_runpod_health(endpoint.url)
+        jobs = health.get("jobs", {})
+        workers = health.get("workers", {})
+
+        endpoint.in_queue = jobs.get("inQueue", 0)
+        endpoint.in_progress = jobs.get("inProgress", 0)
+        endpoint.workers = workers.get("idle", 0) + workers.get("running", 0)
+        endpoint.healthy = True
+        endpoint.error = None
+    except Exception as e:
+        endpoint.healthy = False
+        endpoint.error = str(e)
+
+    endpoint.dispatched_since_sample = 0
+    endpoint.sampled_at = time.time()
+
+
+async def sample_endpoints():
+    await asyncio.gather(*(asyncio.to_thread(sample_endpoint, endpoint) for endpoint in endpoints))
+
+
+async def dispatcher_sampler_worker():
+    while True:
+        await sample_endpoints()
+        await asyncio.sleep(RUNPOD_SAMPLE_INTERVAL)
+
+
+def choose_endpoint(method: str | None = None) -> RunpodEndpoint:
+    """
+    Pick the endpoint with the fewest queued jobs per worker among the healthy endpoints
+    dedicated to `method`, falling back to the endpoints serving every method.
+    """
+    candidates = [endpoint for endpoint in endpoints if method is not None and endpoint.method == method]
+    if not candidates:
+        candidates = [endpoint for endpoint in endpoints if endpoint.method is None] or endpoints
+
+    healthy = [endpoint for endpoint in candidates if endpoint.healthy] or candidates
+    turn = next(_tie_breaker)
+    chosen = min(
+        healthy,
+        key=lambda endpoint: (endpoint.load(), (healthy.index(endpoint) - turn) % len(healthy))
+    )
+    chosen.dispatched_since_sample += 1
+    return chosen
+
+
+def get_endpoint_states() -> list[dict]:
+    return [endpoint.to_dict() for endpoint in endpoints]
+
+
+def start_dispatcher_task():
+    # A single endpoint needs no sampling, every job goes there anyway
+    if len(endpoints) > 1:
+        start_background_task(dispatcher_sampler_worker(), "runpod-dispatcher")
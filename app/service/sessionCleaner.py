@@ -3,8 +3,11 @@ from datetime import datetime, UTC
 from sqlalchemy import delete
 from app.db.database import AsyncSessionLocal
 from app.model.session import SessionModel
+from app.model.idempotency import IdempotencyKeyModel
 from app.config.environments import SESSION_EXPIRE_TIME
 from app.utility.time import utc_now
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
 
 SESSION_CLEANER_INTERVAL = SESSION_EXPIRE_TIME
 
@@ -22,12 +25,25 @@ async def cleanup_expired_sessions():
         return result.rowcount
 
 
+async def cleanup_expired_idempotency_keys():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(IdempotencyKeyModel).where(IdempotencyKeyModel.expires_at < utc_now())
+        )
+        await db.commit()
+        return result.rowcount
+
+
 async def session_cleanup_worker():
     while True:
         try:
             deleted = await cleanup_expired_sessions()
             if deleted > 0:
                 print(f"[SessionCleaner] Deleted {deleted} expired sessions")
+
+            deleted = await cleanup_expired_idempotency_keys()
+            if deleted > 0:
+                print(f"[SessionCleaner] Deleted {deleted} expired idempotency keys")
         except Exception as e:
             print(f"[SessionCleaner] Error: {e}")
 
@@ -35,5 +51,5 @@ async def session_cleanup_worker():
 
 
 def start_cleanup_task():
-    asyncio.create_task(session_cleanup_worker())
+    start_background_task(run_as_leader("session-cleaner", session_cleanup_worker), "session-cleaner")
     print("[SessionCleaner] Background cleanup task started.")
\ No newline at end of file
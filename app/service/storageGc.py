@@ -0,0 +1,187 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, func
+from app.config.environments import STORAGE_GC_INTERVAL, STORAGE_GC_GRACE, STORAGE_GC_DRY_RUN
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel
+from app.model.upload import UploadSessionModel, UploadSessionStatus
+from app.model.video import VideoModel
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+from app.utility.metrics import STORAGE_GC_DELETED_OBJECTS, STORAGE_GC_RECLAIMED_BYTES
+from app.utility.storage import list_storage, remove_from_storage, abort_multipart_upload
+from app.utility.time import utc_now
+
+STORAGE_GC_PAGE_SIZE = 1000  # objects listed per Storage request
+STORAGE_GC_BATCH_SIZE = 100  # objects deleted per Storage request
+
+# Columns holding the URLs of each bucket's objects
+BUCKET_REFERENCES = {
+    "videos": VideoModel.file_path,
+    "thumbnails": VideoModel.thumbnail_path,
+    "outputs": JobModel.result_url,
+}
+
+# Array columns holding object names of a bucket (the HLS playlists and segments of a result)
+BUCKET_NAME_LISTS = {
+    "outputs": JobModel.hls_files,
+}
+
+
+def object_name_sql(column):
+    # Last path segment of the URL, without query string: app.utility.storage.object_name in SQL
+    return func.regexp_replace(column, r"^.*/|\?.*$", "", "g")
+
+
+async def load_referenced_names(bucket: str) -> set[str]:
+    column = BUCKET_REFERENCES[bucket]
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(select(object_name_sql(column)).where(column.is_not(None)))
+        names = {name async for name in result}
+
+        if bucket in BUCKET_NAME_LISTS:
+            names_column = BUCKET_NAME_LISTS[bucket]
+            result = await db.stream_scalars(select(func.unnest(names_column)).where(names_column.is_not(None)))
+            names.update([name async for name in result])
+    return names
+
+
+async def filter_unreferenced(bucket: str, names: list[str]) -> list[str]:
+    # Re-checked right before deleting, for rows created since the referenced set was loaded
+    column = BUCKET_REFERENCES[bucket]
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(object_name_sql(column)).where(object_name_sql(column).in_(names)))
+        referenced = set(result.scalars().all())
+
+        if bucket in BUCKET_NAME_LISTS:
+            names_column = BUCKET_NAME_LISTS[bucket]
+            result = await db.execute(select(func.unnest(names_column)).where(names_column.overlap(names)))
+            referenced.update(result.scalars().all())
+    return [name for name in names if name not in referenced]
+
+
+async def find_orphans(bucket: str, cutoff: datetime) -> tuple[int, dict[str, int]]:
+    """
+    List a bucket page by page and return the objects no row references
+
+    Returns:
+        tuple: Number of objects scanned, and the orphans older than `cutoff` with their sizes
+    """
+    referenced = await load_referenced_names(bucket)
+
+    scanned = 0
+    orphans = {}
+    offset = 0
+    while True:
+        page = await asyncio.to_thread(list_storage, bucket, STORAGE_GC_PAGE_SIZE, offset)
+        # Folders have no id
+        objects = [item for item in page if item.get("id")]
+        scanned += len(objects)
+
+        for item in objects:
+            if item["name"] in referenced or not item.get("created_at"):
+                continue
+            if datetime.fromisoformat(item["created_at"]) < cutoff:
+                orphans[item["name"]] = (item.get("metadata") or {}).get("size", 0)
+
+        if len(page) < STORAGE_GC_PAGE_SIZE:
+            return scanned, orphans
+        offset += STORAGE_GC_PAGE_SIZE
+
+
+async def collect_bucket(bucket: str, cutoff: datetime) -> dict:
+    # Orphans are deleted only after the whole bucket was listed, deleting while paging
+    # by offset would shift the pages and skip objects.
+    scanned, orphans = await find_orphans(bucket, cutoff)
+
+    deleted = 0
+    reclaimed_bytes = 0
+    names = list(orphans)
+    for start in range(0, len(names), STORAGE_GC_BATCH_SIZE):
+        batch = await filter_unreferenced(bucket, names[start:start + STORAGE_GC_BATCH_SIZE])
+        if not batch or STORAGE_GC_DRY_RUN:
+            deleted += len(batch)
+            reclaimed_bytes += sum(orphans[name] for name in batch)
+            continue
+
+        if await asyncio.to_thread(remove_from_storage, batch, bucket):
+            batch_bytes = sum(orphans[name] for name in batch)
+            deleted += len(batch)
+            reclaimed_bytes += batch_bytes
+            STORAGE_GC_DELETED_OBJECTS.labels(bucket=bucket).inc(len(batch))
+            STORAGE_GC_RECLAIMED_BYTES.labels(bucket=bucket).inc(batch_bytes)
+
+    return {"scanned": scanned, "orphans": len(orphans), "deleted": deleted, "reclaimed_bytes": reclaimed_bytes}
+
+
+async def collect_storage_garbage() -> dict:
+    """
+    Delete storage objects that no video or job references anymore
+
+    Objects younger than STORAGE_GC_GRACE are kept: a presigned upload isn't referenced
+    until the client calls /video/upload/done.
+    """
+    cutoff = utc_now() - timedelta(seconds=STORAGE_GC_GRACE)
+    return {bucket: await collect_bucket(bucket, cutoff) for bucket in BUCKET_REFERENCES}
+
+
+async def abort_expired_uploads() -> int:
+    """
+    Abort multipart uploads that weren't finalized before they expired, and delete finished ones
+
+    Parts of an unfinished multipart upload aren't objects of the bucket, so listing the bucket
+    doesn't find them.
+    """
+    now = utc_now()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(UploadSessionModel)
+            .where(UploadSessionModel.status == UploadSessionStatus.UPLOADING, UploadSessionModel.expires_at < now)
+        )
+        expired = result.scalars().all()
+
+        aborted = 0
+        for upload in expired:
+            try:
+                await asyncio.to_thread(abort_multipart_upload, upload.filename, upload.storage_upload_id, upload.bucket)
+            except Exception as e:
+                # Already gone from storage, otherwise retried on the next run
+                if "NoSuchUpload" not in str(e):
+                    print(f"[StorageGC] Error aborting upload {upload.id}: {e}")
+                    continue
+            upload.status = UploadSessionStatus.ABORTED
+            upload.completed_at = now
+            aborted += 1
+
+        await db.execute(
+            delete(UploadSessionModel)
+            .where(UploadSessionModel.status != UploadSessionStatus.UPLOADING, UploadSessionModel.expires_at < now)
+        )
+        await db.commit()
+    return aborted
+
+
+async def storage_gc_worker():
+    while True:
+        try:
+            aborted = await abort_expired_uploads()
+            if aborted > 0:
+                print(f"[StorageGC] Aborted {aborted} expired multipart uploads")
+
+            report = await collect_storage_garbage()
+            action = "Would delete" if STORAGE_GC_DRY_RUN else "Deleted"
+            for bucket, stats in report.items():
+                if stats["orphans"] > 0:
+                    print(f"[StorageGC] {bucket}: scanned {stats['scanned']}, {action.lower()} "
+                          f"{stats['deleted']}/{stats['orphans']} orphans, {stats['reclaimed_bytes']} bytes")
+            reclaimed = sum(stats["reclaimed_bytes"] for stats in report.values())
+            print(f"[StorageGC] {action} {reclaimed} bytes of orphaned objects")
+        except Exception as e:
+            print(f"[StorageGC] Error: {e}")
+
+        await asyncio.sleep(STORAGE_GC_INTERVAL)
+
+
+def start_storage_gc_task():
+    start_background_task(run_as_leader("storage-gc", storage_gc_worker), "storage-gc")
+    print("[StorageGC] Background garbage collection task started.")
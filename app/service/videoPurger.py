@@ -0,0 +1,107 @@
+import asyncio
+from datetime import timedelta
+from sqlalchemy import select, delete, exists
+from app.config.environments import VIDEO_PURGE_INTERVAL
+from app.db.database import AsyncSessionLocal
+from app.model.job import JobModel, JobStatus
+from app.model.video import VideoModel
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+from app.utility.storage import remove_from_storage
+from app.utility.time import utc_now
+
+VIDEO_PURGE_GRACE = 5 * 60  # seconds before the sweep retries a deletion the request's own purge didn't finish
+VIDEO_PURGE_BATCH_SIZE = 50
+
+# Jobs still queued or running hold a credit reservation that their webhook settles or releases,
+# so their video is purged once they have finished
+has_running_jobs = exists().where(
+    JobModel.video_id == VideoModel.id,
+    JobModel.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+)
+
+
+async def purge_videos(video_ids: list[int]) -> bool:
+    """
+    Delete soft-deleted videos' files and rows
+
+    The files of each bucket are removed with one Storage request for all the videos, the
+    buckets concurrently. The rows are only deleted once every bucket succeeded, otherwise the
+    videos stay marked deleted and the sweep retries them later. Videos with running jobs are
+    skipped until the jobs finish. Safe to run more than once.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(VideoModel.id, VideoModel.file_path, VideoModel.thumbnail_path)
+            .where(VideoModel.id.in_(video_ids), VideoModel.deleted_at.is_not(None), ~has_running_jobs)
+        )
+        videos = result.all()
+        if not videos:
+            return True
+        video_ids = [video.id for video in videos]
+
+        result = await db.execute(
+            select(JobModel.result_url, JobModel.hls_files)
+            .where(JobModel.video_id.in_(video_ids), JobModel.result_url.is_not(None))
+        )
+        output_files = [name for job in result.all() for name in [job.result_url, *(job.hls_files or [])]]
+
+    files = {
+        "outputs": output_files,
+        "videos": [video.file_path for video in videos],
+        "thumbnails": [video.thumbnail_path for video in videos if video.thumbnail_path],
+    }
+    removed = await asyncio.gather(*(
+        asyncio.to_thread(remove_from_storage, paths, bucket)
+        for bucket, paths in files.items() if paths
+    ))
+    if not all(removed):
+        print(f"[VideoPurger] Storage cleanup of videos {video_ids} failed, will retry")
+        return False
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(JobModel).where(JobModel.video_id.in_(video_ids)))
+        await db.execute(delete(VideoModel).where(VideoModel.id.in_(video_ids), VideoModel.deleted_at.is_not(None)))
+        await db.commit()
+
+    return True
+
+
+async def purge_video(video_id: int) -> bool:
+    return await purge_videos([video_id])
+
+
+async def purge_deleted_videos() -> int:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(VideoModel.id)
+            .where(
+                VideoModel.deleted_at.is_not(None),
+                VideoModel.deleted_at < utc_now() - timedelta(seconds=VIDEO_PURGE_GRACE),
+                ~has_running_jobs
+            )
+            .order_by(VideoModel.deleted_at)
+            .limit(VIDEO_PURGE_BATCH_SIZE)
+        )
+        video_ids = result.scalars().all()
+
+    if video_ids and await purge_videos(video_ids):
+        return len(video_ids)
+    return 0
+
+
+async def video_purge_worker():
+    while True:
+        try:
+            purged = await purge_deleted_videos()
+            if purged > 0:
+                print(f"[VideoPurger] Purged {purged} deleted videos")
+        except Exception as e:
+            print(f"[VideoPurger] Error: {e}")
+
+        await asyncio.sleep(VIDEO_PURGE_INTERVAL)
+
+
+def start_purge_task():
+    start_background_task(run_as_leader("video-purger", video_purge_worker), "video-purger")
+    print("[VideoPurger] Background purge task started.")
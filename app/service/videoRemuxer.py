@@ -0,0 +1,109 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from sqlalchemy import select, update
+from app.config.environments import VIDEO_REMUX_INTERVAL
+from app.db.database import AsyncSessionLocal
+from app.model.video import VideoModel
+from app.service.background import start_background_task
+from app.service.leader import run_as_leader
+from app.utility.storage import object_name, download_from_storage, replace_in_storage
+from app.utility.video import is_faststart, remux_faststart
+
+VIDEO_REMUX_BATCH_SIZE = 10  # videos remuxed per sweep, one at a time
+
+
+def remux_stored_video(filename: str, content_type: str) -> tuple[bool | None, int]:
+    """
+    Download a video, remux it with the moov atom first and overwrite the object
+
+    The object keeps its URL. A video deleted meanwhile is written back as an orphan, which
+    the storage garbage collector removes.
+
+    Returns:
+        tuple: Whether the stored video is now fast-start (None if it isn't an MP4), and its size
+
+    Raises:
+        ValueError: If FFmpeg couldn't remux the file
+        Exception: If the download or upload failed
+    """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        suffix = Path(filename).suffix
+        original_path = os.path.join(temp_dir, f"original{suffix}")
+        download_from_storage(filename, original_path, "videos")
+
+        # Already remuxed by an earlier run whose row update didn't go through
+        faststart = is_faststart(original_path)
+        if faststart is not False:
+            return faststart, os.path.getsize(original_path)
+
+        remuxed_path = os.path.join(temp_dir, f"faststart{suffix}")
+        remux_faststart(original_path, remuxed_path)
+        replace_in_storage(remuxed_path, filename, content_type, "videos")
+        return True, os.path.getsize(remuxed_path)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def remux_pending_videos() -> int:
+    """
+    Remux uploaded MP4s stored with their moov atom last
+
+    Direct uploads go from the client to Storage, so unlike YouTube downloads they can't be
+    remuxed before they are stored. /video/upload/done marks them faststart = false instead.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(VideoModel.id, VideoModel.file_path, VideoModel.content_type)
+            .where(VideoModel.faststart.is_(False), VideoModel.deleted_at.is_(None))
+            .order_by(VideoModel.id)
+            .limit(VIDEO_REMUX_BATCH_SIZE)
+        )
+        videos = result.all()
+
+    remuxed = 0
+    for video in videos:
+        try:
+            faststart, size = await asyncio.to_thread(
+                remux_stored_video,
+                object_name(video.file_path),
+                video.content_type or "video/mp4"
+            )
+        except ValueError as e:
+            # Retrying won't help, the video stays playable as it is
+            print(f"[VideoRemuxer] Video {video.id} can't be remuxed: {e}")
+            faststart, size = None, None
+        except Exception as e:
+            print(f"[VideoRemuxer] Error remuxing video {video.id}, will retry: {e}")
+            continue
+
+        values = {"faststart": faststart}
+        if size:
+            values["size_bytes"] = size
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(VideoModel).where(VideoModel.id == video.id).values(**values))
+            await db.commit()
+        if faststart:
+            remuxed += 1
+
+    return remuxed
+
+
+async def video_remux_worker():
+    while True:
+        try:
+            remuxed = await remux_pending_videos()
+            if remuxed > 0:
+                print(f"[VideoRemuxer] Remuxed {remuxed} videos for fast start")
+        except Exception as e:
+            print(f"[VideoRemuxer] Error: {e}")
+
+        await asyncio.sleep(VIDEO_REMUX_INTERVAL)
+
+
+def start_remux_task():
+    start_background_task(run_as_leader("video-remuxer", video_remux_worker), "video-remuxer")
+    print("[VideoRemuxer] Background remux task started.")
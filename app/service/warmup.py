@@ -0,0 +1,58 @@
+import asyncio
+import time
+from sqlalchemy import text
+from app.db.database import engine
+from app.config.environments import (
+    DB_POOL_SIZE, WARMUP_TIMEOUT, RUNPOD_API_KEY
+)
+from app.service.runpodDispatcher import endpoints
+from app.utility.http import http_session
+from app.utility.security import warm_up_password_hashing
+from app.utility.storage import get_storage_backend
+
+
+async def warm_up_database():
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Run concurrently so that DB_POOL_SIZE distinct connections are opened and left idle in the pool
+    await asyncio.gather(*(ping() for _ in range(max(1, DB_POOL_SIZE))))
+
+
+def warm_up_http_clients():
+    # Establishes the kept-alive TCP/TLS connections used by summarize, upload_done and presign
+    for endpoint in endpoints:
+        http_session.get(
+            f"{endpoint.url}/health",
+            headers={"Authorization": f"Bearer {RUNPOD_API_KEY}"},
+            timeout=10
+        )
+    get_storage_backend().warm_up()
+
+
+async def run_step(name: str, step):
+    start = time.perf_counter()
+    try:
+        await step()
+        print(f"[Warmup] {name} done in {(time.perf_counter() - start) * 1000:.0f}ms")
+    except Exception as e:
+        print(f"[Warmup] {name} failed: {e}")
+
+
+async def warm_up(application):
+    async def routes():
+        # Builds and caches the OpenAPI schema (and with it every route's models)
+        application.openapi()
+
+    steps = [
+        run_step("database", warm_up_database),
+        run_step("http clients", lambda: asyncio.to_thread(warm_up_http_clients)),
+        run_step("password hashing", lambda: asyncio.to_thread(warm_up_password_hashing)),
+        run_step("routes", routes),
+    ]
+
+    try:
+        await asyncio.wait_for(asyncio.gather(*steps), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"[Warmup] Did not finish within {WARMUP_TIMEOUT}s, continuing startup")
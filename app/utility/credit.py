@@ -0,0 +1,122 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from app.model.credit import CreditLedgerModel, CreditEntryType
+from app.model.user import UserModel
+
+CREDIT_LOCK_NAMESPACE = 38  # first key of the two-key advisory locks serializing a user's debits
+
+# None of these commit: the ledger entry is written in the caller's transaction,
+# together with the job or video it pays for.
+
+
+def credit_balance_query(user_id: int):
+    pending = (
+        select(func.coalesce(func.sum(CreditLedgerModel.amount), 0))
+        .where(CreditLedgerModel.user_id == user_id, CreditLedgerModel.compacted.is_(False))
+        .scalar_subquery()
+    )
+    return select(UserModel.credit + pending).where(UserModel.id == user_id)
+
+
+async def get_credit_balance(db, user_id: int) -> int:
+    """
+    Return a user's available credit
+
+    Args:
+        db: Database session
+        user_id: ID of the user
+
+    Returns:
+        int: Compacted balance plus all entries not compacted yet (0 if the user doesn't exist)
+    """
+    result = await db.execute(credit_balance_query(user_id))
+    return result.scalar() or 0
+
+
+async def add_ledger_entry(db, user_id: int, entry_type: CreditEntryType, amount: int, job_id: int | None = None) -> bool:
+    # Conflicts with the per-job unique indexes make job entries idempotent
+    result = await db.execute(
+        insert(CreditLedgerModel)
+        .values(user_id=user_id, job_id=job_id, entry_type=entry_type, amount=amount)
+        .on_conflict_do_nothing()
+        .returning(CreditLedgerModel.id)
+    )
+    return result.first() is not None
+
+
+async def add_ledger_entries(db, entries: list[dict]) -> int:
+    """
+    Insert many ledger entries in one statement, e.g. the settlements of a webhook batch
+
+    Args:
+        db: Database session
+        entries: Dicts with user_id, job_id, entry_type and amount
+
+    Returns:
+        int: Number of entries inserted (entries of already settled or released jobs are skipped)
+    """
+    if not entries:
+        return 0
+
+    result = await db.execute(
+        insert(CreditLedgerModel)
+        .values(entries)
+        .on_conflict_do_nothing()
+        .returning(CreditLedgerModel.id)
+    )
+    return len(result.all())
+
+
+async def debit_credit(db, user_id: int, entry_type: CreditEntryType, amount: int, job_id: int | None = None) -> bool:
+    # Debits of one user are serialized by a transaction-level advisory lock so that two
+    # concurrent requests can't both pass the balance check; unlike an UPDATE of the user's
+    # row it writes nothing and is released on commit.
+    await db.execute(select(func.pg_advisory_xact_lock(CREDIT_LOCK_NAMESPACE, user_id)))
+
+    if await get_credit_balance(db, user_id) < amount:
+        return False
+    return await add_ledger_entry(db, user_id, entry_type, -amount, job_id)
+
+
+async def grant_credit(db, user_id: int, amount: int):
+    await add_ledger_entry(db, user_id, CreditEntryType.GRANT, amount)
+
+
+async def spend_credit(db, user_id: int, amount: int) -> bool:
+    """
+    Use credit that isn't tied to a job
+
+    Returns:
+        bool: False if the balance is insufficient
+    """
+    return await debit_credit(db, user_id, CreditEntryType.SPEND, amount)
+
+
+async def reserve_credit(db, user_id: int, job_id: int, amount: int = 1) -> bool:
+    """
+    Hold credit for a queued job until it is settled or released
+
+    Returns:
+        bool: False if the balance is insufficient or the job already has a reservation
+    """
+    return await debit_credit(db, user_id, CreditEntryType.RESERVE, amount, job_id)
+
+
+async def settle_credit(db, user_id: int, job_id: int) -> bool:
+    """
+    Consume a job's reservation
+
+    Returns:
+        bool: False if the job was already settled or released
+    """
+    return await add_ledger_entry(db, user_id, CreditEntryType.SETTLE, 0, job_id)
+
+
+async def release_credit(db, user_id: int, job_id: int, amount: int = 1) -> bool:
+    """
+    Return a job's reservation to the user
+
+    Returns:
+        bool: False if the job was already settled or released
+    """
+    return await add_ledger_entry(db, user_id, CreditEntryType.RELEASE, amount, job_id)
@@ -0,0 +1,158 @@
+"""
+HLS packaging of job results using FFmpeg
+"""
+import os
+import subprocess
+from app.utility.metrics import MEDIA_TOOL_DURATION
+
+HLS_TIMEOUT = 60 * 60  # seconds, encoding every rendition of a long result
+HLS_PRESET = "veryfast"
+
+# Renditions by the short side of the picture (so vertical results get the same ladder):
+# name -> (short side, video bitrate, audio bitrate)
+HLS_LADDER = {
+    "1080p": (1080, "5000k", "192k"),
+    "720p": (720, "2800k", "128k"),
+    "480p": (480, "1400k", "128k"),
+    "360p": (360, "800k", "96k"),
+}
+
+PLAYLIST_CONTENT_TYPE = "application/vnd.apple.mpegurl"
+SEGMENT_CONTENT_TYPE = "video/mp2t"
+
+
+def plan_renditions(names: list[str], width: int | None, height: int | None) -> list[str]:
+    """
+    Pick the renditions of the ladder to encode for a source of the given size
+
+    Renditions larger than the source are skipped, except the smallest one, so there is
+    always at least one.
+
+    Args:
+        names: Configured rendition names, e.g. ["720p", "480p", "360p"]
+        width: Source width, None if unknown
+        height: Source height, None if unknown
+
+    Returns:
+        list[str]: Rendition names, largest first
+
+    Raises:
+        ValueError: If a name isn't in HLS_LADDER
+    """
+    unknown = [name for name in names if name not in HLS_LADDER]
+    if unknown:
+        raise ValueError(f"Unknown HLS renditions: {', '.join(unknown)} (known: {', '.join(HLS_LADDER)})")
+
+    renditions = sorted(set(names), key=lambda name: HLS_LADDER[name][0], reverse=True)
+    if not width or not height:
+        return renditions
+    short_side = min(width, height)
+    return [name for name in renditions if HLS_LADDER[name][0] <= short_side] or renditions[-1:]
+
+
+def package_hls(
+        video_path: str,
+        output_dir: str,
+        stem: str,
+        renditions: list[str],
+        segment_duration: int,
+        has_audio: bool = True
+) -> list[str]:
+    """
+    Encode a video into an HLS ladder with one FFmpeg run (the source is decoded once)
+
+    Writes `{stem}.m3u8` (master playlist), `{stem}_{rendition}.m3u8` (media playlists) and
+    `{stem}_{rendition}_{n}.ts` (segments) to `output_dir`. The names have no directories,
+    so the playlists' relative references work in a flat bucket. Keyframes are forced every
+    `segment_duration` seconds, so the renditions' segments line up and players can switch
+    between them at any segment.
+
+    Args:
+        video_path: Path to the input video file
+        output_dir: Directory to write the playlists and segments to
+        stem: Prefix of every file name
+        renditions: Names from HLS_LADDER, see plan_renditions
+        segment_duration: Target segment length in seconds
+        has_audio: Whether the source has an audio stream to include
+
+    Returns:
+        list[str]: Names of the written files, segments first and the master playlist last
+
+    Raises:
+        ValueError: If FFmpeg couldn't package the file
+        RuntimeError: If FFmpeg is missing or timed out
+    """
+    splits = "".join(f"[v{index}]" for index in range(len(renditions)))
+    filters = [f"[0:v]split={len(renditions)}{splits}"]
+    outputs = []
+    stream_map = []
+    for index, name in enumerate(renditions):
+        short_side, video_bitrate, _ = HLS_LADDER[name]
+        filters.append(
+            f"[v{index}]scale=w='if(gt(iw,ih),-2,{short_side})':h='if(gt(iw,ih),{short_side},-2)'[v{index}out]"
+        )
+        bitrate = int(video_bitrate.rstrip("k"))
+        outputs += [
+            "-map", f"[v{index}out]",
+            f"-b:v:{index}", video_bitrate,
+            f"-maxrate:v:{index}", f"{bitrate * 107 // 100}k",
+            f"-bufsize:v:{index}", f"{bitrate * 3 // 2}k",
+        ]
+        stream_map.append(f"v:{index},a:{index},name:{name}" if has_audio else f"v:{index},name:{name}")
+
+    if has_audio:
+        for index, name in enumerate(renditions):
+            outputs += ["-map", "0:a:0", f"-b:a:{index}", HLS_LADDER[name][2]]
+        outputs += ["-c:a", "aac", "-ac", "2"]
+
+    command = [
+        "ffmpeg",
+        "-v", "error",
+        "-i", video_path,
+        "-filter_complex", ";".join(filters),
+        *outputs,
+        "-c:v", "libx264",
+        "-preset", HLS_PRESET,
+        "-pix_fmt", "yuv420p",
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment_duration})",
+        "-sc_threshold", "0",
+        "-f", "hls",
+        "-hls_time", str(segment_duration),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_type", "mpegts",
+        "-hls_segment_filename", os.path.join(output_dir, f"{stem}_%v_%05d.ts"),
+        "-master_pl_name", f"{stem}.m3u8",
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(output_dir, f"{stem}_%v.m3u8")
+    ]
+
+    try:
+        with MEDIA_TOOL_DURATION.labels(tool="ffmpeg", operation="hls").time():
+            result = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=HLS_TIMEOUT
+            )
+    except FileNotFoundError:
+        raise RuntimeError("FFmpeg is not installed")
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"FFmpeg did not finish within {HLS_TIMEOUT}s")
+
+    if result.returncode != 0:
+        raise ValueError(result.stderr.decode(errors="replace").strip() or "FFmpeg failed")
+
+    master = f"{stem}.m3u8"
+    # Segments before the media playlists referencing them
+    files = sorted(
+        (name for name in os.listdir(output_dir) if name.startswith(stem) and name != master),
+        key=lambda name: (name.endswith(".m3u8"), name)
+    )
+    if not os.path.exists(os.path.join(output_dir, master)):
+        raise ValueError("FFmpeg didn't write the master playlist")
+    return files + [master]
+
+
+def content_type_of(filename: str) -> str:
+    return PLAYLIST_CONTENT_TYPE if filename.endswith(".m3u8") else SEGMENT_CONTENT_TYPE
@@ -0,0 +1,16 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_POOL_SIZE = 20  # kept-alive connections per host
+
+
+def create_http_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every outbound call so TCP/TLS connections to RunPod and Supabase are reused
+http_session = create_http_session()
@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+from datetime import timedelta
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update, delete, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from app.config.environments import IDEMPOTENCY_TTL
+from app.model.idempotency import IdempotencyKeyModel
+from app.utility.time import utc_now
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_STALE_AFTER = 60  # seconds after which an unfinished request is assumed to have crashed
+IDEMPOTENCY_WAIT_TIMEOUT = 10  # seconds a duplicate waits for the original request to finish
+IDEMPOTENCY_POLL_INTERVAL = 0.1
+
+
+def hash_request_body(body: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+async def begin_idempotent_request(
+        db,
+        key: str | None,
+        user_id: int,
+        endpoint: str,
+        body: dict
+) -> JSONResponse | None:
+    """
+    Claim an Idempotency-Key before performing a request's side effects
+
+    The claim is committed right away, so concurrent duplicates see it and wait for the
+    original request to finish instead of repeating its side effects.
+
+    Args:
+        db: Database session
+        key: Value of the Idempotency-Key header (None disables idempotency)
+        user_id: ID of the requesting user, keys are scoped per user
+        endpoint: Name of the endpoint, keys are scoped per endpoint
+        body: Request body, a key can't be reused with a different body
+
+    Returns:
+        JSONResponse | None: The original response to replay, or None if this request owns the key
+            and must finish with save_idempotent_response() or release_idempotency_key()
+
+    Raises:
+        HTTPException: 400 for an invalid key, 422 if the key was used with a different body,
+            409 if the original request is still in progress
+    """
+    if key is None:
+        return None
+
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+        )
+
+    request_hash = hash_request_body(body)
+    now = utc_now()
+    claim = {
+        "request_hash": request_hash,
+        "status_code": None,
+        "response": None,
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=IDEMPOTENCY_TTL),
+    }
+
+    # Take over keys that expired or whose original request died before finishing
+    statement = insert(IdempotencyKeyModel).values(user_id=user_id, endpoint=endpoint, key=key, **claim)
+    statement = statement.on_conflict_do_update(
+        constraint="uq_idempotency_keys_user_endpoint_key",
+        set_=claim,
+        where=or_(
+            IdempotencyKeyModel.expires_at < now,
+            and_(
+                IdempotencyKeyModel.status_code.is_(None),
+                IdempotencyKeyModel.created_at < now - timedelta(seconds=IDEMPOTENCY_STALE_AFTER)
+            )
+        )
+    ).returning(IdempotencyKeyModel.id)
+
+    result = await db.execute(statement)
+    claimed = result.first()
+    await db.commit()
+
+    if claimed:
+        return None
+
+    deadline = asyncio.get_running_loop().time() + IDEMPOTENCY_WAIT_TIMEOUT
+    while True:
+        result = await db.execute(
+            select(
+                IdempotencyKeyModel.request_hash,
+                IdempotencyKeyModel.status_code,
+                IdempotencyKeyModel.response
+            ).where(
+                IdempotencyKeyModel.user_id == user_id,
+                IdempotencyKeyModel.endpoint == endpoint,
+                IdempotencyKeyModel.key == key
+            )
+        )
+        record = result.first()
+        # Don't hold a connection (or a snapshot) while waiting
+        await db.rollback()
+
+        if record is None:
+            # The original request failed and released the key, let the client retry it
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The original request with this Idempotency-Key failed, retry it"
+            )
+
+        if record.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request body"
+            )
+
+        if record.status_code is not None:
+            return JSONResponse(
+                content=record.response,
+                status_code=record.status_code,
+                headers={"Idempotent-Replayed": "true"}
+            )
+
+        if asyncio.get_running_loop().time() > deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+
+        await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL)
+
+
+async def save_idempotent_response(
+        db,
+        key: str | None,
+        user_id: int,
+        endpoint: str,
+        response: dict,
+        status_code: int = status.HTTP_200_OK
+):
+    """
+    Store the response of a claimed Idempotency-Key
+
+    Doesn't commit, so the response is stored in the same transaction as the request's
+    side effects: either both are persisted or neither is.
+    """
+    if key is None:
+        return
+
+    await db.execute(
+        update(IdempotencyKeyModel)
+        .where(
+            IdempotencyKeyModel.user_id == user_id,
+            IdempotencyKeyModel.endpoint == endpoint,
+            IdempotencyKeyModel.key == key
+        )
+        .values(status_code=status_code, response=jsonable_encoder(response))
+    )
+
+
+async def release_idempotency_key(db, key: str | None, user_id: int, endpoint: str):
+    """Give up a claimed Idempotency-Key after the request failed, so that it can be retried"""
+    if key is None:
+        return
+
+    await db.rollback()
+    await db.execute(
+        delete(IdempotencyKeyModel).where(
+            IdempotencyKeyModel.user_id == user_id,
+            IdempotencyKeyModel.endpoint == endpoint,
+            IdempotencyKeyModel.key == key,
+            IdempotencyKeyModel.status_code.is_(None)
+        )
+    )
+    await db.commit()
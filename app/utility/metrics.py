@@ -0,0 +1,67 @@
+"""
+Prometheus metrics shared by the middleware, the outbound clients and the /metrics endpoint
+"""
+from prometheus_client import Histogram, Gauge, Counter
+
+# Route latency, labelled with the route template (e.g. "/video/{id}/detail") so that the
+# number of series stays bounded no matter how many distinct ids are requested.
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests handled by the API",
+    ["method", "route", "status"]
+)
+
+# Calls to external services (RunPod, Supabase storage)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_request_duration_seconds",
+    "Latency of outbound calls to external services",
+    ["service", "operation"]
+)
+
+# ffmpeg / ffprobe / yt-dlp invocations
+MEDIA_TOOL_DURATION = Histogram(
+    "media_tool_duration_seconds",
+    "Duration of media tool invocations",
+    ["tool", "operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+
+# Time spent waiting for a database connection at the start of a request
+DB_CHECKOUT_DURATION = Histogram(
+    "db_connection_checkout_seconds",
+    "Time spent acquiring a database connection"
+)
+
+JOBS_BY_STATUS = Gauge(
+    "jobs_by_status",
+    "Number of jobs per JobStatus",
+    ["status"],
+    multiprocess_mode="mostrecent"
+)
+
+# Lets alerts tell stale job counts apart (the database didn't answer the last scrapes)
+JOBS_BY_STATUS_UPDATED = Gauge(
+    "jobs_by_status_last_update_timestamp_seconds",
+    "Unix time the job counts were last read from the database",
+    multiprocess_mode="mostrecent"
+)
+
+# Delay between when a loop callback was scheduled and when it actually ran
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+
+# Orphaned storage objects removed by the storage garbage collector
+STORAGE_GC_DELETED_OBJECTS = Counter(
+    "storage_gc_deleted_objects",
+    "Orphaned storage objects deleted by the garbage collector",
+    ["bucket"]
+)
+
+STORAGE_GC_RECLAIMED_BYTES = Counter(
+    "storage_gc_reclaimed_bytes",
+    "Bytes of orphaned storage objects deleted by the garbage collector",
+    ["bucket"]
+)
@@ -0,0 +1,126 @@
+import asyncio
+from fastapi import HTTPException, status
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from app.config.environments import MULTIPART_PART_SIZE
+from app.model.upload import UploadSessionModel, UploadSessionStatus, UploadPartModel
+from app.utility.storage import list_upload_parts, complete_multipart_upload
+from app.utility.time import utc_now
+
+MULTIPART_MAX_PARTS = 10000  # S3 limit
+MULTIPART_MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum for every part but the last
+MULTIPART_PART_URL_EXPIRES_IN = 60 * 60  # 1 Hour
+MULTIPART_URLS_PER_REQUEST = 100
+
+
+def plan_parts(size: int) -> tuple[int, int]:
+    """
+    Choose the part size of an upload
+
+    Returns:
+        tuple: Part size in bytes and number of parts
+    """
+    part_size = max(MULTIPART_PART_SIZE, MULTIPART_MIN_PART_SIZE, -(-size // MULTIPART_MAX_PARTS))
+    return part_size, max(1, -(-size // part_size))
+
+
+def expected_part_size(upload: UploadSessionModel, part_number: int) -> int:
+    if part_number < upload.part_count:
+        return upload.part_size
+    return upload.size - upload.part_size * (upload.part_count - 1)
+
+
+async def get_upload_session(db, upload_id: str, user_id: int) -> UploadSessionModel:
+    """
+    Return the user's upload session
+
+    Raises:
+        HTTPException: 404 if it doesn't exist or belongs to another user
+    """
+    result = await db.execute(
+        select(UploadSessionModel).where(UploadSessionModel.id == upload_id, UploadSessionModel.user_id == user_id)
+    )
+    upload = result.scalar_one_or_none()
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    return upload
+
+
+async def sync_upload_parts(db, upload: UploadSessionModel) -> dict[int, dict]:
+    """
+    Record the parts found in storage in upload_parts
+
+    Storage is the source of truth (a client may die between uploading a part and reporting it),
+    so clients never report parts themselves.
+
+    Returns:
+        dict[int, dict]: Parts of the upload by part number, with "etag" and "size"
+    """
+    listed = await asyncio.to_thread(list_upload_parts, upload.filename, upload.storage_upload_id, upload.bucket)
+    parts = {
+        part["part_number"]: part
+        for part in listed
+        if 1 <= part["part_number"] <= upload.part_count
+    }
+
+    await db.execute(
+        delete(UploadPartModel)
+        .where(UploadPartModel.session_id == upload.id, UploadPartModel.part_number.not_in(list(parts)))
+    )
+    if parts:
+        statement = insert(UploadPartModel).values([
+            {"session_id": upload.id, "part_number": number, "etag": part["etag"], "size": part["size"]}
+            for number, part in parts.items()
+        ])
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UploadPartModel.session_id, UploadPartModel.part_number],
+                set_={"etag": statement.excluded.etag, "size": statement.excluded.size, "updated_at": utc_now()}
+            )
+        )
+    return parts
+
+
+def missing_parts(upload: UploadSessionModel, parts: dict[int, dict]) -> list[int]:
+    # A part of the wrong size was cut off, it has to be uploaded again
+    return [
+        number for number in range(1, upload.part_count + 1)
+        if number not in parts or parts[number]["size"] != expected_part_size(upload, number)
+    ]
+
+
+async def complete_upload_session(db, upload: UploadSessionModel):
+    """
+    Assemble the parts of an upload into its object
+
+    Completing is not repeatable in storage, so the caller must commit right after.
+
+    Raises:
+        HTTPException: 409 if the upload isn't in progress or parts are missing
+    """
+    if upload.status != UploadSessionStatus.UPLOADING or upload.expires_at < utc_now():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload was aborted or has expired"
+        )
+
+    parts = await sync_upload_parts(db, upload)
+    missing = missing_parts(upload, parts)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Upload is incomplete", "missing_parts": missing}
+        )
+
+    await asyncio.to_thread(
+        complete_multipart_upload,
+        upload.filename,
+        upload.storage_upload_id,
+        [(number, parts[number]["etag"]) for number in range(1, upload.part_count + 1)],
+        upload.bucket
+    )
+    upload.status = UploadSessionStatus.COMPLETED
+    upload.completed_at = utc_now()
@@ -0,0 +1,75 @@
+from app.config.environments import RUNPOD_URL, RUNPOD_API_KEY
+from app.utility.http import http_session
+from app.utility.metrics import OUTBOUND_REQUEST_DURATION
+
+
+def submit_runpod_job(endpoint_url: str, job_input: dict, timeout: int = 30) -> dict:
+    """
+    Submit a job to a RunPod serverless endpoint
+
+    Args:
+        endpoint_url: Base URL of the RunPod endpoint
+        job_input: Value of the request's "input" field
+        timeout: Request timeout in seconds
+
+    Returns:
+        dict: RunPod's response (contains "id" when the job was accepted)
+
+    Raises:
+        requests.exceptions.RequestException: If RunPod can't be reached
+    """
+    with OUTBOUND_REQUEST_DURATION.labels(service="runpod", operation="run").time():
+        response = http_session.post(
+            url=f"{endpoint_url}/run",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {RUNPOD_API_KEY}"
+            },
+            json={"input": job_input},
+            timeout=timeout
+        )
+    return response.json()
+
+
+def cancel_runpod_job(runpod_job_id: str, endpoint_url: str | None = None) -> dict:
+    """
+    Cancel a queued or running RunPod job, freeing its GPU worker
+
+    Args:
+        runpod_job_id: RunPod's internal job ID
+        endpoint_url: Endpoint the job was submitted to (default: RUNPOD_URL)
+
+    Returns:
+        dict: RunPod's response (contains the job's new status)
+
+    Raises:
+        requests.exceptions.RequestException: If RunPod can't be reached or rejects the request
+    """
+    with OUTBOUND_REQUEST_DURATION.labels(service="runpod", operation="cancel").time():
+        response = http_session.post(
+            url=f"{endpoint_url or RUNPOD_URL}/cancel/{runpod_job_id}",
+            headers={"Authorization": f"Bearer {RUNPOD_API_KEY}"},
+            timeout=30
+        )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_runpod_health(endpoint_url: str, timeout: int = 5) -> dict:
+    """
+    Get the queue depth and worker counts of a RunPod endpoint
+
+    Returns:
+        dict: {"jobs": {"inQueue", "inProgress", ...}, "workers": {"idle", "running", ...}}
+
+    Raises:
+        requests.exceptions.RequestException: If the endpoint can't be reached or is unhealthy
+    """
+    with OUTBOUND_REQUEST_DURATION.labels(service="runpod", operation="health").time():
+        response = http_session.get(
+            url=f"{endpoint_url}/health",
+            headers={"Authorization": f"Bearer {RUNPOD_API_KEY}"},
+            timeout=timeout
+        )
+    response.raise_for_status()
+    return response.json()
@@ -1,23 +1,523 @@
+import asyncio
+import hashlib
+import hmac
+import mimetypes
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime, UTC
+from functools import lru_cache
+from urllib.parse import quote
 from fastapi import UploadFile
-from supabase import create_client, Client
-from app.config.environments import SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY
+from app.config.environments import (
+    SECRET_KEY, BACKEND_URL, STORAGE_BACKEND, LOCAL_STORAGE_DIR,
+    SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY,
+    SUPABASE_S3_ACCESS_KEY_ID, SUPABASE_S3_SECRET_ACCESS_KEY, SUPABASE_S3_REGION
+)
+from app.utility.http import http_session
+from app.utility.metrics import OUTBOUND_REQUEST_DURATION
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY)
+STORAGE_REMOVE_BATCH_SIZE = 1000  # most objects Supabase Storage deletes per request
+SIGNED_URL_EXPIRES_IN = 60 * 60  # 1 Hour
+SIGNED_URL_CACHE_SIZE = 10000
+SIGNED_URL_REFRESH_MARGIN = 5 * 60  # seconds before expiry after which a cached signed URL is re-signed
+UPLOAD_URL_EXPIRES_IN = 30 * 60  # 30 Minutes
+LOCAL_WRITE_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 60  # seconds without receiving data before a download is given up
 
+# Object names are generated by us (uuid + extension), anything else can't be a path into LOCAL_STORAGE_DIR
+OBJECT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+BUCKET_NAME_PATTERN = re.compile(r"^[a-z0-9-]+$")
+UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
 
-async def upload_to_supabase_storage(
+# (bucket, object name) -> (expiry on the monotonic clock, signed URL)
+_signed_url_cache: dict[tuple[str, str, int], tuple[float, str]] = {}
+
+
+@lru_cache(maxsize=None)
+def get_supabase():
+    """
+    Return the Supabase client, creating it on first use
+
+    supabase-py is heavy to import and builds its HTTP clients on creation,
+    so this is deferred until storage is actually needed (or warmed up).
+    """
+    from supabase import create_client
+
+    return create_client(SUPABASE_PROJECT_URL, SUPABASE_SERVICE_KEY)
+
+
+@lru_cache(maxsize=None)
+def get_s3():
+    """
+    Return an S3 client of Supabase Storage's S3 protocol, creating it on first use
+
+    Only multipart uploads need it (supabase-py has no multipart API), so boto3 is imported lazily too.
+    """
+    if not SUPABASE_S3_ACCESS_KEY_ID or not SUPABASE_S3_SECRET_ACCESS_KEY:
+        raise RuntimeError("Multipart uploads need SUPABASE_S3_ACCESS_KEY_ID and SUPABASE_S3_SECRET_ACCESS_KEY")
+
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        endpoint_url=f"{SUPABASE_PROJECT_URL}/storage/v1/s3",
+        region_name=SUPABASE_S3_REGION,
+        aws_access_key_id=SUPABASE_S3_ACCESS_KEY_ID,
+        aws_secret_access_key=SUPABASE_S3_SECRET_ACCESS_KEY,
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"})
+    )
+
+
+def object_name(file_path: str) -> str:
+    # Rows store public URLs, Storage calls take the object name
+    return file_path.split("?")[0].split("/")[-1] if file_path.startswith("http") else file_path
+
+
+class StorageBackend:
+    """
+    Object storage holding the "videos", "thumbnails" and "outputs" buckets
+
+    Methods are sync (supabase-py is sync), call them through asyncio.to_thread from async code.
+    """
+    name = ""
+
+    def upload(self, bucket: str, filename: str, content: bytes, content_type: str):
+        raise NotImplementedError
+
+    def remove(self, bucket: str, filenames: list[str]):
+        raise NotImplementedError
+
+    def list_objects(self, bucket: str, limit: int, offset: int) -> list[dict]:
+        raise NotImplementedError
+
+    def public_url(self, bucket: str, filename: str) -> str:
+        raise NotImplementedError
+
+    def head(self, bucket: str, filename: str) -> dict | None:
+        raise NotImplementedError
+
+    def download(self, bucket: str, filename: str, destination: str):
+        raise NotImplementedError
+
+    def replace(self, bucket: str, filename: str, source: str, content_type: str):
+        raise NotImplementedError
+
+    def probe_source(self, bucket: str, filename: str) -> str:
+        # Where media tools read the object from
+        return self.public_url(bucket, filename)
+
+    def sign(self, bucket: str, filenames: list[str], expires_in: int) -> dict[str, str]:
+        raise NotImplementedError
+
+    def upload_url(self, bucket: str, filename: str, expires_in: int) -> str:
+        raise NotImplementedError
+
+    def check(self, timeout: float):
+        raise NotImplementedError
+
+    def warm_up(self):
+        pass
+
+    # Multipart uploads: parts are uploaded directly by the client, then assembled into the object
+
+    def create_multipart_upload(self, bucket: str, filename: str, content_type: str) -> str:
+        raise NotImplementedError
+
+    def part_upload_url(self, bucket: str, filename: str, upload_id: str, part_number: int, expires_in: int) -> str:
+        raise NotImplementedError
+
+    def list_parts(self, bucket: str, filename: str, upload_id: str) -> list[dict]:
+        raise NotImplementedError
+
+    def complete_multipart_upload(self, bucket: str, filename: str, upload_id: str, parts: list[tuple[int, str]]):
+        raise NotImplementedError
+
+    def abort_multipart_upload(self, bucket: str, filename: str, upload_id: str):
+        raise NotImplementedError
+
+
+class SupabaseStorageBackend(StorageBackend):
+    name = "supabase"
+
+    def upload(self, bucket: str, filename: str, content: bytes, content_type: str):
+        get_supabase().storage.from_(bucket).upload(
+            path=filename,
+            file=content,
+            file_options={
+                "content-type": content_type,
+                "upsert": "false"  # Don't overwrite existing files
+            }
+        )
+
+    def remove(self, bucket: str, filenames: list[str]):
+        for start in range(0, len(filenames), STORAGE_REMOVE_BATCH_SIZE):
+            get_supabase().storage.from_(bucket).remove(filenames[start:start + STORAGE_REMOVE_BATCH_SIZE])
+
+    def list_objects(self, bucket: str, limit: int, offset: int) -> list[dict]:
+        return get_supabase().storage.from_(bucket).list(
+            "",
+            {"limit": limit, "offset": offset, "sortBy": {"column": "name", "order": "asc"}}
+        )
+
+    def public_url(self, bucket: str, filename: str) -> str:
+        return f"{SUPABASE_PROJECT_URL}/storage/v1/object/public/{bucket}/{filename}"
+
+    def head(self, bucket: str, filename: str) -> dict | None:
+        response = http_session.head(self.public_url(bucket, filename), timeout=10)
+        # Storage answers 400 for some missing objects
+        if response.status_code in (400, 404):
+            return None
+        response.raise_for_status()
+        return {
+            "size": int(response.headers.get("Content-Length", 0)),
+            "content_type": response.headers.get("Content-Type"),
+        }
+
+    def download(self, bucket: str, filename: str, destination: str):
+        with http_session.get(self.public_url(bucket, filename), stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            with open(destination, "wb") as file:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    file.write(chunk)
+
+    def replace(self, bucket: str, filename: str, source: str, content_type: str):
+        # Given a path, the client streams the file instead of reading it into memory
+        get_supabase().storage.from_(bucket).update(
+            path=filename,
+            file=source,
+            file_options={"content-type": content_type}
+        )
+
+    def sign(self, bucket: str, filenames: list[str], expires_in: int) -> dict[str, str]:
+        response = get_supabase().storage.from_(bucket).create_signed_urls(paths=filenames, expires_in=expires_in)
+        return {
+            item["path"]: item["signedURL"]
+            for item in response
+            if not item.get("error") and item.get("signedURL")
+        }
+
+    def upload_url(self, bucket: str, filename: str, expires_in: int) -> str:
+        response = http_session.post(
+            f"{SUPABASE_PROJECT_URL}/storage/v1/object/upload/sign/{bucket}/{filename}",
+            headers={
+                "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={"expiresIn": expires_in}
+        )
+        response.raise_for_status()
+        return f"{SUPABASE_PROJECT_URL}/storage/v1{response.json()['url']}"
+
+    def check(self, timeout: float):
+        response = http_session.get(
+            f"{SUPABASE_PROJECT_URL}/storage/v1/bucket",
+            headers={"Authorization": f"Bearer {SUPABASE_SERVICE_KEY}", "apikey": SUPABASE_SERVICE_KEY},
+            timeout=timeout
+        )
+        response.raise_for_status()
+
+    def warm_up(self):
+        # Establishes the kept-alive connection used by presign, and the Supabase client's own HTTP client
+        self.check(timeout=10)
+        get_supabase().storage.list_buckets()
+
+    def create_multipart_upload(self, bucket: str, filename: str, content_type: str) -> str:
+        response = get_s3().create_multipart_upload(Bucket=bucket, Key=filename, ContentType=content_type)
+        return response["UploadId"]
+
+    def part_upload_url(self, bucket: str, filename: str, upload_id: str, part_number: int, expires_in: int) -> str:
+        # Presigning is local computation, no request is made
+        return get_s3().generate_presigned_url(
+            "upload_part",
+            Params={"Bucket": bucket, "Key": filename, "UploadId": upload_id, "PartNumber": part_number},
+            ExpiresIn=expires_in
+        )
+
+    def list_parts(self, bucket: str, filename: str, upload_id: str) -> list[dict]:
+        parts = []
+        for page in get_s3().get_paginator("list_parts").paginate(Bucket=bucket, Key=filename, UploadId=upload_id):
+            parts.extend(
+                {"part_number": part["PartNumber"], "etag": part["ETag"], "size": part["Size"]}
+                for part in page.get("Parts", [])
+            )
+        return parts
+
+    def complete_multipart_upload(self, bucket: str, filename: str, upload_id: str, parts: list[tuple[int, str]]):
+        get_s3().complete_multipart_upload(
+            Bucket=bucket,
+            Key=filename,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in parts]}
+        )
+
+    def abort_multipart_upload(self, bucket: str, filename: str, upload_id: str):
+        get_s3().abort_multipart_upload(Bucket=bucket, Key=filename, UploadId=upload_id)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Buckets are directories of LOCAL_STORAGE_DIR, served under /uploads by app/middleware/static.py
+
+    Objects are public like the Supabase buckets, so signed download URLs are plain public URLs.
+    Presigned uploads go to PUT /storage/upload/{bucket}/{filename} (and .../parts/{part_number}
+    for multipart uploads), authorized by an HMAC of the target and expiry. Multipart parts are
+    kept in LOCAL_STORAGE_DIR/.multipart/{upload_id}/ until they are assembled.
+    """
+    name = "local"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def object_path(self, bucket: str, filename: str) -> str:
+        if not BUCKET_NAME_PATTERN.match(bucket) or not OBJECT_NAME_PATTERN.match(filename):
+            raise ValueError(f"Invalid object name: {bucket}/{filename}")
+        return os.path.join(self.directory, bucket, filename)
+
+    def open_temporary(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Dot-prefixed, so it is never listed nor served
+        temporary = os.path.join(os.path.dirname(path), f".{uuid.uuid4().hex}.part")
+        return temporary, open(temporary, "wb")
+
+    def publish(self, temporary: str, path: str):
+        # A hard link fails if the object exists (no overwrite) and never exposes a partial file
+        try:
+            os.link(temporary, path)
+        finally:
+            os.unlink(temporary)
+
+    def upload(self, bucket: str, filename: str, content: bytes, content_type: str):
+        path = self.object_path(bucket, filename)
+        temporary, file = self.open_temporary(path)
+        try:
+            with file:
+                file.write(content)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.publish(temporary, path)
+
+    async def receive_stream(self, path: str, chunks) -> tuple[str, int]:
+        # Writes to a temporary file next to `path`, the caller moves it into place
+        temporary, file = await asyncio.to_thread(self.open_temporary, path)
+        size = 0
+        buffer = bytearray()
+        try:
+            with file:
+                async for chunk in chunks:
+                    buffer += chunk
+                    if len(buffer) >= LOCAL_WRITE_CHUNK_SIZE:
+                        await asyncio.to_thread(file.write, bytes(buffer))
+                        size += len(buffer)
+                        buffer.clear()
+                if buffer:
+                    await asyncio.to_thread(file.write, bytes(buffer))
+                    size += len(buffer)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return temporary, size
+
+    async def upload_stream(self, bucket: str, filename: str, chunks) -> int:
+        """
+        Write an async iterable of bytes to an object without buffering it in memory
+
+        Returns:
+            int: Size of the object in bytes
+
+        Raises:
+            ValueError: If the object name is invalid
+            FileExistsError: If the object already exists
+        """
+        path = self.object_path(bucket, filename)
+        if os.path.exists(path):
+            raise FileExistsError(path)
+
+        temporary, size = await self.receive_stream(path, chunks)
+        await asyncio.to_thread(self.publish, temporary, path)
+        return size
+
+    async def upload_part_stream(self, upload_id: str, part_number: int, chunks) -> str:
+        """
+        Write a part of a multipart upload, replacing an earlier attempt of the same part
+
+        Returns:
+            str: ETag of the part
+
+        Raises:
+            ValueError: If the upload ID is invalid
+            FileNotFoundError: If the upload was completed or aborted
+        """
+        path = os.path.join(self.multipart_directory(upload_id), f"{part_number:05d}")
+        if not os.path.isdir(os.path.dirname(path)):
+            raise FileNotFoundError(path)
+
+        temporary, _ = await self.receive_stream(path, chunks)
+        await asyncio.to_thread(os.replace, temporary, path)
+        return self.part_etag(await asyncio.to_thread(os.stat, path))
+
+    def remove(self, bucket: str, filenames: list[str]):
+        for filename in filenames:
+            try:
+                os.unlink(self.object_path(bucket, filename))
+            except FileNotFoundError:
+                pass
+
+    def list_objects(self, bucket: str, limit: int, offset: int) -> list[dict]:
+        try:
+            entries = sorted(
+                (entry for entry in os.scandir(os.path.join(self.directory, bucket))
+                 if not entry.name.startswith(".") and entry.is_file()),
+                key=lambda entry: entry.name
+            )
+        except FileNotFoundError:
+            return []
+
+        objects = []
+        for entry in entries[offset:offset + limit]:
+            stat = entry.stat()
+            objects.append({
+                "id": entry.name,
+                "name": entry.name,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, UTC).isoformat(),
+                "metadata": {"size": stat.st_size},
+            })
+        return objects
+
+    def public_url(self, bucket: str, filename: str) -> str:
+        return f"{BACKEND_URL}/uploads/{bucket}/{quote(filename)}"
+
+    def head(self, bucket: str, filename: str) -> dict | None:
+        try:
+            stat = os.stat(self.object_path(bucket, filename))
+        except FileNotFoundError:
+            return None
+        return {"size": stat.st_size, "content_type": mimetypes.guess_type(filename)[0]}
+
+    def download(self, bucket: str, filename: str, destination: str):
+        shutil.copyfile(self.object_path(bucket, filename), destination)
+
+    def replace(self, bucket: str, filename: str, source: str, content_type: str):
+        path = self.object_path(bucket, filename)
+        temporary, file = self.open_temporary(path)
+        try:
+            with file, open(source, "rb") as source_file:
+                shutil.copyfileobj(source_file, file, LOCAL_WRITE_CHUNK_SIZE)
+            # Readers that opened the old file keep reading it
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+
+    def probe_source(self, bucket: str, filename: str) -> str:
+        return self.object_path(bucket, filename)
+
+    def sign(self, bucket: str, filenames: list[str], expires_in: int) -> dict[str, str]:
+        return {filename: self.public_url(bucket, filename) for filename in filenames}
+
+    def upload_token(self, target: str, expires: int) -> str:
+        message = f"{target}:{expires}".encode()
+        return hmac.new(SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    def verify_upload_token(self, target: str, expires: int, token: str) -> bool:
+        return expires >= time.time() and hmac.compare_digest(self.upload_token(target, expires), token)
+
+    def upload_url(self, bucket: str, filename: str, expires_in: int) -> str:
+        self.object_path(bucket, filename)
+        expires = int(time.time()) + expires_in
+        token = self.upload_token(f"{bucket}/{filename}", expires)
+        return f"{BACKEND_URL}/storage/upload/{bucket}/{quote(filename)}?expires={expires}&token={token}"
+
+    def check(self, timeout: float):
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.access(self.directory, os.W_OK):
+            raise RuntimeError(f"{self.directory} is not writable")
+
+    def multipart_directory(self, upload_id: str) -> str:
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            raise ValueError(f"Invalid upload ID: {upload_id}")
+        return os.path.join(self.directory, ".multipart", upload_id)
+
+    def part_etag(self, stat) -> str:
+        # Identifies this version of the part, so a part replaced after listing is detected on completion
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def create_multipart_upload(self, bucket: str, filename: str, content_type: str) -> str:
+        self.object_path(bucket, filename)
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self.multipart_directory(upload_id))
+        return upload_id
+
+    def part_upload_url(self, bucket: str, filename: str, upload_id: str, part_number: int, expires_in: int) -> str:
+        self.multipart_directory(upload_id)
+        expires = int(time.time()) + expires_in
+        token = self.upload_token(f"{upload_id}/{part_number}", expires)
+        return (
+            f"{BACKEND_URL}/storage/upload/{bucket}/{quote(filename)}/parts/{part_number}"
+            f"?upload_id={upload_id}&expires={expires}&token={token}"
+        )
+
+    def list_parts(self, bucket: str, filename: str, upload_id: str) -> list[dict]:
+        parts = []
+        for entry in os.scandir(self.multipart_directory(upload_id)):
+            if entry.name.isdigit():
+                stat = entry.stat()
+                parts.append({"part_number": int(entry.name), "etag": self.part_etag(stat), "size": stat.st_size})
+        return sorted(parts, key=lambda part: part["part_number"])
+
+    def complete_multipart_upload(self, bucket: str, filename: str, upload_id: str, parts: list[tuple[int, str]]):
+        path = self.object_path(bucket, filename)
+        directory = self.multipart_directory(upload_id)
+        current = {part["part_number"]: part["etag"] for part in self.list_parts(bucket, filename, upload_id)}
+
+        temporary, file = self.open_temporary(path)
+        try:
+            with file:
+                for part_number, etag in parts:
+                    if current.get(part_number) != etag:
+                        raise ValueError(f"Part {part_number} is missing or was replaced")
+                    with open(os.path.join(directory, f"{part_number:05d}"), "rb") as part:
+                        shutil.copyfileobj(part, file, LOCAL_WRITE_CHUNK_SIZE)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self.publish(temporary, path)
+        shutil.rmtree(directory, ignore_errors=True)
+
+    def abort_multipart_upload(self, bucket: str, filename: str, upload_id: str):
+        shutil.rmtree(self.multipart_directory(upload_id), ignore_errors=True)
+
+
+@lru_cache(maxsize=None)
+def get_storage_backend() -> StorageBackend:
+    """Return the backend selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "local":
+        return LocalStorageBackend(LOCAL_STORAGE_DIR)
+    return SupabaseStorageBackend()
+
+
+def storage_duration(operation: str):
+    return OUTBOUND_REQUEST_DURATION.labels(service=get_storage_backend().name, operation=operation).time()
+
+
+async def upload_to_storage(
         file: UploadFile,
         filename: str,
         bucket: str = "videos"
 ) -> str:
     """
-    Upload a file to Supabase Storage
+    Upload a file to Storage
 
     Args:
         file: UploadFile object from FastAPI
         filename: Name to save the file as
-        bucket: Supabase storage bucket name (default: "videos")
+        bucket: Storage bucket name (default: "videos")
 
     Returns:
         str: Public URL of the uploaded file
@@ -25,43 +525,30 @@ async def upload_to_supabase_storage(
     Raises:
         Exception: If upload fails
     """
-    try:
-        # Read file content
-        file_content = await file.read()
+    file_content = await file.read()
+    return await asyncio.to_thread(
+        upload_file_to_storage,
+        file=file_content,
+        filename=filename,
+        content_type=file.content_type or "application/octet-stream",
+        bucket=bucket
+    )
 
-        # Upload to Supabase Storage
-        response = supabase.storage.from_(bucket).upload(
-            path=filename,
-            file=file_content,
-            file_options={
-                "content-type": file.content_type or "application/octet-stream",
-                "upsert": "false"  # Don't overwrite existing files
-            }
-        )
 
-        # Get public URL
-        public_url = supabase.storage.from_(bucket).get_public_url(filename)
-
-        return public_url
-
-    except Exception as e:
-        raise Exception(f"Failed to upload to Supabase Storage: {str(e)}")
-
-
-def upload_file_to_supabase_storage(
+def upload_file_to_storage(
         file,
         filename: str,
         content_type: str = "application/octet-stream",
         bucket: str = "videos"
 ) -> str:
     """
-    Upload file content (bytes) to Supabase Storage
+    Upload file content (bytes) to Storage
 
     Args:
-        file_content: File content as bytes
+        file: File content as bytes
         filename: Name to save the file as
         content_type: MIME type of the file
-        bucket: Supabase storage bucket name (default: "videos")
+        bucket: Storage bucket name (default: "videos")
 
     Returns:
         str: Public URL of the uploaded file
@@ -69,60 +556,280 @@ def upload_file_to_supabase_storage(
     Raises:
         Exception: If upload fails
     """
+    backend = get_storage_backend()
     try:
-        # Upload to Supabase Storage
-        response = supabase.storage.from_(bucket).upload(
-            path=filename,
-            file=file,
-            file_options={
-                "content-type": content_type,
-                "upsert": "false"  # Don't overwrite existing files
-            }
-        )
+        with storage_duration("upload"):
+            backend.upload(bucket, filename, file, content_type)
+        return backend.public_url(bucket, filename)
 
-        # Get public URL
-        public_url = supabase.storage.from_(bucket).get_public_url(filename)
+    except Exception as e:
+        raise Exception(f"Failed to upload to Storage: {str(e)}")
 
-        return public_url
 
-    except Exception as e:
-        raise Exception(f"Failed to upload to Supabase Storage: {str(e)}")
+async def delete_from_storage(file_path: str, bucket: str = "videos") -> bool:
+    return await asyncio.to_thread(remove_from_storage, [file_path], bucket)
 
 
-async def delete_from_supabase_storage(file_path: str, bucket: str = "videos") -> bool:
-    try:
-        if file_path.startswith("http"):
-            filename = file_path.split("/")[-1]
-        else:
-            filename = file_path
+def remove_from_storage(file_paths: list[str], bucket: str = "videos") -> bool:
+    """
+    Delete several files of a bucket, with one Storage request per 1000 files on Supabase
+
+    Sync, call it through asyncio.to_thread from async code.
 
-        supabase.storage.from_(bucket).remove([filename])
+    Args:
+        file_paths: Public URLs or object names of the files
+        bucket: Storage bucket name (default: "videos")
 
+    Returns:
+        bool: True if the request succeeded (files that don't exist are not an error)
+    """
+    filenames = [object_name(path) for path in file_paths]
+    if not filenames:
+        return True
+
+    try:
+        with storage_duration("remove"):
+            get_storage_backend().remove(bucket, filenames)
         return True
 
     except Exception as e:
-        print(f"Error deleting file from Supabase Storage: {str(e)}")
+        print(f"Error deleting files from Storage: {str(e)}")
         return False
 
 
+def list_storage(bucket: str, limit: int = 1000, offset: int = 0) -> list[dict]:
+    """
+    List one page of the objects at the root of a bucket, sorted by name
+
+    Sync, call it through asyncio.to_thread from async code.
+
+    Args:
+        bucket: Storage bucket name
+        limit: Page size
+        offset: Number of objects to skip
+
+    Returns:
+        list[dict]: Objects with "name", "created_at" and "metadata" (including "size")
+    """
+    with storage_duration("list"):
+        return get_storage_backend().list_objects(bucket, limit, offset)
+
+
 def get_file_url(filename: str, bucket: str = "videos") -> str:
-    return supabase.storage.from_(bucket).get_public_url(filename)
+    return get_storage_backend().public_url(bucket, filename)
+
+
+def head_object(filename: str, bucket: str = "videos") -> dict | None:
+    """
+    Return the size and content type of an object without downloading it
+
+    Sync, call it through asyncio.to_thread from async code.
+
+    Returns:
+        dict | None: "size" and "content_type", or None if the object doesn't exist
+    """
+    with storage_duration("head"):
+        return get_storage_backend().head(bucket, filename)
+
+
+def download_from_storage(filename: str, destination: str, bucket: str = "videos"):
+    """
+    Download an object to a local file, streamed to disk
+
+    Sync, call it through asyncio.to_thread from async code.
+
+    Raises:
+        Exception: If the download fails
+    """
+    with storage_duration("download"):
+        get_storage_backend().download(bucket, filename, destination)
+
+
+def replace_in_storage(source: str, filename: str, content_type: str, bucket: str = "videos"):
+    """
+    Overwrite an existing object with the content of a local file
+
+    The object's URL stays the same. Sync, call it through asyncio.to_thread from async code.
+
+    Raises:
+        Exception: If the upload fails
+    """
+    with storage_duration("replace"):
+        get_storage_backend().replace(bucket, filename, source, content_type)
+
+
+def get_probe_source(filename: str, bucket: str = "videos") -> str:
+    """Return the URL (or local path) media tools such as ffprobe can read the object from"""
+    return get_storage_backend().probe_source(bucket, filename)
+
+
+def create_upload_url(filename: str, bucket: str = "videos", expires_in: int = UPLOAD_URL_EXPIRES_IN) -> str:
+    """
+    Return a URL the client can PUT the object's content to, without credentials
+
+    Sync, call it through asyncio.to_thread from async code.
+
+    Raises:
+        Exception: If signing fails
+    """
+    with storage_duration("sign_upload"):
+        return get_storage_backend().upload_url(bucket, filename, expires_in)
+
+
+def create_multipart_upload(filename: str, content_type: str, bucket: str = "videos") -> str:
+    """
+    Start a multipart upload of an object
 
+    Sync, call it through asyncio.to_thread from async code.
+
+    Returns:
+        str: Upload ID of the storage backend
+
+    Raises:
+        Exception: If the backend refuses it (or, on Supabase, S3 access keys aren't configured)
+    """
+    with storage_duration("multipart_create"):
+        return get_storage_backend().create_multipart_upload(bucket, filename, content_type)
+
+
+def create_part_upload_urls(
+        filename: str,
+        upload_id: str,
+        part_numbers: list[int],
+        expires_in: int,
+        bucket: str = "videos"
+) -> dict[int, str]:
+    """Return a URL the client can PUT each part's content to, without credentials"""
+    backend = get_storage_backend()
+    return {
+        part_number: backend.part_upload_url(bucket, filename, upload_id, part_number, expires_in)
+        for part_number in part_numbers
+    }
+
+
+def list_upload_parts(filename: str, upload_id: str, bucket: str = "videos") -> list[dict]:
+    """
+    List the parts of a multipart upload found in storage
+
+    Sync, call it through asyncio.to_thread from async code.
+
+    Returns:
+        list[dict]: Parts with "part_number", "etag" and "size"
+    """
+    with storage_duration("multipart_list"):
+        return get_storage_backend().list_parts(bucket, filename, upload_id)
+
+
+def complete_multipart_upload(filename: str, upload_id: str, parts: list[tuple[int, str]], bucket: str = "videos"):
+    """
+    Assemble the parts, given as (part number, ETag) in order, into the object
+
+    Sync, call it through asyncio.to_thread from async code.
+    """
+    with storage_duration("multipart_complete"):
+        get_storage_backend().complete_multipart_upload(bucket, filename, upload_id, parts)
+
+
+def abort_multipart_upload(filename: str, upload_id: str, bucket: str = "videos"):
+    """
+    Discard a multipart upload and its parts
+
+    Sync, call it through asyncio.to_thread from async code.
+    """
+    with storage_duration("multipart_abort"):
+        get_storage_backend().abort_multipart_upload(bucket, filename, upload_id)
+
+
+def with_download_name(signed_url: str, filename: str) -> str:
+    separator = "&" if "?" in signed_url else "?"
+    return f"{signed_url}{separator}download={filename}"
+
+
+def get_cached_signed_url(bucket: str, filename: str, expires_in: int) -> str | None:
+    # Keyed by lifetime too, so a caller asking for a short-lived URL never gets a longer-lived one
+    cached = _signed_url_cache.get((bucket, filename, expires_in))
+    if cached and cached[0] - SIGNED_URL_REFRESH_MARGIN > time.monotonic():
+        return cached[1]
+    return None
+
+
+def cache_signed_url(bucket: str, filename: str, signed_url: str, expires_in: int):
+    # Re-inserting moves the key to the end, so the first key is always the oldest
+    key = (bucket, filename, expires_in)
+    _signed_url_cache.pop(key, None)
+    _signed_url_cache[key] = (time.monotonic() + expires_in, signed_url)
+    while len(_signed_url_cache) > SIGNED_URL_CACHE_SIZE:
+        del _signed_url_cache[next(iter(_signed_url_cache))]
+
+
+async def create_signed_url(filename: str, expires_in: int = SIGNED_URL_EXPIRES_IN, bucket: str = "videos") -> str:
+    """
+    Return a signed download URL, reusing a cached one until shortly before it expires
+
+    Args:
+        filename: Object name in the bucket
+        expires_in: Lifetime of a newly signed URL in seconds
+        bucket: Storage bucket name (default: "videos")
+
+    Returns:
+        str: Signed URL that downloads the object as `filename`
+
+    Raises:
+        Exception: If signing fails
+    """
+    cached = get_cached_signed_url(bucket, filename, expires_in)
+    if cached:
+        return cached
 
-async def create_signed_url(filename: str, expires_in: int = 3600, bucket: str = "videos") -> str:
     try:
-        response = supabase.storage.from_(bucket).create_signed_url(
-            path=filename,
-            expires_in=expires_in
-        )
-        signed = response["signedURL"]
+        with storage_duration("sign"):
+            response = await asyncio.to_thread(get_storage_backend().sign, bucket, [filename], expires_in)
+        signed = with_download_name(response[filename], filename)
+
+        cache_signed_url(bucket, filename, signed, expires_in)
+        return signed
 
-        if "?" in signed:
-            signed += f"&download={filename}"
+    except Exception as e:
+        raise Exception(f"Failed to create signed URL: {str(e)}")
+
+
+async def create_signed_urls(filenames: list[str], expires_in: int = SIGNED_URL_EXPIRES_IN, bucket: str = "videos") -> dict[str, str]:
+    """
+    Return signed download URLs of several objects, signing the uncached ones in one request
+
+    Args:
+        filenames: Object names in the bucket
+        expires_in: Lifetime of newly signed URLs in seconds
+        bucket: Storage bucket name (default: "videos")
+
+    Returns:
+        dict[str, str]: Signed URL per object name (objects that couldn't be signed are left out)
+
+    Raises:
+        Exception: If signing fails
+    """
+    signed_urls = {}
+    missing = []
+    for filename in dict.fromkeys(filenames):
+        cached = get_cached_signed_url(bucket, filename, expires_in)
+        if cached:
+            signed_urls[filename] = cached
         else:
-            signed += f"?download={filename}"
+            missing.append(filename)
 
-        return signed
+    if not missing:
+        return signed_urls
+
+    try:
+        with storage_duration("sign_batch"):
+            response = await asyncio.to_thread(get_storage_backend().sign, bucket, missing, expires_in)
 
     except Exception as e:
-        raise Exception(f"Failed to create signed URL: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to create signed URLs: {str(e)}")
+
+    for filename, signed_url in response.items():
+        signed = with_download_name(signed_url, filename)
+        cache_signed_url(bucket, filename, signed, expires_in)
+        signed_urls[filename] = signed
+
+    return signed_urls
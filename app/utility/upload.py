@@ -0,0 +1,87 @@
+import asyncio
+from fastapi import HTTPException, status
+from app.utility.storage import head_object, get_probe_source
+from app.utility.video import probe_video, is_faststart
+
+# Content types a video upload may be stored with (octet-stream when the client didn't send one)
+ACCEPTED_CONTENT_TYPES = ("video/", "application/octet-stream")
+
+
+async def verify_uploaded_video(filename: str, bucket: str = "videos", expected_size: int | None = None) -> dict:
+    """
+    Check that an uploaded object is a complete, playable video
+
+    Runs before anything is charged or sent to RunPod. The HEAD request catches missing, empty,
+    truncated and non-video uploads cheaply; ffprobe then reads only the container headers
+    through HTTP Range requests.
+
+    Args:
+        filename: Object name in the bucket
+        bucket: Storage bucket name (default: "videos")
+        expected_size: Size announced by the client (multipart uploads), if any
+
+    Returns:
+        dict: Metadata to store on the video ("size_bytes", "content_type", "duration",
+            "video_codec", "audio_codec", "width", "height", "faststart")
+
+    Raises:
+        HTTPException: 404 if the object doesn't exist, 415 for a non-video content type,
+            422 if it is truncated or not a playable video, 503 if it can't be checked right now
+    """
+    try:
+        info = await asyncio.to_thread(head_object, filename, bucket)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid filename"
+        )
+    except Exception as e:
+        print(f"Error checking uploaded file {filename}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not check the uploaded file, try again"
+        )
+
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Uploaded file not found"
+        )
+
+    if info["size"] == 0 or (expected_size is not None and info["size"] != expected_size):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Uploaded file is incomplete"
+        )
+
+    content_type = (info["content_type"] or "").split(";")[0].strip().lower() or None
+    if content_type and not content_type.startswith(ACCEPTED_CONTENT_TYPES):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Uploaded file is not a video ({content_type})"
+        )
+
+    source = get_probe_source(filename, bucket)
+    try:
+        probe = await asyncio.to_thread(probe_video, source)
+    except ValueError as e:
+        print(f"Uploaded file {filename} failed probing: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Uploaded file is not a playable video"
+        )
+    except RuntimeError as e:
+        print(f"Error probing uploaded file {filename}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not check the uploaded file, try again"
+        )
+
+    # A video stored with its moov atom last is remuxed by app/service/videoRemuxer.py
+    try:
+        faststart = await asyncio.to_thread(is_faststart, source)
+    except Exception as e:
+        print(f"Error checking the atom layout of {filename}: {str(e)}")
+        faststart = None
+
+    return {"size_bytes": info["size"], "content_type": content_type, "faststart": faststart, **probe}
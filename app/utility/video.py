@@ -1,9 +1,29 @@
 """
 Video processing utilities using FFmpeg
 """
+import json
+import struct
 import subprocess
 import os
+import tempfile
+from functools import partial
 from pathlib import Path
+from app.utility.http import http_session
+from app.utility.metrics import MEDIA_TOOL_DURATION
+
+PROBE_TIMEOUT = 30  # seconds
+PROBE_READ_TIMEOUT = 10 * 1000 * 1000  # microseconds ffprobe waits for a single network read
+PROBE_SIZE = 5 * 1024 * 1024  # bytes ffprobe may read to identify the streams
+REMUX_TIMEOUT = 10 * 60  # seconds, a stream copy is bound by disk throughput
+ATOM_READ_TIMEOUT = 10  # seconds per Range request when scanning a remote file
+ATOM_SCAN_LIMIT = 32  # top-level atoms read before giving up on finding moov/mdat
+
+# Top-level atoms an MP4/QuickTime file may start with
+MP4_LEADING_ATOMS = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pdin", b"uuid"}
+
+# Containers media tools may open for user-supplied files. Playlist formats (HLS, concat, ...)
+# are excluded: a playlist uploaded as a video would make them fetch whatever URLs it lists.
+UNTRUSTED_INPUT_FORMATS = "mov,mp4,m4a,3gp,3g2,mj2,matroska,webm"
 
 
 def check_ffmpeg_installed() -> bool:
@@ -69,12 +89,13 @@ def generate_thumbnail(
         ]
 
         # Run FFmpeg
-        result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
+        with MEDIA_TOOL_DURATION.labels(tool="ffmpeg", operation="thumbnail").time():
+            result = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
 
         # Check if thumbnail was created
         if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
@@ -180,12 +201,13 @@ def get_video_duration(video_path: str) -> float:
             video_path
         ]
 
-        result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
+        with MEDIA_TOOL_DURATION.labels(tool="ffprobe", operation="duration").time():
+            result = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
 
         duration = float(result.stdout.decode().strip())
         return duration
@@ -221,12 +243,13 @@ def get_video_info(video_path: str) -> dict:
             video_path
         ]
 
-        result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
+        with MEDIA_TOOL_DURATION.labels(tool="ffprobe", operation="info").time():
+            result = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
 
         import json
         data = json.loads(result.stdout.decode())
@@ -253,4 +276,221 @@ def get_video_info(video_path: str) -> dict:
 
     except Exception as e:
         print(f"Error getting video info: {str(e)}")
-        return {}
\ No newline at end of file
+        return {}
+
+
+def untrusted_input_options(source: str) -> list[str]:
+    """
+    Input options limiting FFmpeg/FFprobe to video containers and the source's own protocol
+
+    Args:
+        source: Path or URL of the input
+
+    Returns:
+        list[str]: Options to put before the input
+    """
+    if source.startswith("https:"):
+        protocols = "https,tls,tcp"
+    elif source.startswith("http:"):
+        # Local storage stand-ins in development and the benchmarks
+        protocols = "http,tcp"
+    else:
+        protocols = "file"
+    return ["-format_whitelist", UNTRUSTED_INPUT_FORMATS, "-protocol_whitelist", protocols]
+
+
+def probe_video(source: str) -> dict:
+    """
+    Probe the container and streams of a video without decoding it
+
+    `source` may be a URL: ffprobe then reads only the container headers with HTTP Range
+    requests (seeking to the end for an MP4 whose index is stored last), not the whole file.
+
+    Args:
+        source: Path or URL of the video
+
+    Returns:
+        dict: "duration" (seconds), "video_codec", "audio_codec", "width" and "height"
+
+    Raises:
+        ValueError: If the file isn't a video with a duration (truncated, not a video, ...)
+        RuntimeError: If ffprobe is missing or timed out
+    """
+    command = ["ffprobe", "-v", "error"]
+    if source.startswith("http"):
+        command += ["-rw_timeout", str(PROBE_READ_TIMEOUT)]
+    command += [
+        *untrusted_input_options(source),
+        "-probesize", str(PROBE_SIZE),
+        "-show_entries", "format=duration:stream=codec_type,codec_name,width,height",
+        "-of", "json",
+        source
+    ]
+
+    try:
+        with MEDIA_TOOL_DURATION.labels(tool="ffprobe", operation="probe").time():
+            result = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=PROBE_TIMEOUT
+            )
+    except FileNotFoundError:
+        raise RuntimeError("FFprobe is not installed")
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"FFprobe did not finish within {PROBE_TIMEOUT}s")
+
+    if result.returncode != 0:
+        raise ValueError(result.stderr.decode(errors="replace").strip() or "FFprobe failed")
+
+    data = json.loads(result.stdout.decode() or "{}")
+    streams = data.get("streams", [])
+    video_stream = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
+    audio_stream = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+
+    try:
+        duration = float(data.get("format", {}).get("duration", 0))
+    except ValueError:
+        duration = 0
+    if not video_stream or duration <= 0:
+        raise ValueError("No video stream with a duration")
+
+    return {
+        "duration": duration,
+        "video_codec": video_stream.get("codec_name"),
+        "audio_codec": audio_stream.get("codec_name") if audio_stream else None,
+        "width": video_stream.get("width"),
+        "height": video_stream.get("height"),
+    }
+
+
+def read_file_range(path: str, offset: int, length: int) -> bytes:
+    with open(path, "rb") as file:
+        file.seek(offset)
+        return file.read(length)
+
+
+def read_url_range(url: str, offset: int, length: int) -> bytes:
+    response = http_session.get(
+        url,
+        headers={"Range": f"bytes={offset}-{offset + length - 1}"},
+        timeout=ATOM_READ_TIMEOUT
+    )
+    if response.status_code == 416:
+        return b""
+    response.raise_for_status()
+    if response.status_code != 206 and offset > 0:
+        raise RuntimeError("Server ignored the Range request")
+    return response.content[:length]
+
+
+def is_faststart(source: str) -> bool | None:
+    """
+    Check whether the index (moov atom) of an MP4 comes before its media data (mdat atom)
+
+    Only the 8 or 16 byte header of each top-level atom is read, so for a URL this is a few
+    small Range requests whatever the size of the file.
+
+    Args:
+        source: Path or URL of the video
+
+    Returns:
+        bool | None: True if moov comes first, False if mdat does (the player has to fetch the
+            end of the file before it can start), None if it isn't an MP4 (WebM, MKV, ...)
+            or has no moov
+    """
+    read = partial(read_url_range if source.startswith("http") else read_file_range, source)
+
+    offset = 0
+    for index in range(ATOM_SCAN_LIMIT):
+        header = read(offset, 16)
+        if len(header) < 8:
+            return None
+        size, kind = struct.unpack(">I4s", header[:8])
+        if index == 0 and kind not in MP4_LEADING_ATOMS:
+            return None
+        if kind == b"moov":
+            return True
+        if kind == b"mdat":
+            return False
+        if size == 1:
+            # 64-bit size follows the type
+            if len(header) < 16:
+                return None
+            size = struct.unpack(">Q", header[8:16])[0]
+        if size < 8:
+            # 0 means the atom runs to the end of the file, so there is no moov after it
+            return None
+        offset += size
+    return None
+
+
+def remux_faststart(input_path: str, output_path: str):
+    """
+    Rewrite an MP4 with its moov atom first, copying the streams without re-encoding
+
+    Raises:
+        ValueError: If FFmpeg couldn't remux the file
+        RuntimeError: If FFmpeg is missing or timed out
+    """
+    command = [
+        "ffmpeg",
+        "-v", "error",
+        *untrusted_input_options(input_path),
+        "-i", input_path,
+        "-map", "0",
+        "-c", "copy",
+        "-movflags", "+faststart",
+        "-y",
+        output_path
+    ]
+
+    try:
+        with MEDIA_TOOL_DURATION.labels(tool="ffmpeg", operation="faststart").time():
+            result = subprocess.run(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=REMUX_TIMEOUT
+            )
+    except FileNotFoundError:
+        raise RuntimeError("FFmpeg is not installed")
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"FFmpeg did not finish within {REMUX_TIMEOUT}s")
+
+    if result.returncode != 0:
+        raise ValueError(result.stderr.decode(errors="replace").strip() or "FFmpeg failed")
+
+
+def ensure_faststart(video_path: str) -> bool | None:
+    """
+    Remux a local MP4 in place if its moov atom comes after the media data
+
+    The remuxed copy is written next to the file and moved over it, so the file is never
+    left half written.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        bool | None: True if the file is (now) fast-start, None if it isn't an MP4
+
+    Raises:
+        ValueError: If FFmpeg couldn't remux the file
+        RuntimeError: If FFmpeg is missing or timed out
+    """
+    faststart = is_faststart(video_path)
+    if faststart is not False:
+        return faststart
+
+    directory, name = os.path.split(video_path)
+    descriptor, remuxed_path = tempfile.mkstemp(prefix=".faststart-", suffix=Path(name).suffix, dir=directory or None)
+    os.close(descriptor)
+    try:
+        remux_faststart(video_path, remuxed_path)
+        os.replace(remuxed_path, video_path)
+    except BaseException:
+        if os.path.exists(remuxed_path):
+            os.unlink(remuxed_path)
+        raise
+    return True
@@ -1,8 +1,11 @@
 from pathlib import Path
-import yt_dlp
+from app.utility.metrics import MEDIA_TOOL_DURATION
 
 
 def download_youtube_video(youtube_id: str, output_path: Path, quality: str = "720p") -> tuple[str, str]:
+    # yt_dlp takes a long time to import, load it only when a download is requested
+    import yt_dlp
+
     youtube_url = f"https://www.youtube.com/watch?v={youtube_id}"
     output_template = str(output_path / f"{youtube_id}.%(ext)s")
 
@@ -24,11 +27,13 @@ def download_youtube_video(youtube_id: str, output_path: Path, quality: str = "7
 
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(youtube_url, download=False)
+            with MEDIA_TOOL_DURATION.labels(tool="yt-dlp", operation="extract_info").time():
+                info = ydl.extract_info(youtube_url, download=False)
             video_title = info.get('title', 'Unknown')
 
             # 다운로드
-            ydl.download([youtube_url])
+            with MEDIA_TOOL_DURATION.labels(tool="yt-dlp", operation="download").time():
+                ydl.download([youtube_url])
 
             # 다운로드된 파일 찾기
             downloaded_files = list(output_path.glob(f"{youtube_id}.*"))
@@ -1,13 +1,41 @@
+import os
+import tempfile
 import uvicorn
 from app.application import application
-from app.config.environments import PORT
+from app.config.environments import PORT, ENVIRONMENT, WEB_CONCURRENCY, GRACEFUL_SHUTDOWN_TIMEOUT
 
 app = application
 
-if __name__ == "__main__":
+
+def run_production():
+    """
+    Run WEB_CONCURRENCY worker processes with uvloop and httptools.
+    Singleton background services are leader-elected (see app/service/leader.py),
+    so they run in exactly one worker.
+    """
+    # Workers are spawned as fresh processes and inherit this, so their metrics are aggregated
+    if WEB_CONCURRENCY > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="l2s-metrics-")
+
     uvicorn.run(
-        application,
+        "app.application:application",
         host="0.0.0.0",
         port=PORT,
-        reload=False
+        workers=WEB_CONCURRENCY,
+        loop="uvloop",
+        http="httptools",
+        proxy_headers=True,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT
     )
+
+
+if __name__ == "__main__":
+    if ENVIRONMENT == "production":
+        run_production()
+    else:
+        uvicorn.run(
+            application,
+            host="0.0.0.0",
+            port=PORT,
+            reload=False
+        )
@@ -0,0 +1,3 @@
+-- user-034: jobs can be cancelled by their owner
+-- SQLAlchemy stores JobStatus by member name in the "jobstatus" enum type
+ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'CANCELLED';
@@ -0,0 +1,2 @@
+-- user-035: jobs remember the RunPod endpoint they were dispatched to
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS runpod_endpoint VARCHAR;
@@ -0,0 +1,3 @@
+-- user-036: scheduling weight of a user's jobs (0 = default tier)
+ALTER TABLE users ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS ix_jobs_status_user_created ON jobs (status, user_id, created_at);
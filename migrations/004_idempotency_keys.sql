@@ -0,0 +1,15 @@
+-- user-037: Idempotency-Key support for /runpod/summarize and /video/upload/done
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    endpoint VARCHAR NOT NULL,
+    key VARCHAR NOT NULL,
+    request_hash VARCHAR NOT NULL,
+    status_code INTEGER,
+    response JSON,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    CONSTRAINT uq_idempotency_keys_user_endpoint_key UNIQUE (user_id, endpoint, key)
+);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_id ON idempotency_keys (id);
+CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys (expires_at);
@@ -0,0 +1,18 @@
+-- user-038: append-only credit ledger, compacted into users.credit in the background
+CREATE TYPE creditentrytype AS ENUM ('GRANT', 'SPEND', 'RESERVE', 'SETTLE', 'RELEASE');
+
+CREATE TABLE IF NOT EXISTS credit_ledger (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    job_id INTEGER,
+    entry_type creditentrytype NOT NULL,
+    amount INTEGER NOT NULL,
+    compacted BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_credit_ledger_job_reserve
+    ON credit_ledger (job_id) WHERE entry_type = 'RESERVE';
+CREATE UNIQUE INDEX IF NOT EXISTS ux_credit_ledger_job_settlement
+    ON credit_ledger (job_id) WHERE entry_type IN ('SETTLE', 'RELEASE');
+CREATE INDEX IF NOT EXISTS ix_credit_ledger_user_uncompacted
+    ON credit_ledger (user_id) WHERE NOT compacted;
@@ -0,0 +1,3 @@
+-- user-039: RunPod queue delay and execution time reported by the webhook
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queue_ms INTEGER;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS execution_ms INTEGER;
@@ -0,0 +1,3 @@
+-- user-041: videos are soft-deleted and purged in the background
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE;
+CREATE INDEX IF NOT EXISTS ix_videos_deleted_at ON videos (deleted_at) WHERE deleted_at IS NOT NULL;
@@ -0,0 +1,18 @@
+-- user-043: withdrawn accounts are purged in the background, resumable by stage
+CREATE TYPE accountpurgestage AS ENUM ('CANCEL_JOBS', 'VIDEOS', 'JOBS', 'ACCOUNT', 'DONE');
+
+CREATE TABLE IF NOT EXISTS account_purges (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL UNIQUE,
+    stage accountpurgestage NOT NULL,
+    videos_purged INTEGER NOT NULL DEFAULT 0,
+    jobs_purged INTEGER NOT NULL DEFAULT 0,
+    files_removed INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error VARCHAR,
+    locked_until TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS ix_account_purges_id ON account_purges (id);
@@ -0,0 +1,30 @@
+-- user-047: resumable multipart uploads of source videos
+CREATE TYPE uploadsessionstatus AS ENUM ('UPLOADING', 'COMPLETED', 'ABORTED');
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id VARCHAR PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    video_uuid VARCHAR NOT NULL,
+    bucket VARCHAR NOT NULL,
+    filename VARCHAR NOT NULL,
+    content_type VARCHAR NOT NULL,
+    storage_upload_id VARCHAR NOT NULL,
+    size BIGINT NOT NULL,
+    part_size INTEGER NOT NULL,
+    part_count INTEGER NOT NULL,
+    status uploadsessionstatus NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_user_id ON upload_sessions (user_id);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_expires_at ON upload_sessions (expires_at);
+
+CREATE TABLE IF NOT EXISTS upload_parts (
+    session_id VARCHAR NOT NULL REFERENCES upload_sessions (id) ON DELETE CASCADE,
+    part_number INTEGER NOT NULL,
+    etag VARCHAR NOT NULL,
+    size BIGINT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (session_id, part_number)
+);
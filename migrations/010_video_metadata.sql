@@ -0,0 +1,8 @@
+-- user-048: uploads are verified before they are accepted, with their probed metadata stored
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS size_bytes BIGINT;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS content_type VARCHAR;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS duration DOUBLE PRECISION;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS video_codec VARCHAR;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS audio_codec VARCHAR;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS width INTEGER;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS height INTEGER;
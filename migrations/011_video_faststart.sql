@@ -0,0 +1,3 @@
+-- user-049: MP4s are remuxed so their index (moov atom) comes before the media data
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS faststart BOOLEAN;
+CREATE INDEX IF NOT EXISTS ix_videos_faststart_pending ON videos (id) WHERE faststart = false;
@@ -0,0 +1,11 @@
+-- user-050: completed results are packaged into an HLS ladder for adaptive streaming
+CREATE TYPE hlsstatus AS ENUM ('PENDING', 'PROCESSING', 'READY', 'FAILED');
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS hls_status hlsstatus;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS hls_url VARCHAR;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS hls_files VARCHAR[];
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS hls_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS hls_started_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS ix_jobs_hls_status_pending ON jobs (hls_status, completed_at)
+    WHERE hls_status IN ('PENDING', 'PROCESSING');
@@ -0,0 +1,115 @@
+"""
+Local stand-in for a RunPod serverless endpoint, used by the offline benchmark.
+
+Implements /run, /status/{id}, /cancel/{id} and /health. Jobs that carry a webhook_url are
+"processed" for FAKE_RUNPOD_DELAY seconds and then reported to the webhook the same way the
+real worker does. The latency of every webhook call is kept and exposed at /_stats.
+
+    uvicorn fake_runpod:app --app-dir test/benchmark --port 9101
+"""
+import asyncio
+import os
+import random
+import time
+import uuid
+import httpx
+from fastapi import FastAPI, Request
+
+FAKE_RUNPOD_DELAY = float(os.getenv("FAKE_RUNPOD_DELAY", "0.5"))
+FAKE_RUNPOD_FAILURE_RATE = float(os.getenv("FAKE_RUNPOD_FAILURE_RATE", "0"))
+FAKE_STORAGE_URL = os.getenv("FAKE_STORAGE_URL", "http://127.0.0.1:9102")
+
+app = FastAPI(title="Fake RunPod")
+
+jobs: dict[str, dict] = {}
+webhook_latencies: list[float] = []
+webhook_errors = 0
+_tasks: set[asyncio.Task] = set()
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=30)
+    return _client
+
+
+async def process(job_id: str, webhook_url: str):
+    global webhook_errors
+    job = jobs[job_id]
+    queued_at = job["queued_at"]
+
+    job["status"] = "IN_PROGRESS"
+    started_at = time.time()
+    await asyncio.sleep(FAKE_RUNPOD_DELAY)
+
+    if job["status"] == "CANCELLED":
+        return
+
+    failed = random.Random(job_id).random() < FAKE_RUNPOD_FAILURE_RATE
+    job["status"] = "FAILED" if failed else "COMPLETED"
+
+    payload = {
+        "id": job_id,
+        "status": "failed" if failed else "completed",
+        "result_url": None if failed else f"{FAKE_STORAGE_URL}/storage/v1/object/public/outputs/{job_id}.mp4",
+        "error": "Simulated failure" if failed else None,
+        "delayTime": int((started_at - queued_at) * 1000),
+        "executionTime": int((time.time() - started_at) * 1000),
+    }
+
+    start = time.perf_counter()
+    try:
+        response = await get_client().post(webhook_url, json=payload)
+        response.raise_for_status()
+        webhook_latencies.append(time.perf_counter() - start)
+    except Exception:
+        webhook_errors += 1
+
+
+@app.post("/run")
+async def run(request: Request):
+    body = await request.json()
+    job_input = body.get("input", {})
+    job_id = str(uuid.uuid4())
+    jobs[job_id] = {"status": "IN_QUEUE", "queued_at": time.time()}
+
+    webhook_url = job_input.get("webhook_url")
+    if webhook_url:
+        task = asyncio.create_task(process(job_id, webhook_url))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+    else:
+        jobs[job_id]["status"] = "COMPLETED"
+
+    return {"id": job_id, "status": "IN_QUEUE"}
+
+
+@app.get("/status/{job_id}")
+async def job_status(job_id: str):
+    job = jobs.get(job_id)
+    return {"id": job_id, "status": job["status"] if job else "NOT_FOUND"}
+
+
+@app.post("/cancel/{job_id}")
+async def cancel(job_id: str):
+    job = jobs.get(job_id)
+    if job and job["status"] in ("IN_QUEUE", "IN_PROGRESS"):
+        job["status"] = "CANCELLED"
+    return {"id": job_id, "status": job["status"] if job else "NOT_FOUND"}
+
+
+@app.get("/health")
+async def health():
+    in_queue = sum(1 for job in jobs.values() if job["status"] == "IN_QUEUE")
+    in_progress = sum(1 for job in jobs.values() if job["status"] == "IN_PROGRESS")
+    return {
+        "jobs": {"inQueue": in_queue, "inProgress": in_progress},
+        "workers": {"idle": 1, "running": in_progress},
+    }
+
+
+@app.get("/_stats")
+async def stats():
+    return {"webhook_latencies": webhook_latencies, "webhook_errors": webhook_errors}
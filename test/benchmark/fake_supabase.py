@@ -0,0 +1,142 @@
+"""
+Local stand-in for the Supabase Storage REST API, used by the offline benchmark.
+
+Objects are kept in memory. Implements the endpoints the backend and supabase-py use:
+signed upload URLs, uploads, removal, (batch) signed download URLs, listing and
+public object reads with Range support.
+
+    uvicorn fake_supabase:app --app-dir test/benchmark --port 9102
+"""
+import time
+import uuid
+from datetime import datetime, UTC
+from fastapi import FastAPI, Request, Response, HTTPException
+
+app = FastAPI(title="Fake Supabase Storage")
+
+# (bucket, path) -> {"data", "content_type", "created_at"}
+objects: dict[tuple[str, str], dict] = {}
+
+
+async def read_upload(request: Request) -> tuple[bytes, str]:
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        file = form.get("file")
+        return await file.read(), file.content_type or "application/octet-stream"
+    return await request.body(), content_type
+
+
+def store(bucket: str, path: str, data: bytes, content_type: str) -> dict:
+    objects[(bucket, path)] = {"data": data, "content_type": content_type, "created_at": time.time()}
+    return {"Key": f"{bucket}/{path}", "Id": str(uuid.uuid4())}
+
+
+def serve(bucket: str, path: str, request: Request, head: bool = False) -> Response:
+    obj = objects.get((bucket, path))
+    if obj is None:
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    data = obj["data"]
+    headers = {"Accept-Ranges": "bytes", "Content-Type": obj["content_type"]}
+    status_code = 200
+
+    range_header = request.headers.get("range")
+    if range_header and range_header.startswith("bytes="):
+        start_text, end_text = range_header[len("bytes="):].split(",")[0].split("-")
+        if start_text:
+            start = int(start_text)
+            end = min(int(end_text), len(data) - 1) if end_text else len(data) - 1
+        else:
+            start = max(0, len(data) - int(end_text))
+            end = len(data) - 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        data = data[start:end + 1]
+        status_code = 206
+
+    headers["Content-Length"] = str(len(data))
+    return Response(content=b"" if head else data, status_code=status_code, headers=headers)
+
+
+@app.get("/storage/v1/bucket")
+async def list_buckets():
+    buckets = sorted({bucket for bucket, _ in objects} | {"videos", "thumbnails", "outputs"})
+    return [{"id": bucket, "name": bucket, "public": True} for bucket in buckets]
+
+
+@app.post("/storage/v1/object/upload/sign/{bucket}/{path:path}")
+async def create_signed_upload_url(bucket: str, path: str):
+    return {"url": f"/object/upload/sign/{bucket}/{path}?token={uuid.uuid4().hex}"}
+
+
+@app.put("/storage/v1/object/upload/sign/{bucket}/{path:path}")
+async def upload_to_signed_url(bucket: str, path: str, request: Request):
+    data, content_type = await read_upload(request)
+    return store(bucket, path, data, content_type)
+
+
+@app.post("/storage/v1/object/sign/{bucket}")
+async def create_signed_urls(bucket: str, request: Request):
+    body = await request.json()
+    return [
+        {"path": path, "signedURL": f"/object/sign/{bucket}/{path}?token={uuid.uuid4().hex}", "error": None}
+        for path in body.get("paths", [])
+    ]
+
+
+@app.post("/storage/v1/object/sign/{bucket}/{path:path}")
+async def create_signed_url(bucket: str, path: str):
+    return {"signedURL": f"/object/sign/{bucket}/{path}?token={uuid.uuid4().hex}"}
+
+
+@app.get("/storage/v1/object/sign/{bucket}/{path:path}")
+async def read_signed(bucket: str, path: str, request: Request):
+    return serve(bucket, path, request)
+
+
+@app.post("/storage/v1/object/list/{bucket}")
+async def list_objects(bucket: str, request: Request):
+    body = await request.json()
+    prefix = body.get("prefix", "").strip("/")
+    limit = int(body.get("limit", 100))
+    offset = int(body.get("offset", 0))
+
+    names = sorted(
+        path[len(prefix):].lstrip("/") if prefix else path
+        for stored_bucket, path in objects
+        if stored_bucket == bucket and (not prefix or path.startswith(prefix + "/"))
+    )
+
+    items = []
+    for name in names[offset:offset + limit]:
+        obj = objects[(bucket, f"{prefix}/{name}" if prefix else name)]
+        created_at = datetime.fromtimestamp(obj["created_at"], UTC).isoformat()
+        items.append({
+            "name": name,
+            "id": name,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "metadata": {"size": len(obj["data"]), "mimetype": obj["content_type"]},
+        })
+    return items
+
+
+@app.delete("/storage/v1/object/{bucket}")
+async def remove_objects(bucket: str, request: Request):
+    body = await request.json()
+    removed = []
+    for path in body.get("prefixes", []):
+        if objects.pop((bucket, path), None) is not None:
+            removed.append({"name": path, "bucket_id": bucket})
+    return removed
+
+
+@app.api_route("/storage/v1/object/public/{bucket}/{path:path}", methods=["GET", "HEAD"])
+async def read_public(bucket: str, path: str, request: Request):
+    return serve(bucket, path, request, head=request.method == "HEAD")
+
+
+@app.api_route("/storage/v1/object/{bucket}/{path:path}", methods=["POST", "PUT"])
+async def upload(bucket: str, path: str, request: Request):
+    data, content_type = await read_upload(request)
+    return store(bucket, path, data, content_type)
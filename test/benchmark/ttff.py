@@ -0,0 +1,216 @@
+"""
+Time-to-first-frame benchmark: how long a player takes to decode the first frame of an MP4
+served over HTTP Range requests, with the moov atom stored last versus first (fast start).
+
+A sample video is encoded with ffmpeg (moov last, as ffmpeg and some yt-dlp downloads write it),
+then remuxed with app.utility.video.remux_faststart. Both are served by a local HTTP server
+that simulates a link with `--latency` per request and `--bandwidth`, like a mobile viewer.
+The first frame is decoded by ffmpeg in two modes:
+
+    seekable    the client uses Range requests (browsers, ffmpeg), a moov stored last costs
+                a seek to the end of the file and back
+    sequential  the client reads the file in order (progressive download, streaming
+                processors), a moov stored last means downloading the whole file first
+
+For every variant and mode it reports time-to-first-frame percentiles, and the requests and
+bytes the server sent for one playback start.
+
+Usage (from the repository root, requires ffmpeg):
+    python test/benchmark/ttff.py [--duration 60] [--bitrate 4M] [--latency 50] [--bandwidth 20] [--runs 5] [--output ttff.json]
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, UTC
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utility.video import is_faststart, remux_faststart  # noqa: E402
+from run import summarize_latencies, git_commit  # noqa: E402
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+SEND_CHUNK_SIZE = 64 * 1024
+MODES = {
+    "seekable": [],
+    "sequential": ["-seekable", "0"],
+}
+
+
+class ThrottledRangeHandler(SimpleHTTPRequestHandler):
+    """Serves the benchmark directory with single Range support, delayed and throttled"""
+    protocol_version = "HTTP/1.1"
+    latency = 0.0  # seconds before each response
+    bandwidth = 0.0  # bytes/s, 0 for unlimited
+    log = []
+    log_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        try:
+            file = open(path, "rb")
+        except OSError:
+            self.send_error(404)
+            return
+
+        with file:
+            size = os.fstat(file.fileno()).st_size
+            start, end = 0, size - 1
+            match = RANGE_PATTERN.match(self.headers.get("Range", ""))
+            if match and (match.group(1) or match.group(2)):
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                else:
+                    start = max(0, size - int(match.group(2)))
+                if start >= size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            else:
+                self.send_response(200)
+
+            time.sleep(self.latency)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            file.seek(start)
+            sent = 0
+            remaining = end - start + 1
+            started = time.perf_counter()
+            try:
+                while remaining > 0:
+                    chunk = file.read(min(SEND_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    remaining -= len(chunk)
+                    if self.bandwidth:
+                        # Sleep until the link would have carried what was sent so far
+                        delay = sent / self.bandwidth - (time.perf_counter() - started)
+                        if delay > 0:
+                            time.sleep(delay)
+            except (BrokenPipeError, ConnectionResetError):
+                # The player got what it needed and closed the connection
+                self.close_connection = True
+            finally:
+                with self.log_lock:
+                    self.log.append(sent)
+
+
+def make_sample_video(directory: str, duration: int, bitrate: str) -> str:
+    """An H.264/AAC MP4 without fast start, so its moov atom is stored after the media data"""
+    path = os.path.join(directory, "moov_last.mp4")
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error",
+            "-f", "lavfi", "-i", f"testsrc2=duration={duration}:size=1280x720:rate=30",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+            "-c:v", "libx264", "-preset", "veryfast", "-b:v", bitrate,
+            "-c:a", "aac", "-shortest", "-y", path
+        ],
+        check=True
+    )
+    return path
+
+
+def time_to_first_frame(url: str, mode: str) -> float:
+    command = ["ffmpeg", "-v", "error", *MODES[mode], "-i", url, "-map", "0:v:0", "-frames:v", "1", "-f", "null", "-"]
+    start = time.perf_counter()
+    subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-frame of MP4s with and without fast start")
+    parser.add_argument("--duration", type=int, default=60, help="Sample video length (s)")
+    parser.add_argument("--bitrate", default="4M", help="Sample video bitrate")
+    parser.add_argument("--latency", type=float, default=50, help="Simulated delay per request (ms)")
+    parser.add_argument("--bandwidth", type=float, default=20, help="Simulated bandwidth (Mbit/s), 0 for unlimited")
+    parser.add_argument("--runs", type=int, default=5, help="Playback starts per variant and mode")
+    parser.add_argument("--port", type=int, default=9103)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    ThrottledRangeHandler.latency = args.latency / 1000
+    ThrottledRangeHandler.bandwidth = args.bandwidth * 1000 * 1000 / 8
+
+    with tempfile.TemporaryDirectory() as directory:
+        moov_last = make_sample_video(directory, args.duration, args.bitrate)
+        faststart = os.path.join(directory, "faststart.mp4")
+        remux_faststart(moov_last, faststart)
+        variants = {"moov_last": moov_last, "faststart": faststart}
+        assert is_faststart(moov_last) is False and is_faststart(faststart) is True
+
+        def handler(*handler_args, **handler_kwargs):
+            return ThrottledRangeHandler(*handler_args, directory=directory, **handler_kwargs)
+
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = {}
+        try:
+            for variant, path in variants.items():
+                url = f"http://127.0.0.1:{args.port}/{os.path.basename(path)}"
+                results[variant] = {"size_bytes": os.path.getsize(path)}
+                for mode in MODES:
+                    latencies = []
+                    for _ in range(args.runs):
+                        ThrottledRangeHandler.log.clear()
+                        latencies.append(time_to_first_frame(url, mode))
+                        # Give the server a moment to log connections the player closed
+                        time.sleep(0.05)
+                        with ThrottledRangeHandler.log_lock:
+                            requests, sent = len(ThrottledRangeHandler.log), sum(ThrottledRangeHandler.log)
+                    results[variant][mode] = {
+                        **summarize_latencies(latencies),
+                        "requests": requests,
+                        "bytes_sent": sent,
+                    }
+        finally:
+            server.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "duration": args.duration,
+            "bitrate": args.bitrate,
+            "latency_ms": args.latency,
+            "bandwidth_mbit": args.bandwidth,
+            "runs": args.runs,
+        },
+        "variants": results,
+    }
+
+    print(json.dumps(report, indent=2))
+    for mode in MODES:
+        before, after = results["moov_last"][mode]["p50_ms"], results["faststart"][mode]["p50_ms"]
+        print(f"{mode}: p50 time-to-first-frame {before} ms -> {after} ms with fast start", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import random
 import string
 import time
-from locust import HttpUser, task, between, SequentialTaskSet
+import requests
+from locust import HttpUser, task, between, SequentialTaskSet, events
 
 
 def random_string(length=8):
@@ -71,4 +72,21 @@ class UserScenario(SequentialTaskSet):
 
 class WebsiteUser(HttpUser):
     tasks = [UserScenario]
-    wait_time = between(1, 3)
\ No newline at end of file
+    wait_time = between(1, 3)
+
+
+@events.test_stop.add_listener
+def report_loop_lag(environment, **kwargs):
+    """
+    부하 테스트 종료 시 서버의 이벤트 루프 지연(p50/p95/p99)을 출력.
+    블로킹 호출로 인한 회귀를 확인하기 위함.
+    """
+    try:
+        stats = requests.get(f"{environment.host}/admin/loop-lag", timeout=10).json()
+        print(
+            f"[LoopLag] samples={stats['samples']} p50={stats['p50_ms']}ms "
+            f"p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms "
+            f"blocking_calls={len(stats['blocking_calls'])}"
+        )
+    except Exception as e:
+        print(f"[LoopLag] Failed to fetch loop lag stats: {e}")
@@ -0,0 +1,43 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.middleware.static import MediaFiles, MEDIA_CACHE_CONTROL, REVALIDATED_CACHE_CONTROL
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "outputs").mkdir()
+    (tmp_path / "outputs" / "result.mp4").write_bytes(b"0123456789")
+    (tmp_path / "test.txt").write_text("root file")
+    application = Starlette(routes=[Mount("/uploads", MediaFiles(str(tmp_path)))])
+    return TestClient(application)
+
+
+def test_bucket_object(client):
+    response = client.get("/uploads/outputs/result.mp4", headers={"Range": "bytes=2-5"})
+
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["cache-control"] == MEDIA_CACHE_CONTROL
+
+
+def test_root_file(client):
+    response = client.get("/uploads/test.txt")
+
+    assert response.status_code == 200
+    assert response.text == "root file"
+    assert response.headers["cache-control"] == REVALIDATED_CACHE_CONTROL
+
+
+def test_bucket_directory_is_not_a_file(client):
+    assert client.get("/uploads/outputs").status_code == 404
+    assert client.get("/uploads/missing.txt").status_code == 404
+    assert client.get("/uploads/outputs/..").status_code == 404
+
+
+def test_websocket_is_rejected(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/uploads/test.txt"):
+            pass
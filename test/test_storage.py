@@ -0,0 +1,12 @@
+from app.utility import storage
+from app.utility.storage import cache_signed_url, get_cached_signed_url
+
+
+def test_signed_url_cache_is_keyed_by_lifetime(monkeypatch):
+    monkeypatch.setattr(storage, "_signed_url_cache", {})
+    cache_signed_url("videos", "a.mp4", "https://signed/long", 3600)
+
+    assert get_cached_signed_url("videos", "a.mp4", 3600) == "https://signed/long"
+    # A shorter lifetime must be signed again, not served the longer-lived URL
+    assert get_cached_signed_url("videos", "a.mp4", 600) is None
+    assert get_cached_signed_url("thumbnails", "a.mp4", 3600) is None
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from app.api.runpod import webhook
+from app.api.runpod.webhook import batch_update_statement, verify_batch_secret
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_batch_without_timings_casts_them_to_integer():
+    # Postgres types a VALUES column that is NULL in every row as text, COALESCE with the
+    # integer job columns then fails unless the column is cast
+    rows = [
+        (1, "FAILED", None, "boom", None, None, None),
+        (2, "FAILED", None, None, None, None, None),
+    ]
+    sql = compile_sql(batch_update_statement(rows))
+
+    assert "coalesce(CAST(updates.queue_ms AS INTEGER), jobs.queue_ms)" in sql
+    assert "coalesce(CAST(updates.execution_ms AS INTEGER), jobs.execution_ms)" in sql
+    assert "(1, 'FAILED', NULL, 'boom', NULL, NULL, NULL)" in sql
+
+
+def test_batch_with_timings():
+    sql = compile_sql(batch_update_statement([(1, "COMPLETED", "result.mp4", None, 1200, 34000, "PENDING")]))
+
+    assert "(1, 'COMPLETED', 'result.mp4', NULL, 1200, 34000, 'PENDING')" in sql
+    assert "CAST(updates.status AS jobstatus)" in sql
+
+
+def test_batch_secret(monkeypatch):
+    monkeypatch.setattr(webhook, "WEBHOOK_BATCH_SECRET", "s3cret")
+
+    verify_batch_secret("s3cret")
+    for secret in (None, "", "wrong"):
+        with pytest.raises(HTTPException) as error:
+            verify_batch_secret(secret)
+        assert error.value.status_code == 401
+
+
+def test_batch_secret_not_configured(monkeypatch):
+    monkeypatch.setattr(webhook, "WEBHOOK_BATCH_SECRET", None)
+
+    with pytest.raises(HTTPException) as error:
+        verify_batch_secret("anything")
+    assert error.value.status_code == 503